@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Activation benchmark for battery-threshold-service.py.
+
+Starts a private dbus-daemon whose service directory activates the service
+script directly (no systemd), then repeatedly:
+- calls GetThresholds while the name has no owner (cold: activation + call)
+- calls it again while the service is up (warm)
+- waits for the idle exit to release the name
+
+Reports p50/max cold and warm call latency. Thresholds are only read, so it
+is safe to run as an unprivileged user.
+"""
+
+import os
+import sys
+import time
+import signal
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+from dbus_next import Message
+from dbus_next.aio import MessageBus
+
+# percentile() is shared with the other benchmarks in ../scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from benchstats import percentile
+
+SERVICE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'battery-threshold-service.py')
+BUS_NAME = 'org.minsoft1115.BatteryThreshold'
+OBJECT_PATH = '/org/minsoft1115/BatteryThreshold'
+
+BUS_CONFIG = '''<!DOCTYPE busconfig PUBLIC "-//freedesktop//DTD D-Bus Bus Configuration 1.0//EN"
+ "http://www.freedesktop.org/standards/dbus/1.0/busconfig.dtd">
+<busconfig>
+  <type>session</type>
+  <listen>{address}</listen>
+  <servicedir>{servicedir}</servicedir>
+  <policy context="default">
+    <allow send_destination="*"/>
+    <allow receive_sender="*"/>
+    <allow own="*"/>
+  </policy>
+</busconfig>
+'''
+
+ACTIVATION_FILE = '''[D-BUS Service]
+Name={name}
+Exec={python} {script}
+'''
+
+
+def start_dbus_daemon(tmpdir: str, idle: int):
+    address = f'unix:path={os.path.join(tmpdir, "bus")}'
+    servicedir = os.path.join(tmpdir, 'services')
+    os.mkdir(servicedir)
+    with open(os.path.join(servicedir, f'{BUS_NAME}.service'), 'w') as f:
+        f.write(ACTIVATION_FILE.format(name=BUS_NAME, python=sys.executable, script=SERVICE_PATH))
+    config = os.path.join(tmpdir, 'bus.conf')
+    with open(config, 'w') as f:
+        f.write(BUS_CONFIG.format(address=address, servicedir=servicedir))
+
+    # The activated service inherits this environment: it connects to the
+    # private bus as its "system" bus and idles out quickly
+    env = dict(os.environ, DBUS_SYSTEM_BUS_ADDRESS=address, BATTERY_THRESHOLD_IDLE_SEC=str(idle))
+    proc = subprocess.Popen(
+        ['dbus-daemon', f'--config-file={config}', '--nofork', '--print-address'],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env, text=True
+    )
+    if not proc.stdout.readline().strip():
+        proc.kill()
+        raise SystemExit('[ERROR] dbus-daemon did not start')
+    return proc, address
+
+
+async def call(bus: MessageBus) -> float:
+    started = time.perf_counter()
+    reply = await bus.call(Message(
+        destination=BUS_NAME, path=OBJECT_PATH, interface=BUS_NAME, member='GetThresholds'
+    ))
+    elapsed = time.perf_counter() - started
+    if reply.error_name:
+        raise SystemExit(f'[ERROR] GetThresholds: {reply.error_name}: {reply.body}')
+    return elapsed
+
+
+async def has_owner(bus: MessageBus) -> bool:
+    reply = await bus.call(Message(
+        destination='org.freedesktop.DBus', path='/org/freedesktop/DBus',
+        interface='org.freedesktop.DBus', member='NameHasOwner', signature='s', body=[BUS_NAME]
+    ))
+    return reply.body[0]
+
+
+async def bench(address: str, runs: int, idle: int):
+    bus = await MessageBus(bus_address=address).connect()
+    cold, warm = [], []
+    for i in range(runs):
+        while await has_owner(bus):
+            await asyncio.sleep(0.05)
+        cold.append(await call(bus))
+        warm.append(await call(bus))
+        print(f'run {i + 1}/{runs}: cold {cold[-1] * 1000:.1f} ms, warm {warm[-1] * 1000:.2f} ms', file=sys.stderr)
+        await asyncio.sleep(idle)
+    bus.disconnect()
+    return sorted(cold), sorted(warm)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark battery-threshold-service.py activation latency')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--idle', type=int, default=1, help='Idle timeout given to the service (seconds)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        proc, address = start_dbus_daemon(tmpdir, args.idle)
+        try:
+            cold, warm = asyncio.run(bench(address, args.runs, args.idle))
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            proc.wait()
+
+    print(f'runs          : {args.runs}')
+    print(f'cold p50      : {percentile(cold, 50) * 1000:.1f} ms')
+    print(f'cold max      : {cold[-1] * 1000:.1f} ms')
+    print(f'warm p50      : {percentile(warm, 50) * 1000:.2f} ms')
+    print(f'warm max      : {warm[-1] * 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,25 @@
 #!/usr/bin/env python3
+"""
+Usage: battery-threshold-controller.py [VALUE] [BATTERY ...]
+Sets the charge end threshold (default 80) for the given batteries, or for
+every battery the service knows about, in a single SetThresholds call.
+"""
 
+import sys
 import dbus
 
 bus = dbus.SystemBus()
-proxy = bus.get_object('org.minsoft1115.BatteryThreshold', '/org/example/BatteryThreshold')
+proxy = bus.get_object('org.minsoft1115.BatteryThreshold', '/org/minsoft1115/BatteryThreshold')
 iface = dbus.Interface(proxy, 'org.minsoft1115.BatteryThreshold')
 
-battery_id = "BAT1"
-value = 80
+value = int(sys.argv[1]) if len(sys.argv) > 1 else 80
+batteries = sys.argv[2:] or list(iface.GetThresholds())
 
-response = iface.SetThreshold(battery_id, value)
-print(response)
+try:
+    thresholds = iface.SetThresholds(dbus.Dictionary({b: dbus.UInt32(value) for b in batteries}, signature='su'))
+except dbus.exceptions.DBusException as e:
+    print(f"Error: {e.get_dbus_message()}")
+    sys.exit(1)
 
+for battery_id, threshold in thresholds.items():
+    print(f"Battery threshold set to {threshold}% successfully for {battery_id}.")
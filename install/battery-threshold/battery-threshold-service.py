@@ -1,4 +1,8 @@
 #!/usr/bin/env python3
+import os
+import mmap
+import time
+import struct
 import dbus
 import dbus.service
 import dbus.mainloop.glib
@@ -6,43 +10,326 @@ from gi.repository import GLib
 
 BUS_NAME = 'org.minsoft1115.BatteryThreshold'
 OBJECT_PATH = '/org/minsoft1115/BatteryThreshold'
+ERROR_NAME = BUS_NAME + '.Error'
+
+POWER_SUPPLY_DIR = '/sys/class/power_supply'
+END_ATTR = 'charge_control_end_threshold'
+START_ATTR = 'charge_control_start_threshold'
+
+MIN_THRESHOLD = 60          # same range as set-max-threshold.sh
+MAX_THRESHOLD = 100
+START_GAP = 5               # start threshold kept this far below the end threshold
+
+# Bus-activated: exit after this many idle seconds (0 = stay resident)
+IDLE_TIMEOUT = int(os.environ.get('BATTERY_THRESHOLD_IDLE_SEC', '30'))
+
+# Optional telemetry: sample every N seconds (0 = off; keeps the service resident)
+TELEMETRY_INTERVAL = int(os.environ.get('BATTERY_TELEMETRY_INTERVAL_SEC', '0'))
+TELEMETRY_PATH = os.environ.get('BATTERY_TELEMETRY_PATH', '/var/lib/battery-threshold/telemetry.ring')
+TELEMETRY_RECORDS = int(os.environ.get('BATTERY_TELEMETRY_RECORDS', '100000'))
+MAX_HISTORY_POINTS = 2000   # per battery; GetHistory widens the step beyond this
+
+
+class ThresholdError(Exception):
+    pass
+
+
+class SysfsBackend:
+    """Reads and writes charge thresholds directly under /sys/class/power_supply."""
+
+    def __init__(self, root=POWER_SUPPLY_DIR):
+        self.root = root
+        self.batteries = self.discover()
+
+    def discover(self):
+        """Map battery name -> sysfs dir for batteries with an end threshold (once, at startup)."""
+        batteries = {}
+        try:
+            names = sorted(os.listdir(self.root))
+        except OSError:
+            return batteries
+        for name in names:
+            path = os.path.join(self.root, name)
+            if self._read(path, 'type') == 'Battery' and os.path.exists(os.path.join(path, END_ATTR)):
+                batteries[name] = path
+        return batteries
+
+    @staticmethod
+    def _read(path, attr):
+        try:
+            with open(os.path.join(path, attr), 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _write(path, attr, value):
+        with open(os.path.join(path, attr), 'w') as f:
+            f.write(f"{value}\n")
+
+    def path_of(self, battery_id):
+        path = self.batteries.get(battery_id)
+        if path is None:
+            raise ThresholdError(f"Unknown battery: {battery_id}")
+        return path
+
+    def get(self, battery_id):
+        value = self._read(self.path_of(battery_id), END_ATTR)
+        return int(value) if value and value.isdigit() else 0
+
+    def check(self, battery_id, value):
+        if not MIN_THRESHOLD <= value <= MAX_THRESHOLD:
+            raise ThresholdError(f"Threshold must be between {MIN_THRESHOLD} and {MAX_THRESHOLD}")
+        return self.path_of(battery_id)
+
+    def set(self, battery_id, value):
+        """Write the end threshold, moving the start threshold out of the way if needed."""
+        path = self.check(battery_id, value)
+        try:
+            start = self._read(path, START_ATTR)
+            # Drivers reject start >= end, so lower start before lowering end
+            if start is not None and start.isdigit() and int(start) >= value:
+                self._write(path, START_ATTR, max(0, value - START_GAP))
+            self._write(path, END_ATTR, value)
+        except OSError as e:
+            raise ThresholdError(f"Failed to write {battery_id} threshold: {e.strerror}")
+
+
+class TelemetryRing:
+    """Fixed-width sample records in an mmap-backed circular file (bounded size)."""
+
+    MAGIC = b'BTRING2\0'
+    HEADER = struct.Struct('<8sIIQQ')   # magic, record size, capacity, next slot, stored records
+    # time, battery name, capacity %, energy uWh, power uW, voltage uV, cycle count
+    RECORD = struct.Struct('<d16sHIIIH')
+
+    def __init__(self, path, capacity):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        size = self.HEADER.size + capacity * self.RECORD.size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != size:
+                os.ftruncate(fd, size)
+            self.map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self.capacity = capacity
+        magic, record_size, stored_capacity, self.head, self.count = self.HEADER.unpack_from(self.map, 0)
+        if magic != self.MAGIC or record_size != self.RECORD.size or stored_capacity != capacity:
+            # New file or different layout: start over
+            self.head = self.count = 0
+            self._write_header()
+
+    def _write_header(self):
+        self.HEADER.pack_into(self.map, 0, self.MAGIC, self.RECORD.size, self.capacity, self.head, self.count)
+
+    def _slot(self, slot):
+        return self.HEADER.size + slot * self.RECORD.size
+
+    def append(self, t, battery, *fields):
+        self.RECORD.pack_into(self.map, self._slot(self.head), t, battery.encode(), *fields)
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self._write_header()
+
+    def records(self, start, end):
+        """
+        Yield (time, battery name, ...) records with start <= time <= end, oldest written first.
+        A linear scan: wall-clock time can step backwards (NTP, RTC after suspend),
+        so the stored times are not guaranteed to be sorted.
+        """
+        first = (self.head - self.count) % self.capacity
+        if first + self.count <= self.capacity:
+            spans = [(first, first + self.count)]
+        else:
+            spans = [(first, self.capacity), (0, self.head)]
+        view = memoryview(self.map)
+        try:
+            for lo, hi in spans:
+                for t, battery, *fields in self.RECORD.iter_unpack(view[self._slot(lo):self._slot(hi)]):
+                    if start <= t <= end:
+                        yield (t, battery.rstrip(b'\0').decode(errors='replace'), *fields)
+        finally:
+            view.release()
+
+
+class TelemetrySampler:
+    """Samples battery attributes through file descriptors opened once at startup."""
+
+    ATTRS = ('capacity', 'energy_now', 'charge_now', 'power_now', 'current_now', 'voltage_now', 'cycle_count')
+
+    def __init__(self, batteries, ring):
+        self.ring = ring
+        self.fds = {}   # battery name -> {attr: fd}
+        for name, path in batteries.items():
+            fds = {}
+            for attr in self.ATTRS:
+                try:
+                    fds[attr] = os.open(os.path.join(path, attr), os.O_RDONLY)
+                except OSError:
+                    pass
+            self.fds[name] = fds
+
+    @staticmethod
+    def _read(fds, attr):
+        fd = fds.get(attr)
+        if fd is None:
+            return 0
+        try:
+            # sysfs regenerates the value on every read at offset 0
+            return abs(int(os.pread(fd, 32, 0)))
+        except (OSError, ValueError):
+            return 0
+
+    def sample(self):
+        now = time.time()
+        for name, fds in self.fds.items():
+            voltage = self._read(fds, 'voltage_now')
+            # Drivers report either energy/power or charge/current
+            energy = self._read(fds, 'energy_now') or self._read(fds, 'charge_now') * voltage // 1000000
+            power = self._read(fds, 'power_now') or self._read(fds, 'current_now') * voltage // 1000000
+            self.ring.append(now, name, self._read(fds, 'capacity'), energy, power, voltage,
+                             self._read(fds, 'cycle_count'))
+        return True     # keep the GLib timeout
+
+
+class IdleExit:
+    """Quits the main loop once no method call has arrived for `timeout` seconds."""
+
+    def __init__(self, bus, loop, timeout):
+        self.bus = bus
+        self.loop = loop
+        self.timeout = timeout
+        self.source = None
+
+    def touch(self):
+        if self.timeout <= 0:
+            return
+        if self.source is not None:
+            GLib.source_remove(self.source)
+        self.source = GLib.timeout_add_seconds(self.timeout, self.expire)
+
+    def expire(self):
+        print(f"Idle for {self.timeout}s, exiting")
+        # Drop the name first so the next call queues for a fresh activation
+        self.bus.release_name(BUS_NAME)
+        self.loop.quit()
+        return False
+
 
 class BatteryThresholdService(dbus.service.Object):
-    def __init__(self, bus):
+    def __init__(self, bus, backend=None, idle=None, telemetry=None):
         dbus.service.Object.__init__(self, bus, OBJECT_PATH)
+        self.backend = backend or SysfsBackend()
+        self.idle = idle
+        self.telemetry = telemetry
+        print(f"Batteries: {', '.join(self.backend.batteries) or 'none'}")
+
+    def _activity(self):
+        if self.idle is not None:
+            self.idle.touch()
 
     @dbus.service.method(BUS_NAME, in_signature='su', out_signature='s')
     def SetThreshold(self, battery_id, value):
+        self._activity()
         print(f"Battery {battery_id} threshold set to {value}%")
+        try:
+            self.backend.set(str(battery_id), int(value))
+        except ThresholdError as e:
+            print(f"Error setting threshold: {e}")
+            return f"Error: {e}"
+        self.ThresholdsChanged(self._thresholds([str(battery_id)]))
+        return f"Battery threshold set to {int(value)}% successfully for {battery_id}."
 
-        script_path = "/usr/local/sbin/set-battery-threshold.sh"
-
+    @dbus.service.method(BUS_NAME, in_signature='a{su}', out_signature='a{su}')
+    def SetThresholds(self, thresholds):
+        """Set several batteries in one call; returns the thresholds now in effect."""
+        self._activity()
+        requested = {str(k): int(v) for k, v in thresholds.items()}
         try:
-            result = subprocess.run(
-                [script_path, battery_id, str(value)],
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            output = result.stdout.strip()
-            return output
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr.strip()
-            print(f"Error executing script: {error_msg}")
-            return f"Error: {error_msg}"
+            # Validate everything before touching sysfs
+            for battery_id, value in requested.items():
+                self.backend.check(battery_id, value)
+            for battery_id, value in requested.items():
+                self.backend.set(battery_id, value)
+        except ThresholdError as e:
+            print(f"Error setting thresholds: {e}")
+            raise dbus.exceptions.DBusException(str(e), name=ERROR_NAME)
+        print(f"Thresholds set: {requested}")
+        changed = self._thresholds(requested)
+        self.ThresholdsChanged(changed)
+        return changed
+
+    @dbus.service.method(BUS_NAME, in_signature='', out_signature='a{su}')
+    def GetThresholds(self):
+        self._activity()
+        return self._thresholds(self.backend.batteries)
+
+    @dbus.service.method(BUS_NAME, in_signature='ddu', out_signature='a(sddddu)')
+    def GetHistory(self, start, end, step):
+        """
+        Telemetry between two Unix times averaged into `step`-second buckets:
+        (battery, bucket start, capacity %, energy Wh, power W, voltage V, cycle count)
+        """
+        self._activity()
+        if self.telemetry is None:
+            raise dbus.exceptions.DBusException("Telemetry is disabled", name=ERROR_NAME)
+        if end < start:
+            raise dbus.exceptions.DBusException("end is before start", name=ERROR_NAME)
+        step = max(int(step), 1, int((end - start) // MAX_HISTORY_POINTS) + 1)
+
+        # (battery name, bucket) -> [samples, capacity, energy, power, voltage, cycles]
+        buckets = {}
+        for t, name, capacity, energy, power, voltage, cycles in self.telemetry.records(start, end):
+            acc = buckets.get((name, int((t - start) // step)))
+            if acc is None:
+                acc = buckets[(name, int((t - start) // step))] = [0, 0, 0, 0, 0, 0]
+            acc[0] += 1
+            acc[1] += capacity
+            acc[2] += energy
+            acc[3] += power
+            acc[4] += voltage
+            acc[5] = max(acc[5], cycles)
+
+        history = []
+        for (name, bucket), (n, capacity, energy, power, voltage, cycles) in sorted(buckets.items()):
+            history.append((name, start + bucket * step, capacity / n,
+                            energy / n / 1e6, power / n / 1e6, voltage / n / 1e6, cycles))
+        return dbus.Array(history, signature='(sddddu)')
+
+    @dbus.service.signal(BUS_NAME, signature='a{su}')
+    def ThresholdsChanged(self, thresholds):
+        pass
+
+    def _thresholds(self, names):
+        return dbus.Dictionary({name: dbus.UInt32(self.backend.get(name)) for name in names}, signature='su')
+
 
 def main():
     dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
 
     system_bus = dbus.SystemBus()
-    name = dbus.service.BusName(BUS_NAME, system_bus)
-    service = BatteryThresholdService(system_bus)
-
     loop = GLib.MainLoop()
+    backend = SysfsBackend()
+
+    telemetry = None
+    if TELEMETRY_INTERVAL > 0:
+        telemetry = TelemetryRing(TELEMETRY_PATH, TELEMETRY_RECORDS)
+        sampler = TelemetrySampler(backend.batteries, telemetry)
+        sampler.sample()
+        GLib.timeout_add_seconds(TELEMETRY_INTERVAL, sampler.sample)
+        print(f"Telemetry every {TELEMETRY_INTERVAL}s -> {TELEMETRY_PATH} ({telemetry.count} records)")
+
+    # Sampling needs a resident process: no idle exit then
+    idle = IdleExit(system_bus, loop, 0 if telemetry else IDLE_TIMEOUT)
+    # Export before owning the name: the call that triggered activation is
+    # delivered as soon as the name is ours
+    service = BatteryThresholdService(system_bus, backend, idle, telemetry)
+    name = dbus.service.BusName(BUS_NAME, system_bus, do_not_queue=True)
+    idle.touch()
+
     print("BatteryThresholdService running...")
     loop.run()
 
 if __name__ == '__main__':
     main()
-
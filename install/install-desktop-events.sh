@@ -0,0 +1,25 @@
+#!/usr/bin/bash
+
+sudo pacman -S python-dbus-next --needed --noconfirm
+sudo pacman -S python-pyroute2 --needed --noconfirm
+
+# the watchers used to run as separate units
+for unit in bt-notify-dbus.service nm-notify-dbus.service desktop-events.service; do
+  systemctl --user stop $unit
+  systemctl --user disable $unit
+done
+rm -f $HOME/.config/systemd/user/bt-notify-dbus.service
+rm -f $HOME/.config/systemd/user/nm-notify-dbus.service
+
+cp ./scripts/statefeed.py $HOME/.config/minsoft1115/scripts
+cp ./scripts/bt-notify-dbus.py $HOME/.config/minsoft1115/scripts
+cp ./scripts/nm-notify-dbus.py $HOME/.config/minsoft1115/scripts
+cp ./scripts/desktop-events.py $HOME/.config/minsoft1115/scripts
+cp ./systemd/desktop-events.service $HOME/.config/systemd/user
+
+chmod +x $HOME/.config/minsoft1115/scripts/bt-notify-dbus.py
+chmod +x $HOME/.config/minsoft1115/scripts/nm-notify-dbus.py
+chmod +x $HOME/.config/minsoft1115/scripts/desktop-events.py
+
+systemctl --user daemon-reload
+systemctl --user enable --now desktop-events.service
@@ -49,12 +49,32 @@ replace_text $HOME/.local/share/applications/org.lite_xl.lite_xl.desktop "Exec=l
 #systemctl --user disable hyprlock-suspend.service
 
 cp ./scripts/hyprlock-suspend.py $HOME/.config/minsoft1115/scripts
-cp ./scripts/handle-lid-switch.sh $HOME/.config/minsoft1115/scripts
+cp ./scripts/hypripc.py $HOME/.config/minsoft1115/scripts
+cp ./scripts/handle-lid-switch.py $HOME/.config/minsoft1115/scripts
+chmod +x $HOME/.config/minsoft1115/scripts/handle-lid-switch.py
+
+# lid + monitor hotplug reactor (reads the eDP-1 rule through hyprlang.py)
+cp ./scripts/hyprlang.py $HOME/.config/minsoft1115/scripts
+cp ./scripts/hypr-monitor-reactor.py $HOME/.config/minsoft1115/scripts
+chmod +x $HOME/.config/minsoft1115/scripts/hypr-monitor-reactor.py
+cp ./systemd/hypr-monitor-reactor.service $HOME/.config/systemd/user
+systemctl --user daemon-reload
+systemctl --user enable --now hypr-monitor-reactor.service
+
+# window switcher: menu pre-rendered by a resident daemon (icons via sync-icons-to-waybar.py, see install-waybar.sh)
+cp ./scripts/hypr-window-switcher.sh $HOME/.config/minsoft1115/scripts
+cp ./scripts/hypr-window-switcher-daemon.py $HOME/.config/minsoft1115/scripts
+chmod +x $HOME/.config/minsoft1115/scripts/hypr-window-switcher-daemon.py
+cp ./systemd/hypr-window-switcher-daemon.service $HOME/.config/systemd/user
+systemctl --user daemon-reload
+systemctl --user enable --now hypr-window-switcher-daemon.service
 
 add_line_if_not_exists $HOME/.config/hypr/hyprland.conf "source = ~/.config/minsoft1115/hypr/hyprland-minsoft1115.conf"
 
-./scripts/add-or-update-key-in-section.py ~/.config/hypr/hypridle.conf "general" "ignore_systemd_inhibit" false
-./scripts/add-or-update-key-in-section.py ~/.config/hypr/hypridle.conf "general" "ignore_dbus_inhibit" false
+./scripts/add-or-update-key-in-section.py ~/.config/hypr/hypridle.conf \
+  general.ignore_systemd_inhibit=false \
+  general.ignore_dbus_inhibit=false
 
-./scripts/add-or-update-key-in-section.py ~/.config/hypr/input.conf "input" "repeat_rate" 80
-./scripts/add-or-update-key-in-section.py ~/.config/hypr/input.conf "input" "repeat_delay" 250
+./scripts/add-or-update-key-in-section.py --apply-live ~/.config/hypr/input.conf \
+  input.repeat_rate=80 \
+  input.repeat_delay=250
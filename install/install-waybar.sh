@@ -14,14 +14,24 @@ yay -S neohtop --needed
 sudo pacman -S swaync --needed
 
 cp ./scripts/aur-status.sh $HOME/.config/minsoft1115/scripts
-cp ./scripts/cpu-temp.sh $HOME/.config/minsoft1115/scripts
-cp ./scripts/disk-usage.sh $HOME/.config/minsoft1115/scripts
-cp ./scripts/memory-gauge-waybar.sh $HOME/.config/minsoft1115/scripts
-cp ./scripts/hypr-scales-current.sh $HOME/.config/minsoft1115/scripts
-cp ./scripts/hypr-scales-menu.sh $HOME/.config/minsoft1115/scripts
+cp ./scripts/hypripc.py $HOME/.config/minsoft1115/scripts
+cp ./scripts/hypr-scales-current.py $HOME/.config/minsoft1115/scripts
+cp ./scripts/hypr-scales-menu.py $HOME/.config/minsoft1115/scripts
+chmod +x $HOME/.config/minsoft1115/scripts/hypr-scales-current.py
+chmod +x $HOME/.config/minsoft1115/scripts/hypr-scales-menu.py
 cp ./scripts/show-failed-units.sh $HOME/.config/minsoft1115/scripts
 cp ./scripts/vpn-status.sh $HOME/.config/minsoft1115/scripts
 
+# custom/bluetooth and custom/vpn are fed by desktop-events.service
+# custom/memory, custom/cpu-temp and custom/disk are fed by waybar-status.service
+cp ./scripts/statefeed.py $HOME/.config/minsoft1115/scripts
+cp ./scripts/waybar-status.py $HOME/.config/minsoft1115/scripts
+chmod +x $HOME/.config/minsoft1115/scripts/waybar-status.py
+cp ./systemd/waybar-status.service $HOME/.config/systemd/user
+systemctl --user daemon-reload
+systemctl --user enable --now waybar-status.service
+./install-desktop-events.sh
+
 WAYBAR_CONFIG_FILE=$HOME/.config/waybar/config.jsonc
 
 cp $WAYBAR_CONFIG_FILE "$WAYBAR_CONFIG_FILE.bak"
@@ -33,6 +43,7 @@ json_data=$(echo "$json_data" | jq --slurpfile b ./waybar/bluetooth.json '.bluet
 json_data=$(echo "$json_data" | jq --slurpfile b ./waybar/cpu.json '.cpu = $b[0].cpu')
 json_data=$(echo "$json_data" | jq --slurpfile b ./waybar/clock.json '.clock = $b[0].clock')
 json_data=$(echo "$json_data" | jq --slurpfile b ./waybar/custom-aur.json '."custom/aur" = $b[0]."custom/aur"')
+json_data=$(echo "$json_data" | jq --slurpfile b ./waybar/custom-bluetooth.json '."custom/bluetooth" = $b[0]."custom/bluetooth"')
 json_data=$(echo "$json_data" | jq --slurpfile b ./waybar/custom-cpu-temp.json '."custom/cpu-temp" = $b[0]."custom/cpu-temp"')
 json_data=$(echo "$json_data" | jq --slurpfile b ./waybar/custom-disk.json '."custom/disk" = $b[0]."custom/disk"')
 json_data=$(echo "$json_data" | jq --slurpfile b ./waybar/custom-memory.json '."custom/memory" = $b[0]."custom/memory"')
@@ -56,6 +67,13 @@ json_data=$(echo "$json_data" | jq --slurpfile b ./waybar/modules-right.json '."
 
 echo "$json_data" >$WAYBAR_CONFIG_FILE
 
+# icons.map -> hyprland/workspace.window-rewrite, kept in sync by a user service
+cp ./scripts/sync-icons-to-waybar.py $HOME/.config/minsoft1115/scripts
+chmod +x $HOME/.config/minsoft1115/scripts/sync-icons-to-waybar.py
+cp ./systemd/sync-icons-to-waybar.service $HOME/.config/systemd/user
+systemctl --user daemon-reload
+systemctl --user enable --now sync-icons-to-waybar.service
+
 mkdir $HOME/.config/minsoft1115/waybar
 cp ./waybar/style-minsoft1115.css $HOME/.config/minsoft1115/waybar
 
@@ -1,92 +1,285 @@
 #!/usr/bin/env python3
 
+import os
+import sys
+import json
 import argparse
+import tempfile
+
+from hyprlang import DEFAULT_CONFIG, ConfigIndex, Document, ParseError, key_name, parse_key_name
+from hypripc import HyprIPCError, Hyprland
+
+INDENT = '    '
+# keyword로 덮어쓸 수 없는 키: 반복 정의되는 키워드(keyword는 추가만 함)와 변수, device 블록
+RELOAD_KEYS = {
+    'monitor', 'workspace', 'source', 'env', 'envd', 'exec', 'exec-once', 'execr', 'execr-once', 'exec-shutdown',
+    'windowrule', 'windowrulev2', 'layerrule', 'animation', 'bezier', 'gesture', 'permission', 'submap',
+    'bind', 'binde', 'bindl', 'bindm', 'bindr', 'bindn', 'bindt', 'bindi', 'binds', 'bindo', 'bindd', 'bindel', 'bindld', 'unbind',
+}
+RELOAD_SECTIONS = {'device', 'plugin'}
+
+
+class ConfigError(Exception):
+    pass
+
+
+def parse_path(path):
+    """
+    'a:b:key' → ('a', 'b', 'key'). ':'가 없으면 맨 앞의 '.' 하나만 'section.key' 약식으로 본다
+    ('general.col.active_border' → ('general', 'col.active_border'))
+    """
+    path = path.strip()
+    parts = parse_key_name(path) if ':' in path else tuple(p.strip() for p in path.split('.', 1))
+    if len(parts) < 2 or not all(parts):
+        raise ConfigError(f"Invalid key path (expected section.key or section:key): {path}")
+    return parts
+
+
+def parse_edit(spec):
+    """'section.key=value' / 'a:b:key=value' → (('section', 'key'), 'value')"""
+    if '=' not in spec:
+        raise ConfigError(f"Invalid edit (expected section.key=value): {spec}")
+    path, value = spec.split('=', 1)
+    return parse_path(path), value.strip()
+
+
+def flatten_json(obj, prefix=()):
+    """{"general": {"gaps_in": 5}} 또는 {"general.gaps_in": 5} → [(path, value)]"""
+    edits = []
+    for k, v in obj.items():
+        if isinstance(v, dict):
+            edits.extend(flatten_json(v, prefix + parse_key_name(k)))
+            continue
+        path = prefix + parse_key_name(k) if prefix else parse_path(k)
+        if not all(path):
+            raise ConfigError(f"Invalid key path: {key_name(path)}")
+        if isinstance(v, bool):
+            edits.append((path, 'true' if v else 'false'))
+        else:
+            edits.append((path, str(v)))
+    return edits
+
+
+def apply_edits(doc, edits):
+    """
+    edits를 문서에 적용 (한 번 파싱). 반환: (new_lines, results)
+    results: [(path, 'updated'|'added'|'unchanged', old_value)]
+    """
+    edits = list(dict(edits).items())   # 같은 키는 마지막 값만
+    lines, sections, keys = doc.lines, doc.sections, doc.keys
+    replace = {}   # line_idx -> new line
+    insert = {}    # line_idx -> [lines to insert before it]  (len(lines) = 파일 끝)
+    results = []
+    pending = {}   # 같은 배치에서 새로 만드는 섹션: path -> 내용 줄 목록
+
+    for path, value in edits:
+        section_path, key = path[:-1], path[-1]
+
+        nodes = keys.get(path)
+        if nodes:
+            # 마지막 정의가 실제 적용되는 값
+            node = nodes[-1]
+            if node.value == value:
+                results.append((path, 'unchanged', node.value))
+                continue
+            replace[node.line] = node.with_value(value)
+            results.append((path, 'updated', node.value))
+            continue
+
+        # 키가 없으면: 섹션이 있으면 그 끝에, 없으면 가장 가까운 조상 섹션 안에 새 블록으로
+        results.append((path, 'added', None))
+        if section_path in pending:
+            pending[section_path].append((key, value))
+            continue
+        if section_path in sections:
+            sec = sections[section_path][-1]
+            insert.setdefault(sec.end, []).append(f"{INDENT * sec.depth}{key} = {value}\n")
+            continue
+        n = len(section_path)
+        while n > 0 and section_path[:n] not in sections:
+            n -= 1
+        parent = sections[section_path[:n]][-1]
+        pending[section_path] = [(key, value)]
+        insert.setdefault(parent.end, []).append((parent.depth, section_path[n:], pending[section_path]))
+
+    if not replace and not insert:
+        return lines, results
+
+    def render(entry):
+        if isinstance(entry, str):
+            return [entry]
+        depth, names, members = entry
+        # 새 섹션: 중첩 이름마다 블록 하나씩
+        out = []
+        for i, name in enumerate(names):
+            out.append(f"{INDENT * (depth + i)}{name} {{\n")
+        for key, value in members:
+            out.append(f"{INDENT * (depth + len(names))}{key} = {value}\n")
+        for i in reversed(range(len(names))):
+            out.append(f"{INDENT * (depth + i)}}}\n")
+        return out
+
+    out = []
+    for idx in range(len(lines) + 1):
+        for entry in insert.get(idx, []):
+            if idx == len(lines) and out and not out[-1].endswith('\n'):
+                out[-1] += '\n'
+            out.extend(render(entry))
+        if idx < len(lines):
+            out.append(replace.get(idx, lines[idx]))
+    return out, results
+
+
+def atomic_write(file_path, lines):
+    file_path = os.path.realpath(file_path)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix=f'.{os.path.basename(file_path)}.')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, os.stat(file_path).st_mode & 0o7777)
+        os.replace(tmp, file_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def edit_file(file_path, edits, doc=None):
+    """모든 edit을 한 번 파싱/한 번 쓰기로 적용. 바뀐 게 없으면 쓰지 않는다 (doc: 이미 읽은 문서)"""
+    new_lines, results = apply_edits(doc or Document.load(file_path), edits)
+    changed = any(state != 'unchanged' for _, state, _ in results)
+    if changed:
+        atomic_write(file_path, new_lines)
+    return changed, results
+
+
+def needs_reload(path, value):
+    return (path[-1] in RELOAD_KEYS or path[-1].startswith('$') or path[0] in RELOAD_SECTIONS
+            or ';' in value)   # ';'는 배치 구분자라 keyword로 보낼 수 없음
+
+
+def apply_live(file_path, results, edits, root=DEFAULT_CONFIG):
+    """
+    파일에서 실제로 바뀐 키만 실행 중인 Hyprland에 반영.
+    keyword로 가능한 키는 [[BATCH]] 한 번에, 불가능한 키가 하나라도 있으면 reload 한 번.
+    다른 파일의 나중 정의에 덮이는 키는 건너뛴다. 반환: 출력할 메시지 목록
+    """
+    values = dict(edits)
+    changed = [path for path, state, _ in results if state != 'unchanged']
+    if not changed:
+        return []
+    if not os.environ.get('HYPRLAND_INSTANCE_SIGNATURE'):
+        return ["Hyprland is not running; nothing applied live"]
+
+    index = ConfigIndex()
+    target = os.path.realpath(file_path)
+    live, reload_keys, messages = [], [], []
+    try:
+        if target not in index.files_in_order(root):
+            return [f"{file_path} is not sourced by {root}; nothing applied live"]
+        for path in changed:
+            found = index.where(key_name(path), root)
+            if found and found[-1][0] != target:
+                messages.append(f"Skipped {key_name(path)}: overridden at {found[-1][0]}:{found[-1][1]}")
+            elif needs_reload(path, values[path]):
+                reload_keys.append(path)
+            else:
+                live.append(path)
+    finally:
+        index.save()
+
+    hypr = Hyprland()
+    if reload_keys:
+        # reload가 파일 전체를 다시 읽으므로 keyword는 따로 보낼 필요 없음
+        errors = hypr.reload()
+        names = ', '.join(key_name(p) for p in reload_keys)
+        messages.append(f"reload failed: {'; '.join(errors)}" if errors else f"Reloaded Hyprland for {names}")
+        return messages
+    if not live:
+        return messages
+
+    failed = hypr.batch(f"keyword {key_name(p)} {values[p]}" for p in live)
+    if failed:
+        errors = hypr.reload()
+        messages.append(f"keyword failed ({'; '.join(failed)}), " + (f"reload failed: {'; '.join(errors)}" if errors else "reloaded instead"))
+    else:
+        messages.append(f"Applied live: {', '.join(key_name(p) for p in live)}")
+    return messages
 
-def parse_sections(file_path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    sections = {}
-    current_section = None
-    buffer = []
-    in_section = False
-    
-    for line in lines:
-        stripped = line.strip()
-        if not in_section and stripped.endswith('{'):
-            current_section = stripped[:-1].strip()
-            in_section = True
-            buffer = []
-        elif in_section and stripped == '}':
-            sections[current_section] = buffer
-            in_section = False
-            current_section = None
-        elif in_section:
-            buffer.append(line)
-    
-    return sections
 
 def add_or_update_key_in_section(file_path, section, key, value):
-    sections = parse_sections(file_path)
-    
-    if section not in sections:
+    """예전 형식: 섹션을 새로 만들지 않는다 (없으면 ValueError)"""
+    section_path = tuple(section.split(':'))
+    doc = Document.load(file_path)
+    if section_path not in doc.sections:
         raise ValueError(f"Section {section} not found")
-    
-    lines = sections[section]
-    key_line_idx = None
-    
-    for i, line in enumerate(lines):
-        if line.strip().startswith(key):
-            key_line_idx = i
-            break
-    
-    if key_line_idx is not None:
-        lines[key_line_idx] = f"    {key} = {value}\n"
-    else:
-        lines.append(f"    {key} = {value}\n")
-    
-    # 전체 파일을 다시 쓰기
-    with open(file_path, 'r', encoding='utf-8') as f:
-        full_lines = f.readlines()
-    
-    # 섹션 위치 다시 찾아 수정된 내용 반영
-    out_lines = []
-    in_section = False
-    current_section = None
-    
-    i = 0
-    while i < len(full_lines):
-        line = full_lines[i]
-        stripped = line.strip()
-        if not in_section and stripped.startswith(section) and stripped.endswith('{'):
-            out_lines.append(line)
-            i += 1
-            # 해당 섹션 내용을 새로 쓰기
-            for new_line in lines:
-                out_lines.append(new_line)
-            # 기존 섹션 끝까지 건너뛰기
-            while i < len(full_lines) and full_lines[i].strip() != '}':
-                i += 1
-            if i < len(full_lines):
-                out_lines.append(full_lines[i])  # 닫는 중괄호
-            in_section = False
-            current_section = None
-        else:
-            out_lines.append(line)
-        i += 1
-    
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.writelines(out_lines)
+    edit_file(file_path, [(section_path + (key,), str(value))], doc)
+
+
+def collect_edits(args):
+    edits = [parse_edit(spec) for spec in args.edits if spec != '-']
+    if '-' in args.edits or args.stdin:
+        for line in sys.stdin:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                edits.append(parse_edit(line))
+    if args.json:
+        with open(args.json, 'r', encoding='utf-8') as f:
+            edits.extend(flatten_json(json.load(f)))
+    return edits
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Add or update key=value in section of hypr config")
+    # 예전 형식(file section key value)도 그대로 지원
+    argv = sys.argv[1:]
+    if len(argv) == 4 and not any('=' in a or a.startswith('-') for a in argv[1:3]):
+        file_path, section, key, value = argv
+        try:
+            add_or_update_key_in_section(file_path, section, key, value)
+        except (ParseError, OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Updated {key} in section [{section}] in {file_path}")
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(
+        description="Add or update key=value entries in sections of a hypr config (batch)",
+        epilog="Example: %(prog)s ~/.config/hypr/input.conf input.repeat_rate=80 input:touchpad:natural_scroll=true",
+    )
     parser.add_argument("file_path", help="Path to the hypr config file")
-    parser.add_argument("section", help="Section name (e.g., general)")
-    parser.add_argument("key", help="Key to add or update")
-    parser.add_argument("value", help="Value to set for the key")
+    parser.add_argument("edits", nargs="*", help="section.key=value edits (nested: a:b:key=value, '-' = read stdin)")
+    parser.add_argument("--stdin", action="store_true", help="Read section.key=value edits from stdin, one per line")
+    parser.add_argument("--json", help='JSON file of edits: {"section.key": value} or {"section": {"key": value}}')
+    parser.add_argument("--apply-live", action="store_true",
+                        help="Push the changed keys to the running Hyprland in one IPC batch (reload only when needed)")
+    parser.add_argument("--hypr-config", default=DEFAULT_CONFIG,
+                        help=f"Root config Hyprland runs with, for --apply-live (default: {DEFAULT_CONFIG})")
+    args = parser.parse_intermixed_args(argv)
 
-    args = parser.parse_args()
+    try:
+        edits = collect_edits(args)
+        if not edits:
+            parser.error("no edits given")
+        changed, results = edit_file(args.file_path, edits)
+    except (ConfigError, ParseError, OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
-    add_or_update_key_in_section(args.file_path, args.section, args.key, args.value)
-    print(f"Updated {args.key} in section [{args.section}] in {args.file_path}")
+    for path, state, old in results:
+        name = ':'.join(path)
+        if state == 'updated':
+            print(f"Updated {name}: {old} -> {dict(edits)[path]}")
+        elif state == 'added':
+            print(f"Added {name} = {dict(edits)[path]}")
+        else:
+            print(f"Unchanged {name}")
+    if not changed:
+        print(f"{args.file_path}: nothing changed, not written")
+    elif args.apply_live:
+        try:
+            for message in apply_live(args.file_path, results, edits, args.hypr_config):
+                print(message)
+        except (ConfigError, ParseError, HyprIPCError, OSError) as e:
+            print(f"Error: live apply failed: {e}", file=sys.stderr)
+            sys.exit(1)
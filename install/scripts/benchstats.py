@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Latency statistics shared by the benchmark tools (nm-notify-replay.py,
+bt-notify-bench.py, battery-threshold/battery-threshold-bench.py).
+"""
+
+
+def percentile(sorted_vals, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0.0 when empty)"""
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, int(round(pct / 100 * (len(sorted_vals) - 1))))
+    return sorted_vals[k]
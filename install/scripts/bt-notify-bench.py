@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Signal-to-notification benchmark for bt-notify-dbus.py.
+
+Starts a private dbus-daemon, serves a fake org.bluez object tree and a
+capturing org.freedesktop.Notifications sink on it (in a helper thread),
+then runs bt-notify-dbus.py's main() against that bus. Scripted Device1
+PropertiesChanged(Connected) storms are emitted and matched with the
+notifications they produce.
+
+Reports p50/p99 signal->notification latency, throughput under bursts and
+the number of D-Bus calls the daemon made per event.
+"""
+
+import os
+import sys
+import time
+import signal
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+import importlib.util
+from collections import defaultdict, deque
+
+from dbus_next.aio import MessageBus
+from dbus_next.service import ServiceInterface, method, dbus_property
+from dbus_next.constants import MessageType, PropertyAccess
+
+from benchstats import percentile
+
+DAEMON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bt-notify-dbus.py')
+
+
+# ---------- Fake services ----------
+class FakeAdapter(ServiceInterface):
+    def __init__(self):
+        super().__init__('org.bluez.Adapter1')
+
+    @dbus_property(access=PropertyAccess.READ)
+    def Powered(self) -> 'b':
+        return True
+
+
+class FakeDevice(ServiceInterface):
+    def __init__(self, alias: str):
+        super().__init__('org.bluez.Device1')
+        self.alias = alias
+        self.connected = False
+
+    @dbus_property(access=PropertyAccess.READ)
+    def Alias(self) -> 's':
+        return self.alias
+
+    @dbus_property(access=PropertyAccess.READ)
+    def Name(self) -> 's':
+        return self.alias
+
+    @dbus_property(access=PropertyAccess.READ)
+    def Connected(self) -> 'b':
+        return self.connected
+
+
+class NotificationSink(ServiceInterface):
+    """Captures Notify calls with their arrival time."""
+
+    def __init__(self, on_notify):
+        super().__init__('org.freedesktop.Notifications')
+        self.on_notify = on_notify
+        self.next_id = 0
+
+    @method()
+    def Notify(self, app_name: 's', replaces_id: 'u', app_icon: 's', summary: 's', body: 's',
+               actions: 'as', hints: 'a{sv}', expire_timeout: 'i') -> 'u':
+        self.on_notify(time.perf_counter(), body)
+        if replaces_id:
+            return replaces_id
+        self.next_id += 1
+        return self.next_id
+
+
+class FakeWorld:
+    """Fake BlueZ + notification server running on their own loop/thread."""
+
+    def __init__(self, address: str, devices: int):
+        self.address = address
+        self.device_count = devices
+        self.loop = asyncio.new_event_loop()
+        self.ready = threading.Event()
+        self.devices = []
+        # alias -> emit timestamps not yet matched by a notification
+        self.emitted = defaultdict(deque)
+        self.latencies = []
+        self.notified = 0
+        self.last_notify = 0.0
+        self.calls = defaultdict(int)
+        self.done = threading.Event()
+        self.expected = 0
+
+    def count_calls(self, msg):
+        if msg.message_type == MessageType.METHOD_CALL:
+            self.calls[f'{msg.interface}.{msg.member}'] += 1
+
+    def on_notify(self, ts: float, body: str):
+        alias = body.rsplit(' ', 1)[0]
+        queue = self.emitted.get(alias)
+        if queue:
+            self.latencies.append(ts - queue.popleft())
+        self.notified += 1
+        self.last_notify = ts
+        if self.notified >= self.expected:
+            self.done.set()
+
+    async def setup(self):
+        self.bluez = await MessageBus(bus_address=self.address).connect()
+        self.bluez.add_message_handler(self.count_calls)
+        self.bluez.export('/org/bluez/hci0', FakeAdapter())
+        for i in range(self.device_count):
+            dev = FakeDevice(f'Device-{i}')
+            self.bluez.export(f'/org/bluez/hci0/dev_{i:02d}', dev)
+            self.devices.append(dev)
+        await self.bluez.request_name('org.bluez')
+
+        self.session = await MessageBus(bus_address=self.address).connect()
+        self.session.add_message_handler(self.count_calls)
+        self.session.export('/org/freedesktop/Notifications', NotificationSink(self.on_notify))
+        await self.session.request_name('org.freedesktop.Notifications')
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.setup())
+        self.ready.set()
+        self.loop.run_forever()
+
+    async def storm(self, events: int, burst: int, gap: float):
+        sent = 0
+        i = 0
+        while sent < events:
+            for _ in range(min(burst, events - sent)):
+                dev = self.devices[i % len(self.devices)]
+                i += 1
+                dev.connected = not dev.connected
+                self.emitted[dev.alias].append(time.perf_counter())
+                dev.emit_properties_changed({'Connected': dev.connected})
+                sent += 1
+            await asyncio.sleep(gap)
+
+    def run_storm(self, events: int, burst: int, gap: float) -> float:
+        self.expected = self.notified + events
+        started = time.perf_counter()
+        asyncio.run_coroutine_threadsafe(self.storm(events, burst, gap), self.loop).result()
+        return started
+
+
+# ---------- Harness ----------
+def start_dbus_daemon():
+    proc = subprocess.Popen(
+        ['dbus-daemon', '--session', '--nofork', '--print-address'],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    address = proc.stdout.readline().strip()
+    if not address:
+        proc.kill()
+        raise SystemExit('[ERROR] dbus-daemon did not start')
+    return proc, address
+
+
+def load_daemon(tmpdir: str):
+    spec = importlib.util.spec_from_file_location('bt_notify_dbus', DAEMON_PATH)
+    bt = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bt)
+    # Never collide with a real instance's lock or Waybar socket
+    bt.LOCK_FILE_PATH = os.path.join(tmpdir, 'bt-hook.lock')
+    bt.SOCKET_PATH = os.path.join(tmpdir, 'bt-hook.sock')
+    return bt
+
+
+async def bench(args, world: FakeWorld, bt):
+    daemon = asyncio.create_task(bt.main())
+    await asyncio.sleep(args.settle)  # initial GetManagedObjects + AddMatch
+
+    calls_before = dict(world.calls)
+    started = await asyncio.to_thread(world.run_storm, args.events, args.burst, args.gap_ms / 1000)
+    if not await asyncio.to_thread(world.done.wait, args.timeout):
+        print(f'[WARN] only {world.notified}/{world.expected} notifications arrived', file=sys.stderr)
+
+    daemon.cancel()
+    calls = {k: v - calls_before.get(k, 0) for k, v in world.calls.items()}
+    calls = {k: v for k, v in calls.items() if v}
+    return started, calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bt-notify-dbus.py signal->notification latency')
+    parser.add_argument('--devices', type=int, default=8)
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--burst', type=int, default=50, help='Signals emitted back-to-back per burst')
+    parser.add_argument('--gap-ms', type=float, default=20.0, help='Pause between bursts')
+    parser.add_argument('--settle', type=float, default=0.5, help='Seconds to let the daemon start')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Seconds to wait for notifications')
+    args = parser.parse_args()
+
+    proc, address = start_dbus_daemon()
+    try:
+        # The daemon connects to the "system" bus for BlueZ and the session
+        # bus for notifications: point both at the private daemon
+        os.environ['DBUS_SYSTEM_BUS_ADDRESS'] = address
+        os.environ['DBUS_SESSION_BUS_ADDRESS'] = address
+
+        world = FakeWorld(address, args.devices)
+        threading.Thread(target=world.run, daemon=True).start()
+        world.ready.wait()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bt = load_daemon(tmpdir)
+            started, calls = asyncio.run(bench(args, world, bt))
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait()
+
+    lat = sorted(world.latencies)
+    elapsed = world.last_notify - started
+    total_calls = sum(calls.values())
+    print(f'events          : {args.events} ({args.devices} devices, bursts of {args.burst}, gap {args.gap_ms} ms)')
+    print(f'notifications   : {len(lat)} matched / {world.notified} received')
+    print(f'latency p50     : {percentile(lat, 50) * 1000:.2f} ms')
+    print(f'latency p99     : {percentile(lat, 99) * 1000:.2f} ms')
+    print(f'latency max     : {(lat[-1] if lat else 0) * 1000:.2f} ms')
+    print(f'throughput      : {world.notified / elapsed if elapsed > 0 else 0:.0f} notifications/s')
+    print(f'dbus calls/event: {total_calls / args.events:.2f}')
+    for name, count in sorted(calls.items()):
+        print(f'  {name}: {count}')
+
+
+if __name__ == '__main__':
+    main()
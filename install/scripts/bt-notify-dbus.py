@@ -1,18 +1,30 @@
 #!/usr/bin/env python3
 
+import os
+import json
+import time
 import asyncio
-import subprocess
+import argparse
 import fcntl
 from dbus_next.aio import MessageBus
-from dbus_next import BusType
+from dbus_next import BusType, Variant
 from dbus_next.message import Message
 from dbus_next.constants import MessageType
 
+from statefeed import StateFeed, change_printer, follow
+
 # DBus constants for BlueZ
 BLUEZ = 'org.bluez'
 OBJMGR = 'org.freedesktop.DBus.ObjectManager'
 PROPS = 'org.freedesktop.DBus.Properties'
 DEV_IFACE = 'org.bluez.Device1'
+ADAPTER_IFACE = 'org.bluez.Adapter1'
+BATTERY_IFACE = 'org.bluez.Battery1'
+
+# DBus constants for the desktop notification server
+NOTIFICATIONS = 'org.freedesktop.Notifications'
+NOTIFICATIONS_PATH = '/org/freedesktop/Notifications'
+URGENCY_LEVELS = {'low': 0, 'normal': 1, 'critical': 2}
 
 # App/notification config
 APP_NAME = 'bt-hook'     # For swaync categorization
@@ -24,6 +36,12 @@ URGENCY_OFF = 'low'
 LOCK_FILE_PATH = '/tmp/bt-hook.lock'
 _lock_fh = None
 
+# Waybar feed (connected devices + battery) as JSON lines on a Unix socket
+SOCKET_PATH = os.path.join(
+    os.environ.get('XDG_RUNTIME_DIR') or f'/tmp/bt-hook-{os.getuid()}', 'bt-hook.sock'
+)
+BT_GLYPH = '\uf294'
+
 
 def acquire_lock_or_exit():
     """Acquire exclusive file lock to prevent multiple instances."""
@@ -37,34 +55,97 @@ def acquire_lock_or_exit():
         raise SystemExit(1)
 
 
-def notify(summary: str, body: str, urgency: str = 'normal', icon: str = ICON, app_name: str = APP_NAME):
-    """Send a notification using notify-send."""
-    subprocess.run(
-        ['notify-send', '-a', app_name, '-i', icon, '-u', urgency, summary, body],
-        check=False
+async def notify_send(summary: str, body: str, urgency: str = 'normal', icon: str = ICON, app_name: str = APP_NAME):
+    """Send a notification using notify-send (fallback path, does not block the loop)."""
+    proc = await asyncio.create_subprocess_exec(
+        'notify-send', '-a', app_name, '-i', icon, '-u', urgency, summary, body
     )
+    await proc.wait()
+
+
+class Notifier:
+    """
+    Desktop notification client on a persistent session bus connection.
+    Each key (device path) keeps its notification id, so repeated events for
+    the same device replace one bubble instead of stacking new ones; a None
+    key always opens a new bubble. Also used as the shared dispatcher by
+    desktop-events.py, where callers pass their own app_name/icon.
+    """
+
+    def __init__(self, app_name: str = APP_NAME, icon: str = ICON):
+        self.app_name = app_name
+        self.icon = icon
+        self.bus = None
+        self.ids = {}
+        # Serializes sends so a replacement always knows the previous id
+        self.lock = asyncio.Lock()
+
+    async def connect(self):
+        if self.bus is None or not self.bus.connected:
+            self.bus = await MessageBus(bus_type=BusType.SESSION).connect()
+            self.ids.clear()
+        return self.bus
+
+    async def notify(self, key, summary: str, body: str, urgency: str = 'normal', icon: str = None, app_name: str = None):
+        icon = icon or self.icon
+        app_name = app_name or self.app_name
+        async with self.lock:
+            try:
+                bus = await self.connect()
+                reply = await bus.call(Message(
+                    destination=NOTIFICATIONS,
+                    path=NOTIFICATIONS_PATH,
+                    interface=NOTIFICATIONS,
+                    member='Notify',
+                    signature='susssasa{sv}i',
+                    body=[
+                        app_name, self.ids.get(key, 0), icon, summary, body, [],
+                        {'urgency': Variant('y', URGENCY_LEVELS.get(urgency, 1))}, -1
+                    ]
+                ))
+                if reply.message_type == MessageType.METHOD_RETURN:
+                    if key is not None:
+                        self.ids[key] = reply.body[0]
+                    return
+                print(f"[ERROR] Notify failed: {reply.body}")
+            except Exception as e:
+                print(f"[ERROR] session bus unavailable: {e}")
+                self.bus = None
+            await notify_send(summary, body, urgency=urgency, icon=icon, app_name=app_name)
+
+
+def unwrap(value):
+    """Unwrap a dbus_next Variant if needed."""
+    return getattr(value, 'value', value)
 
 
-async def dbus_get(bus: MessageBus, path: str, iface: str, prop: str):
-    """Generic helper to get a property from DBus."""
+def display_name(props: dict):
+    """Pick the display name (Alias, then Name) from Device1 properties."""
+    alias = unwrap(props.get('Alias'))
+    name = unwrap(props.get('Name'))
+    display = alias or name
+    return display if isinstance(display, str) and display else None
+
+
+async def dbus_get_all(bus: MessageBus, path: str, iface: str):
+    """Get all properties of an interface from DBus in a single call."""
     msg = Message(
         destination=BLUEZ,
         path=path,
         interface=PROPS,
-        member='Get',
-        signature='ss',
-        body=[iface, prop]
+        member='GetAll',
+        signature='s',
+        body=[iface]
     )
     reply = await bus.call(msg)
     if reply.message_type == MessageType.METHOD_RETURN:
-        val = reply.body[0]
-        return getattr(val, 'value', val)  # Unwrap Variant if needed
+        return reply.body[0]
     return None
 
 
-async def fetch_initial_names(bus: MessageBus):
-    """Get initial mapping of device object paths to display names."""
-    names = {}
+async def fetch_initial_objects(bus: MessageBus):
+    """Get initial adapter, device and battery properties keyed by object path."""
+    adapters, devices, batteries = {}, {}, {}
     msg = Message(
         destination=BLUEZ,
         path='/',
@@ -75,54 +156,160 @@ async def fetch_initial_names(bus: MessageBus):
     if reply.message_type == MessageType.METHOD_RETURN:
         objects = reply.body[0]
         for path, ifaces in objects.items():
-            dev = ifaces.get(DEV_IFACE)
-            if dev:
-                alias_v = dev.get('Alias')
-                name_v = dev.get('Name')
-                alias = getattr(alias_v, 'value', alias_v)
-                name = getattr(name_v, 'value', name_v)
-                display = alias or name
-                if isinstance(display, str) and display:
-                    names[path] = display
-    return names
+            track_interfaces(path, ifaces, adapters, devices, batteries)
+    return adapters, devices, batteries
+
+
+def track_interfaces(path: str, ifaces: dict, adapters: dict, devices: dict, batteries: dict):
+    """Record the BlueZ interfaces we care about for one object path."""
+    if ADAPTER_IFACE in ifaces:
+        adapters[path] = dict(ifaces[ADAPTER_IFACE])
+    if DEV_IFACE in ifaces:
+        devices[path] = dict(ifaces[DEV_IFACE])
+    if BATTERY_IFACE in ifaces:
+        batteries[path] = dict(ifaces[BATTERY_IFACE])
+
+
+def bluetooth_state(adapters: dict, devices: dict, batteries: dict):
+    """Summarize the tables into what the Waybar feed shows."""
+    connected = []
+    for path, props in devices.items():
+        if not unwrap(props.get('Connected')):
+            continue
+        battery = unwrap(batteries.get(path, {}).get('Percentage'))
+        connected.append({'name': display_name(props) or path, 'battery': battery})
+    connected.sort(key=lambda d: d['name'])
+    powered = any(unwrap(a.get('Powered')) for a in adapters.values())
+    return {'powered': powered, 'devices': connected}
+
+
+# ---------- Waybar client ----------
+def waybar_bluetooth(state: dict):
+    """Render the feed like the stock bluetooth module, with batteries in the tooltip."""
+    if not state['powered']:
+        return {'text': f'{BT_GLYPH} off', 'tooltip': 'Bluetooth off', 'class': 'off'}
+    devs = state['devices']
+    lines = [f'Devices connected: {len(devs)}']
+    for d in devs:
+        lines.append(f"{d['name']}: {d['battery']}%" if d['battery'] is not None else d['name'])
+    return {
+        'text': f'{BT_GLYPH} {len(devs)}',
+        'tooltip': '\n'.join(lines),
+        'class': 'connected' if devs else 'on',
+    }
+
+
+def run_waybar_client():
+    """Print one Waybar JSON line per change; reconnect while the daemon is away."""
+    emit = change_printer()
+    while True:
+        try:
+            for line in follow(SOCKET_PATH):
+                emit(json.dumps(waybar_bluetooth(json.loads(line)), ensure_ascii=False))
+        except (OSError, ValueError):
+            pass
+        emit(json.dumps({'text': f'{BT_GLYPH} off', 'tooltip': f'{APP_NAME} not running', 'class': 'off'}, ensure_ascii=False))
+        time.sleep(2)
 
 
 async def main():
     # Enforce single instance
     acquire_lock_or_exit()
 
+    # Persistent session bus client for notifications
+    await watch(Notifier())
+
+
+async def watch(notifier: Notifier):
+    """Run the BlueZ watcher; the lock is held by the caller (main or desktop-events.py)."""
     # Connect to the system bus
     bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
 
-    # Cache device names
-    name_cache = await fetch_initial_names(bus)
+    # Adapter/device/battery tables (path -> properties), kept current from
+    # InterfacesAdded/InterfacesRemoved and PropertiesChanged signals
+    adapters, devices, batteries = await fetch_initial_objects(bus)
+    # In-flight cold lookups, so concurrent events share one GetAll call
+    lookups = {}
+
+    async def lookup_device(dev_path: str):
+        """Return Device1 properties from the table or a single GetAll call."""
+        props = devices.get(dev_path)
+        if props is not None:
+            return props
+        pending = lookups.get(dev_path)
+        if pending is None:
+            pending = asyncio.ensure_future(dbus_get_all(bus, dev_path, DEV_IFACE))
+            lookups[dev_path] = pending
+            pending.add_done_callback(lambda _f: lookups.pop(dev_path, None))
+        try:
+            props = await asyncio.shield(pending)
+        except Exception:
+            return {}
+        if props is not None and dev_path not in devices:
+            devices[dev_path] = dict(props)
+            publish()
+        return devices.get(dev_path, props or {})
 
     async def handle_notify(dev_path: str, connected: bool):
         """Send a connect/disconnect notification for the given device path."""
-        # Get name from cache or query DBus
-        display = name_cache.get(dev_path)
-        if not display:
-            alias = await dbus_get(bus, dev_path, DEV_IFACE, 'Alias')
-            name = await dbus_get(bus, dev_path, DEV_IFACE, 'Name')
-            display = alias or name or 'Unknown device'
-            if isinstance(display, str):
-                name_cache[dev_path] = display
+        display = display_name(await lookup_device(dev_path)) or 'Unknown device'
 
         if connected:
-            notify('Bluetooth Connected', f'{display} connected', urgency=URGENCY_ON)
+            await notifier.notify(dev_path, 'Bluetooth Connected', f'{display} connected', urgency=URGENCY_ON)
         else:
-            notify('Bluetooth Disconnected', f'{display} disconnected', urgency=URGENCY_OFF)
+            await notifier.notify(dev_path, 'Bluetooth Disconnected', f'{display} disconnected', urgency=URGENCY_OFF)
+
+    # Waybar feed and the last state sent to it
+    current = {'state': bluetooth_state(adapters, devices, batteries)}
+    feed = StateFeed(SOCKET_PATH, lambda: current['state'])
+
+    def publish():
+        """Push the feed state to subscribers when it changed."""
+        state = bluetooth_state(adapters, devices, batteries)
+        if state == current['state']:
+            return
+        current['state'] = state
+        feed.publish(state)
+
+    def on_objects_signal(msg: Message):
+        """Keep the tables in sync with added/removed BlueZ objects."""
+        if msg.member == 'InterfacesAdded' and len(msg.body) >= 2:
+            path, ifaces = msg.body
+            track_interfaces(path, ifaces, adapters, devices, batteries)
+        elif msg.member == 'InterfacesRemoved' and len(msg.body) >= 2:
+            path, ifaces = msg.body
+            for iface, table in ((ADAPTER_IFACE, adapters), (DEV_IFACE, devices), (BATTERY_IFACE, batteries)):
+                if iface in ifaces:
+                    table.pop(path, None)
+        publish()
 
     def on_signal(msg: Message):
         """Handle PropertiesChanged signals for Bluetooth devices."""
         if msg.message_type != MessageType.SIGNAL:
             return
+        if msg.interface == OBJMGR:
+            on_objects_signal(msg)
+            return
         if msg.interface != PROPS or msg.member != 'PropertiesChanged':
             return
         if len(msg.body) < 3:
             return
 
-        iface, changed, _invalidated = msg.body
+        iface, changed, invalidated = msg.body
+        table = {ADAPTER_IFACE: adapters, DEV_IFACE: devices, BATTERY_IFACE: batteries}.get(iface)
+        if table is None:
+            return
+
+        # Track renames, connection and battery changes in place
+        props = table.get(msg.path)
+        if props is not None:
+            props.update(changed)
+            for key in invalidated:
+                props.pop(key, None)
+        elif iface == BATTERY_IFACE:
+            table[msg.path] = dict(changed)
+        publish()
+
         if iface != DEV_IFACE:
             return
 
@@ -130,27 +317,43 @@ async def main():
         if connected_v is None:
             return
 
-        connected = getattr(connected_v, 'value', connected_v)
+        connected = unwrap(connected_v)
         asyncio.create_task(handle_notify(msg.path, connected))
 
-    # Add match rule to only receive BlueZ PropertiesChanged signals
-    await bus.call(Message(
-        destination='org.freedesktop.DBus',
-        path='/org/freedesktop/DBus',
-        interface='org.freedesktop.DBus',
-        member='AddMatch',
-        signature='s',
-        body=[f"type='signal',interface='{PROPS}',sender='{BLUEZ}'"]
-    ))
+    # Add match rules to only receive BlueZ PropertiesChanged and
+    # ObjectManager (InterfacesAdded/InterfacesRemoved) signals
+    for iface in (PROPS, OBJMGR):
+        await bus.call(Message(
+            destination='org.freedesktop.DBus',
+            path='/org/freedesktop/DBus',
+            interface='org.freedesktop.DBus',
+            member='AddMatch',
+            signature='s',
+            body=[f"type='signal',interface='{iface}',sender='{BLUEZ}'"]
+        ))
 
     bus.add_message_handler(on_signal)
 
+    # Serve the Waybar feed
+    await feed.start()
+
     # Keep running forever
     await asyncio.get_event_loop().create_future()
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bluetooth connect/disconnect notifier')
+    parser.add_argument(
+        '--waybar',
+        action='store_true',
+        help='Client mode: stream Waybar bluetooth module JSON from the running daemon'
+    )
+    args = parser.parse_args()
+
     try:
-        asyncio.run(main())
+        if args.waybar:
+            run_waybar_client()
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         pass
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Single desktop-event daemon hosting the notification watchers as plugins:
+- bluetooth: bt-notify-dbus.py (BlueZ D-Bus signals)
+- network:   nm-notify-dbus.py (RTNL link/route events)
+
+Both run on one asyncio loop in one interpreter, share one notification
+dispatcher (persistent session bus client) and hold their usual lock files,
+so a standalone instance of either script cannot run alongside.
+Each plugin keeps its own behavior, app name, log output and Waybar socket.
+"""
+
+import os
+import sys
+import asyncio
+import argparse
+import importlib.util
+from datetime import datetime
+from types import ModuleType
+from typing import Dict
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# plugin name -> script providing acquire_lock_or_exit() and watch(dispatcher)
+PLUGINS: Dict[str, str] = {
+    "bluetooth": "bt-notify-dbus.py",
+    "network": "nm-notify-dbus.py",
+}
+
+
+# ---------- Utility functions ----------
+def log(*args):
+    """Print timestamped log message"""
+    ts = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+    print(f"[{ts}] [DESKTOP]", *args, flush=True)
+
+
+def load_plugin(name: str) -> ModuleType:
+    """Import a watcher script by path (script names are not importable)"""
+    path = os.path.join(SCRIPTS_DIR, PLUGINS[name])
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---------- Main ----------
+async def run(plugins: Dict[str, ModuleType]):
+    # The session bus notification client of the Bluetooth watcher is shared by
+    # every plugin; without it the network watcher keeps using notify-send
+    dispatcher = plugins["bluetooth"].Notifier() if "bluetooth" in plugins else None
+
+    tasks = {asyncio.create_task(module.watch(dispatcher)): name for name, module in plugins.items()}
+    done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    for task in done:
+        if task.exception() is not None:
+            log(f"[ERR] plugin {tasks[task]} stopped:", task.exception())
+    # A dead plugin takes the service down so systemd restarts everything
+    sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Desktop event daemon (Bluetooth + network notifiers)")
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=sorted(PLUGINS),
+        help="Run only the given plugin (repeatable; default: all)",
+    )
+    args = parser.parse_args()
+
+    plugins: Dict[str, ModuleType] = {}
+    for name in args.only or sorted(PLUGINS):
+        try:
+            module = load_plugin(name)
+        except ImportError as e:
+            # e.g. pyroute2 or dbus_next missing: keep the other watchers running
+            log(f"[ERR] plugin {name} unavailable:", e)
+            continue
+        module.acquire_lock_or_exit()
+        plugins[name] = module
+        log(f"plugin {name} loaded")
+
+    if not plugins:
+        log("[ERR] no plugin could be loaded")
+        sys.exit(1)
+
+    try:
+        asyncio.run(run(plugins))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Lid switch handler (bindl switch:on:Lid Switch).
+
+Default: more than one monitor -> disable the internal display, otherwise
+enable it. --clamshell: disable the internal display only when an external
+monitor is connected and the lid is closed (/proc/acpi).
+"""
+
+import sys
+import glob
+import argparse
+
+from hypripc import HyprIPCError, Hyprland
+
+# 노트북 내장 디스플레이 이름 (hyprctl monitors로 확인)
+INTERNAL_DISPLAY = 'eDP-1'
+LID_STATE_GLOB = '/proc/acpi/button/lid/*/state'
+
+
+def lid_closed():
+    """True/False from /proc/acpi, None if there is no lid state file"""
+    for path in sorted(glob.glob(LID_STATE_GLOB)):
+        try:
+            with open(path, 'r') as f:
+                return 'closed' in f.read()
+        except OSError:
+            continue
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enable/disable the internal display on lid events")
+    parser.add_argument('--clamshell', action='store_true',
+                        help="Only disable the internal display when the lid is closed and an external monitor is connected")
+    args = parser.parse_args()
+
+    hypr = Hyprland()
+    monitors = hypr.monitors()
+
+    if args.clamshell:
+        external = any(m.name != INTERNAL_DISPLAY for m in monitors)
+        if not external or not lid_closed():
+            return 0
+        action = 'disable'
+    else:
+        action = 'disable' if len(monitors) > 1 else 'enable'
+
+    errors = hypr.keyword('monitor', f"{INTERNAL_DISPLAY}, {action}")
+    if errors:
+        print(f"keyword monitor failed: {'; '.join(errors)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    except HyprIPCError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Resident monitor hotplug / clamshell reactor for Hyprland.
+
+- Monitor topology: loaded once (j/monitors all), then kept current from
+  .socket2.sock monitoradded/monitorremoved events.
+- Lid state: logind's LidClosed property (PropertiesChanged on the system
+  bus); /proc/acpi/button/lid/*/state is polled only when logind is not
+  reachable.
+- Rule: the internal display is disabled while the lid is closed and an
+  external monitor is connected, and re-enabled with its monitor rule from
+  the Hyprland config (resolution, position, scale) otherwise.
+- Events are debounced, so a dock/undock burst settles in one evaluation and
+  at most one compositor request. Waybar's scale module is refreshed with
+  SIGRTMIN+SCALE_SIGNAL (also after a config reload) instead of polling.
+- Nothing is evaluated before the lid state has been read once, so a start
+  while docked with the lid closed does not re-enable the internal display.
+"""
+
+import os
+import sys
+import glob
+import fcntl
+import signal
+import asyncio
+import argparse
+from datetime import datetime
+
+from hyprlang import ConfigIndex, ParseError
+from hypripc import HyprIPCError, Hyprland, signal_waybar, socket_path
+
+# 노트북 내장 디스플레이 이름 (hyprctl monitors로 확인)
+INTERNAL_DISPLAY = 'eDP-1'
+LID_STATE_GLOB = '/proc/acpi/button/lid/*/state'
+LOCK_FILE_PATH = '/tmp/hypr-monitor-reactor.lock'
+_lock_fh = None
+
+DEBOUNCE_SEC = 0.4
+LID_POLL_SEC = 2
+RECONNECT_DELAY = 2
+SCALE_SIGNAL = 9   # "signal" of custom/scale-change in Waybar
+
+LOGIND = 'org.freedesktop.login1'
+LOGIND_PATH = '/org/freedesktop/login1'
+LOGIND_MANAGER = 'org.freedesktop.login1.Manager'
+PROPS = 'org.freedesktop.DBus.Properties'
+
+
+def log(*args):
+    ts = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+    print(f"[{ts}] [MONITOR]", *args, flush=True)
+
+
+def acquire_lock_or_exit():
+    """Acquire exclusive file lock to prevent multiple instances."""
+    global _lock_fh
+    _lock_fh = open(LOCK_FILE_PATH, 'w')
+    try:
+        fcntl.flock(_lock_fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print("[ERROR] hypr-monitor-reactor is already running.")
+        raise SystemExit(1)
+
+
+def read_acpi_lid():
+    """True/False from /proc/acpi, None if there is no lid state file"""
+    for path in sorted(glob.glob(LID_STATE_GLOB)):
+        try:
+            with open(path, 'r') as f:
+                return 'closed' in f.read()
+        except OSError:
+            continue
+    return None
+
+
+def internal_rule(config):
+    """Last `monitor = eDP-1, ...` of the Hyprland config (what a reload would apply)"""
+    index = ConfigIndex()
+    try:
+        rules = [value for _, _, value in index.where('monitor', config)
+                 if value.split(',', 1)[0].strip() == INTERNAL_DISPLAY and 'disable' not in value]
+    except (ParseError, OSError):
+        rules = []
+    finally:
+        index.save()
+    return rules[-1] if rules else f"{INTERNAL_DISPLAY}, enable"
+
+
+class Reactor:
+    def __init__(self, config, dry_run=False):
+        self.config = config
+        self.dry_run = dry_run
+        self.hypr = Hyprland(ttl=0)
+        self.outputs = set()        # connected and enabled outputs
+        self.internal_enabled = True
+        self.lid_closed = None      # None until logind / ACPI has answered
+        self.timer = None
+
+    # ---------- state ----------
+    def load_topology(self):
+        monitors = self.hypr.monitors(all=True)
+        self.outputs = {m.name for m in monitors if not m.disabled}
+        internal = next((m for m in monitors if m.name == INTERNAL_DISPLAY), None)
+        self.internal_enabled = internal is not None and not internal.disabled
+        log(f"outputs: {', '.join(sorted(self.outputs)) or '-'}")
+
+    def external_connected(self):
+        return any(name != INTERNAL_DISPLAY for name in self.outputs)
+
+    def schedule(self, reason):
+        """Debounce: evaluate once events have been quiet for DEBOUNCE_SEC"""
+        log(reason)
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = asyncio.get_running_loop().call_later(DEBOUNCE_SEC, self.evaluate)
+
+    def evaluate(self):
+        self.timer = None
+        if self.lid_closed is None:
+            return   # set_lid schedules the first evaluation
+        want = not (self.lid_closed and self.external_connected())
+        if want != self.internal_enabled:
+            rule = internal_rule(self.config) if want else f"{INTERNAL_DISPLAY}, disable"
+            log(f"lid {'closed' if self.lid_closed else 'open'}, external {self.external_connected()}: monitor = {rule}")
+            if not self.dry_run:
+                try:
+                    errors = self.hypr.keyword('monitor', rule)
+                except HyprIPCError as e:
+                    errors = [str(e)]
+                if errors:
+                    log("[ERR] keyword monitor:", '; '.join(errors))
+                    return
+            self.internal_enabled = want
+        signal_waybar(signal.SIGRTMIN + SCALE_SIGNAL)
+
+    # ---------- Hyprland events ----------
+    def on_event(self, name, data):
+        if name in ('monitoradded', 'monitoraddedv2'):
+            output = data.split(',')[1] if name == 'monitoraddedv2' else data
+            self.outputs.add(output)
+            if output == INTERNAL_DISPLAY:
+                self.internal_enabled = True
+            self.schedule(f"monitor added: {output}")
+        elif name == 'monitorremoved':
+            self.outputs.discard(data)
+            if data == INTERNAL_DISPLAY:
+                self.internal_enabled = False
+            self.schedule(f"monitor removed: {data}")
+        elif name == 'configreloaded':
+            # a reload may change monitor rules (scale) without a hotplug
+            signal_waybar(signal.SIGRTMIN + SCALE_SIGNAL)
+
+    async def listen_hyprland(self):
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(socket_path('.socket2.sock'))
+            except OSError as e:
+                log("[ERR] socket2:", e)
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            try:
+                self.load_topology()
+                self.schedule("connected to Hyprland")
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    name, _, data = line.decode(errors='replace').rstrip('\n').partition('>>')
+                    self.on_event(name, data)
+            except (OSError, HyprIPCError) as e:
+                log("[ERR] socket2:", e)
+            finally:
+                writer.close()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    # ---------- lid ----------
+    async def watch_logind(self):
+        """LidClosed from logind until the bus goes away; False if logind is unavailable or lost"""
+        try:
+            from dbus_next import BusType, Message, MessageType
+            from dbus_next.aio import MessageBus
+        except ImportError as e:
+            log("[ERR] dbus_next unavailable:", e)
+            return False
+        try:
+            bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+        except OSError as e:
+            log("[ERR] system bus:", e)
+            return False
+
+        async def get_lid_closed():
+            reply = await bus.call(Message(
+                destination=LOGIND, path=LOGIND_PATH, interface=PROPS, member='Get',
+                signature='ss', body=[LOGIND_MANAGER, 'LidClosed'],
+            ))
+            if reply.message_type == MessageType.ERROR:
+                raise OSError(f"{reply.error_name}: {reply.body}")
+            return bool(reply.body[0].value)
+
+        try:
+            self.set_lid(await get_lid_closed())
+        except OSError as e:
+            log("[ERR] logind:", e)
+            bus.disconnect()
+            return False
+
+        def on_signal(msg):
+            if msg.message_type != MessageType.SIGNAL or msg.member != 'PropertiesChanged' or msg.path != LOGIND_PATH:
+                return
+            iface, changed, invalidated = msg.body
+            if iface != LOGIND_MANAGER:
+                return
+            if 'LidClosed' in changed:
+                self.set_lid(bool(changed['LidClosed'].value))
+            elif 'LidClosed' in invalidated:
+                asyncio.ensure_future(refresh())
+
+        async def refresh():
+            try:
+                self.set_lid(await get_lid_closed())
+            except OSError as e:
+                log("[ERR] logind:", e)
+
+        await bus.call(Message(
+            destination='org.freedesktop.DBus', path='/org/freedesktop/DBus', interface='org.freedesktop.DBus',
+            member='AddMatch', signature='s',
+            body=[f"type='signal',sender='{LOGIND}',path='{LOGIND_PATH}',interface='{PROPS}',member='PropertiesChanged'"],
+        ))
+        bus.add_message_handler(on_signal)
+        log(f"lid (logind): {'closed' if self.lid_closed else 'open'}")
+        await bus.wait_for_disconnect()
+        log("[ERR] system bus disconnected")
+        return False
+
+    async def poll_acpi(self):
+        if read_acpi_lid() is None:
+            log("no lid state available; lid is treated as open")
+            if self.lid_closed is None:
+                self.set_lid(False)
+            return
+        log("lid (/proc/acpi): polling")
+        while True:
+            closed = read_acpi_lid()
+            if closed is not None:
+                self.set_lid(closed)
+            await asyncio.sleep(LID_POLL_SEC)
+
+    def set_lid(self, closed):
+        if closed != self.lid_closed:
+            self.lid_closed = closed
+            self.schedule(f"lid {'closed' if closed else 'open'}")
+
+    async def watch_lid(self):
+        if not await self.watch_logind():
+            await self.poll_acpi()
+
+
+async def main(args):
+    acquire_lock_or_exit()
+    reactor = Reactor(os.path.expanduser(args.config), dry_run=args.dry_run)
+    await asyncio.gather(reactor.listen_hyprland(), reactor.watch_lid())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Monitor hotplug / clamshell reactor for Hyprland')
+    parser.add_argument('--config', default='~/.config/hypr/hyprland.conf',
+                        help='Hyprland config the internal display rule is read from')
+    parser.add_argument('--dry-run', action='store_true', help='Log decisions without changing monitors')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        pass
+    except HyprIPCError as e:
+        print(f'[ERROR] {e}', file=sys.stderr)
+        sys.exit(1)
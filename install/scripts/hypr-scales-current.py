@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Waybar custom/scale-change: "<glyph>  <monitor> <scale>%" for the bar's output.
+Monitor: WAYBAR_OUTPUT_NAME by name, then by description, then the monitor of
+the active window; all from one batched IPC round trip.
+"""
+
+import os
+
+from hypripc import HyprIPCError, Hyprland
+
+GLYPH = ''
+UNKNOWN = f"{GLYPH}  --%"
+
+
+def resolve_monitor(hypr):
+    monitors, active = hypr.query('monitors', 'activewindow')
+    out = os.environ.get('WAYBAR_OUTPUT_NAME', '')
+    if out:
+        for m in monitors:
+            if m.get('name') == out:
+                return m
+        for m in monitors:
+            if out in (m.get('description') or ''):
+                return m
+    mid = (active or {}).get('monitor')
+    return next((m for m in monitors if m.get('id') == mid), None) if mid is not None else None
+
+
+def main():
+    try:
+        mon = resolve_monitor(Hyprland())
+    except HyprIPCError:
+        mon = None
+    if mon is None or mon.get('scale') is None:
+        print(UNKNOWN)
+        return
+    print(f"{GLYPH}  {mon['name']} {mon['scale'] * 100:.0f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Hyprland Monitor Scale Selector
+- Shows 4 scale options for the active monitor: 100%, 125%, 150%, 200%
+- Displays the current scale in the prompt (e.g., "( Current : 150% )")
+- Applies the change with one `keyword monitor ...` request (same mode and
+  refresh rate, position auto)
+All monitor data comes from one batched IPC round trip; walker is the only
+child process. Waybar's scale module is refreshed with SIGRTMIN+9 afterwards.
+"""
+
+import sys
+import fcntl
+import signal
+import subprocess
+
+from hypripc import HyprIPCError, Hyprland, signal_waybar
+
+LOCK_FILE_PATH = '/tmp/hypr-monitor-scale.lock'
+SCALES = {"100 %": "1.0", "125 %": "1.25", "150 %": "1.5", "200 %": "2.0"}
+SCALE_SIGNAL = 9   # "signal" of custom/scale-change in Waybar
+
+
+def show_scale_menu(monitor, current_scale):
+    try:
+        proc = subprocess.run(
+            ['walker', '--dmenu', '-p', f"Scale for {monitor} ( Current : {current_scale} )", '--theme', 'dmenu_250', '-w', '400'],
+            input=''.join(f"{opt}\n" for opt in SCALES), capture_output=True, text=True,
+        )
+    except OSError:
+        return ''
+    return proc.stdout.strip() if proc.returncode == 0 else ''
+
+
+def main():
+    lock = open(LOCK_FILE_PATH, 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return 0
+
+    hypr = Hyprland()
+    mon = hypr.active_monitor()
+    if mon is None:
+        return 0
+
+    choice = show_scale_menu(mon.name, f"{round(mon.scale * 100)} %")
+    if not choice:
+        return 0
+    if choice not in SCALES:
+        print(f"unknown scale: {choice}")
+        return 0
+
+    errors = hypr.keyword('monitor', f"{mon.name},{mon.closest_mode()},auto,{SCALES[choice]}")
+    if errors:
+        print(f"keyword monitor failed: {'; '.join(errors)}", file=sys.stderr)
+        return 1
+    signal_waybar(signal.SIGRTMIN + SCALE_SIGNAL)
+    return 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    except HyprIPCError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        sys.exit(0)
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Resident backend for hypr-window-switcher.sh.
+
+- Loads the client and workspace lists once over the Hyprland request socket,
+  then keeps them current from .socket2.sock events (openwindow, closewindow,
+  movewindowv2, windowtitlev2, workspace create/rename/destroy); events that
+  carry too little data trigger one re-fetch. openwindow only names the
+  workspace, so it is placed in place only when that name's id is known.
+- Resolves window class icons in-process with the compiled icon index of
+  sync-icons-to-waybar.py (reloaded when icons.map changes).
+- Re-renders the menu TSV (ws_num<TAB>label<TAB>addr, same format as the
+  script's own pipeline) only when something changed, serves it on a Unix
+  socket and publishes it to $XDG_RUNTIME_DIR for the shell trigger, which
+  can read a file without forking.
+
+Usage:
+  hypr-window-switcher-daemon.py          run the daemon
+  hypr-window-switcher-daemon.py --menu   print the current menu TSV
+"""
+
+import os
+import sys
+import json
+import fcntl
+import socket
+import asyncio
+import argparse
+import importlib.util
+from datetime import datetime
+
+from hypripc import HyprIPCError, socket_path, split_json_replies
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+RUNTIME_DIR = os.environ.get('XDG_RUNTIME_DIR') or f'/tmp/hypr-window-switcher-{os.getuid()}'
+SOCKET_PATH = os.path.join(RUNTIME_DIR, 'hypr-window-switcher.sock')
+MENU_FILE = os.path.join(RUNTIME_DIR, 'hypr-window-switcher.tsv')
+PID_FILE = os.path.join(RUNTIME_DIR, 'hypr-window-switcher.pid')
+LOCK_FILE_PATH = '/tmp/hypr-window-switcher-daemon.lock'
+_lock_fh = None
+
+DEFAULT_GLYPH = ' '
+REFETCH_DELAY = 0.05   # seconds; coalesces bursts of events that need a re-fetch
+RECONNECT_DELAY = 2
+
+# events whose payload is enough for an in-place update; anything else in
+# WATCHED_EVENTS re-fetches the client list
+WATCHED_EVENTS = {
+    'openwindow', 'closewindow', 'movewindow', 'movewindowv2', 'windowtitle', 'windowtitlev2',
+    'createworkspacev2', 'renameworkspace', 'destroyworkspacev2', 'configreloaded',
+}
+
+
+def log(*args):
+    ts = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+    print(f"[{ts}] [SWITCHER]", *args, flush=True)
+
+
+def acquire_lock_or_exit():
+    """Acquire exclusive file lock to prevent multiple instances."""
+    global _lock_fh
+    _lock_fh = open(LOCK_FILE_PATH, 'w')
+    try:
+        fcntl.flock(_lock_fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print("[ERROR] hypr-window-switcher-daemon is already running.")
+        raise SystemExit(1)
+
+
+def load_sync_icons():
+    """Import sync-icons-to-waybar.py by path (script names are not importable)"""
+    path = os.path.join(SCRIPTS_DIR, 'sync-icons-to-waybar.py')
+    spec = importlib.util.spec_from_file_location('sync_icons_to_waybar', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def normalize_addr(addr: str) -> str:
+    # socket2 events omit the 0x prefix that `clients` uses
+    return addr if addr.startswith('0x') else f'0x{addr}'
+
+
+def one_line(text: str) -> str:
+    return text.replace('\r', ' ').replace('\n', ' ').replace('\t', ' ')
+
+
+class Icons:
+    """Class -> glyph with a per-class memo, dropped when icons.map changes"""
+
+    def __init__(self):
+        try:
+            self.sync_icons = load_sync_icons()
+        except (ImportError, OSError) as e:
+            log("[ERR] icon lookup unavailable:", e)
+            self.sync_icons = None
+        self.stamp = None
+        self.index = None
+        self.memo = {}
+
+    def refresh(self):
+        if self.sync_icons is None:
+            return
+        path = self.sync_icons.ICONS_FILE_DEFAULT
+        try:
+            st = path.stat()
+        except OSError:
+            self.stamp, self.index, self.memo = None, None, {}
+            return
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self.stamp:
+            try:
+                self.index = self.sync_icons.load_icon_index(path)
+            except (self.sync_icons.ScriptError, OSError, ValueError) as e:
+                log("[ERR] icon index:", e)
+                self.index = None
+            self.stamp, self.memo = stamp, {}
+
+    def glyph(self, cls: str) -> str:
+        glyph = self.memo.get(cls)
+        if glyph is None:
+            glyph = (self.index.lookup(cls) if self.index else '') or DEFAULT_GLYPH
+            self.memo[cls] = glyph
+        return glyph
+
+
+class Switcher:
+    def __init__(self):
+        self.clients = {}   # addr -> {'ws': int, 'class': str, 'title': str}
+        self.workspace_ids = {}   # workspace name -> id (a name such as "3" need not be id 3)
+        self.movewindowv2 = False   # seen once: v1 movewindow (name only) is redundant
+        self.icons = Icons()
+        self.menu = None
+        self.refetch_handle = None
+
+    # ---------- Hyprland ----------
+    async def request(self, payload: str) -> bytes:
+        reader, writer = await asyncio.open_unix_connection(socket_path('.socket.sock'))
+        try:
+            writer.write(payload.encode())
+            await writer.drain()
+            return await reader.read()
+        finally:
+            writer.close()
+
+    async def fetch_clients(self):
+        clients, workspaces = split_json_replies(
+            (await self.request('[[BATCH]]j/clients;j/workspaces')).decode(errors='replace'), 2)
+        self.workspace_ids = {w['name']: w['id'] for w in workspaces}
+        self.clients = {
+            c['address']: {
+                'ws': (c.get('workspace') or {}).get('id', 0),
+                'class': c.get('class') or '',
+                'title': c.get('title') or '',
+            }
+            for c in clients
+            if c.get('mapped', True)
+        }
+        self.render()
+
+    def schedule_refetch(self):
+        if self.refetch_handle is None:
+            loop = asyncio.get_running_loop()
+            self.refetch_handle = loop.call_later(REFETCH_DELAY, lambda: asyncio.ensure_future(self._refetch()))
+
+    async def _refetch(self):
+        self.refetch_handle = None
+        try:
+            await self.fetch_clients()
+        except (OSError, ValueError, HyprIPCError) as e:
+            log("[ERR] clients:", e)
+
+    def on_event(self, name: str, data: str) -> bool:
+        """Apply one socket2 event; True if the client list changed in place"""
+        if name == 'openwindow':
+            # addr,wsname,class,title: the id comes from the workspace table
+            addr, ws, cls, title = data.split(',', 3)
+            ws_id = self.workspace_ids.get(ws)
+            if ws_id is None:
+                self.schedule_refetch()
+                return False
+            self.clients[normalize_addr(addr)] = {'ws': ws_id, 'class': cls, 'title': title}
+            return True
+        if name == 'closewindow':
+            return self.clients.pop(normalize_addr(data), None) is not None
+        if name == 'movewindowv2':
+            addr, ws_id, ws = data.split(',', 2)
+            self.movewindowv2 = True
+            self.workspace_ids[ws] = int(ws_id)
+            return self.move(addr, int(ws_id))
+        if name == 'movewindow':
+            # addr,wsname; Hyprland sends movewindowv2 right after it
+            if self.movewindowv2:
+                return False
+            addr, ws = data.split(',', 1)
+            ws_id = self.workspace_ids.get(ws)
+            if ws_id is None:
+                self.schedule_refetch()
+                return False
+            return self.move(addr, ws_id)
+        if name == 'createworkspacev2':
+            ws_id, ws = data.split(',', 1)
+            self.workspace_ids[ws] = int(ws_id)
+            return False
+        if name == 'renameworkspace':
+            ws_id, ws = data.split(',', 1)
+            self.forget_workspace(int(ws_id))
+            self.workspace_ids[ws] = int(ws_id)
+            return False
+        if name == 'destroyworkspacev2':
+            self.forget_workspace(int(data.split(',', 1)[0]))
+            return False
+        if name == 'windowtitlev2':
+            addr, title = data.split(',', 1)
+            client = self.clients.get(normalize_addr(addr))
+            if client is None or client['title'] == title:
+                return False
+            client['title'] = title
+            return True
+        if name == 'windowtitle':
+            # carries only the address; windowtitlev2 follows on current Hyprland
+            return False
+        self.schedule_refetch()
+        return False
+
+    def move(self, addr: str, ws_id: int) -> bool:
+        client = self.clients.get(normalize_addr(addr))
+        if client is None:
+            self.schedule_refetch()
+            return False
+        if client['ws'] == ws_id:
+            return False
+        client['ws'] = ws_id
+        return True
+
+    def forget_workspace(self, ws_id: int):
+        for ws in [n for n, i in self.workspace_ids.items() if i == ws_id]:
+            del self.workspace_ids[ws]
+
+    async def listen(self):
+        """Follow socket2 forever; re-sync from scratch after every (re)connect"""
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(socket_path('.socket2.sock'))
+            except OSError as e:
+                log("[ERR] socket2:", e)
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            try:
+                await self.fetch_clients()
+                log(f"watching {len(self.clients)} windows")
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    name, _, data = line.decode(errors='replace').rstrip('\n').partition('>>')
+                    if name in WATCHED_EVENTS:
+                        try:
+                            changed = self.on_event(name, data)
+                        except ValueError:
+                            self.schedule_refetch()
+                            continue
+                        if changed:
+                            self.render()
+            except (OSError, ValueError, HyprIPCError) as e:
+                log("[ERR] socket2:", e)
+            finally:
+                writer.close()
+            # Hyprland restarted or went away: the addresses are dead until the re-fetch
+            self.withdraw()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    # ---------- Menu ----------
+    def render(self):
+        """ws_num<TAB>label<TAB>addr, sorted by workspace, class, title"""
+        self.icons.refresh()
+        rows = sorted(
+            ((c['ws'], one_line(c['class']), one_line(c['title']), addr) for addr, c in self.clients.items()),
+            key=lambda r: (r[0], r[1], r[2]),
+        )
+        count = {}
+        lines = []
+        for ws, cls, title, addr in rows:
+            count[ws] = count.get(ws, 0) + 1
+            ws_num = f"W{ws}#{count[ws]}"
+            ws_label = f"Workspace {ws}" if count[ws] == 1 else "           "
+            lines.append(f'{ws_num}\t{ws_label} ({ws_num})  {self.icons.glyph(cls)}  "{title}"  ({cls})\t{addr}\n')
+        menu = ''.join(lines).encode()
+        if menu == self.menu:
+            return
+        self.menu = menu
+        tmp = f'{MENU_FILE}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(menu)
+        os.replace(tmp, MENU_FILE)
+
+    def withdraw(self):
+        """Drop the menu so clients fall back to hyprctl; render() republishes it"""
+        if self.refetch_handle is not None:
+            self.refetch_handle.cancel()
+            self.refetch_handle = None
+        self.menu = None
+        self.clients = {}
+        self.workspace_ids = {}
+        try:
+            os.unlink(MENU_FILE)
+        except FileNotFoundError:
+            pass
+
+    async def serve(self, reader, writer):
+        """One connection = one snapshot of the menu TSV (empty before the first fetch)"""
+        try:
+            writer.write(self.menu or b'')
+            await writer.drain()
+        except OSError:
+            pass
+        finally:
+            writer.close()
+
+
+async def main():
+    acquire_lock_or_exit()
+    os.makedirs(RUNTIME_DIR, mode=0o700, exist_ok=True)
+    switcher = Switcher()
+
+    # The instance lock is held, so an old socket is stale
+    try:
+        os.unlink(SOCKET_PATH)
+    except FileNotFoundError:
+        pass
+    await asyncio.start_unix_server(switcher.serve, path=SOCKET_PATH)
+    # hypr-window-switcher.sh trusts the published menu only while this pid lives
+    with open(PID_FILE, 'w') as f:
+        f.write(f'{os.getpid()}\n')
+    try:
+        await switcher.listen()
+    finally:
+        for path in (PID_FILE, MENU_FILE, SOCKET_PATH):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+def print_menu():
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(SOCKET_PATH)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    sys.stdout.buffer.write(b''.join(chunks))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Window switcher backend fed by Hyprland socket2 events')
+    parser.add_argument('--menu', action='store_true', help='Client mode: print the current menu TSV')
+    args = parser.parse_args()
+
+    try:
+        if args.menu:
+            print_menu()
+        else:
+            asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    except (HyprIPCError, OSError) as e:
+        print(f'[ERROR] {e}', file=sys.stderr)
+        sys.exit(1)
@@ -7,6 +7,12 @@ set -euo pipefail
 DEFAULT_GLYPH=' '
 LOCKFILE="/tmp/hypr-window-switcher.lock"
 DEBUG="${DEBUG:-0}" # DEBUG=1 ./hypr-window-switcher.sh
+# 아이콘 인덱스 조회용 (icons.map을 캐시된 인덱스로 한 번에 조회)
+SYNC_ICONS="${SYNC_ICONS:-$(dirname "$(readlink -f "$0")")/sync-icons-to-waybar.py}"
+# hypr-window-switcher-daemon.py가 미리 만들어 둔 메뉴 (데몬 pid가 살아 있을 때만 사용)
+DAEMON_DIR="${XDG_RUNTIME_DIR:-/tmp/hypr-window-switcher-$UID}"
+DAEMON_MENU="$DAEMON_DIR/hypr-window-switcher.tsv"
+DAEMON_PID="$DAEMON_DIR/hypr-window-switcher.pid"
 
 # =====
 # Debug helpers
@@ -28,6 +34,19 @@ exec 9>"$LOCKFILE" || exit 0
 flock -n 9 || exit 0
 trap 'rm -f "$LOCKFILE"' EXIT INT TERM
 
+# =====
+# 0) 데몬 메뉴: 포크 없이 bash 내장 명령만으로 읽기
+# =====
+read_daemon_menu() {
+  local pid menu=''
+  [[ -r "$DAEMON_PID" && -r "$DAEMON_MENU" ]] || return 1
+  read -r pid <"$DAEMON_PID" || return 1
+  kill -0 "$pid" 2>/dev/null || return 1
+  IFS= read -r -d '' menu <"$DAEMON_MENU" || true
+  [[ -n "$menu" ]] || return 1
+  printf -v DAEMON_MENU_TSV '%s' "${menu%$'\n'}"
+}
+
 # =====
 # 1) Data collection
 # =====
@@ -88,6 +107,23 @@ find_icon_from_json_array() {
   echo ""
 }
 
+# =====
+# 4-1) 아이콘 일괄 조회: 클래스 목록(한 줄에 하나) -> 글리프 목록(같은 순서)
+# - 창 수와 무관하게 프로세스 1개 (sync-icons-to-waybar.py lookup)
+# - 스크립트를 못 쓰면 HYPR_CLASS_ICON_MAP_JSON으로 한 줄씩 조회
+# =====
+lookup_icons() {
+  local classes="$1"
+  local out cls
+  if [[ -x "$SYNC_ICONS" ]] && out="$("$SYNC_ICONS" lookup 2>/dev/null <<<"$classes")"; then
+    printf '%s\n' "$out"
+    return 0
+  fi
+  while IFS= read -r cls; do
+    find_icon_from_json_array "${HYPR_CLASS_ICON_MAP_JSON:-[]}" "$cls"
+  done <<<"$classes"
+}
+
 # =====
 # 5) Bash로 메뉴 TSV 구성
 # 입력: ws<TAB>class<TAB>title<TAB>addr
@@ -96,7 +132,11 @@ find_icon_from_json_array() {
 build_menu_tsv_bash() {
   local sorted_tsv="$1"
   local default_glyph="$2"
-  local json_arr_str="${HYPR_CLASS_ICON_MAP_JSON:-[]}"
+  local glyphs=()
+  local i=0
+
+  # 모든 창의 아이콘을 한 번에 조회 (sorted_tsv와 같은 줄 순서)
+  mapfile -t glyphs < <(lookup_icons "$(cut -f2 <<<"$sorted_tsv")")
 
   # 워크스페이스별 카운터
   declare -A count
@@ -122,8 +162,9 @@ build_menu_tsv_bash() {
       ws_label="           "
     fi
 
-    # 아이콘 조회(클래스 소문자화 후 JSON 배열에서 찾기)
-    gl="$(find_icon_from_json_array "$json_arr_str" "$cls")"
+    # 미리 조회한 아이콘
+    gl="${glyphs[$i]:-}"
+    i=$((i + 1))
     [[ -z "$gl" ]] && gl="$default_glyph"
 
     # 라벨 합성
@@ -200,36 +241,52 @@ focus_window_sequence() {
 }
 
 # =====
-# Main
+# 데몬이 없을 때: hyprctl + jq 파이프라인으로 메뉴 TSV 구성
 # =====
-main() {
-  local clients_json raw_tsv sorted_tsv menu_tsv labels choice wsnum addr
+build_menu_from_hyprctl() {
+  local clients_json raw_tsv sorted_tsv menu_tsv
 
-  # 참고: 아래 캐시 로더는 현재 아이콘 매핑에 직접 사용하지 않음(디버그용).
-  # HYPR_CLASS_ICON_MAP_JSON(JSON 배열)을 직접 사용한다.
-  if [[ -n "${HYPR_CLASS_ICON_MAP_JSON:-}" && "$DEBUG" -eq 1 ]]; then
-    # 사람이 보기 좋게 key TAB glyph로 미리보기
-    local preview_lines
-    preview_lines="$(printf '%s' "$HYPR_CLASS_ICON_MAP_JSON" | jq -r '.[] | [.key, .value] | @tsv' | sed 's/\t/    [TAB]    /g' | sed -n '1,10p')"
-    dump_block "icon_map_json (preview key[TAB]glyph)" "$preview_lines" 10
-  fi
-
-  clients_json="$(get_clients_json)" || exit 0
+  clients_json="$(get_clients_json)" || return 1
 
   if [[ "$DEBUG" -eq 1 ]]; then
     log "clients_json bytes: $(printf '%s' "$clients_json" | wc -c | tr -d ' ')"
     printf '%s\n' "$clients_json" | jq '.[0] | {ws: .workspace.id, title: .title, class: .class, address: .address}' 2>/dev/null >&2 || true
   fi
 
-  raw_tsv="$(extract_tsv_fields_from_json "$clients_json")" || exit 0
+  raw_tsv="$(extract_tsv_fields_from_json "$clients_json")" || return 1
   [[ "$DEBUG" -eq 1 ]] && dump_block "raw_tsv (ws\tclass\ttitle\taddr)" "$raw_tsv" 20
 
   sorted_tsv="$(sort_menu_rows "$raw_tsv")"
   [[ "$DEBUG" -eq 1 ]] && dump_block "sorted_tsv" "$sorted_tsv" 20
 
-  menu_tsv="$(build_menu_tsv_bash "$sorted_tsv" "$DEFAULT_GLYPH")" || exit 0
+  menu_tsv="$(build_menu_tsv_bash "$sorted_tsv" "$DEFAULT_GLYPH")" || return 1
   [[ "$DEBUG" -eq 1 ]] && dump_block "menu_tsv (ws_num\tlabel\taddr)" "$menu_tsv" 40
 
+  printf '%s\n' "$menu_tsv"
+}
+
+# =====
+# Main
+# =====
+main() {
+  local menu_tsv labels choice wsnum addr
+
+  # 참고: 아래 캐시 로더는 현재 아이콘 매핑에 직접 사용하지 않음(디버그용).
+  # HYPR_CLASS_ICON_MAP_JSON(JSON 배열)을 직접 사용한다.
+  if [[ -n "${HYPR_CLASS_ICON_MAP_JSON:-}" && "$DEBUG" -eq 1 ]]; then
+    # 사람이 보기 좋게 key TAB glyph로 미리보기
+    local preview_lines
+    preview_lines="$(printf '%s' "$HYPR_CLASS_ICON_MAP_JSON" | jq -r '.[] | [.key, .value] | @tsv' | sed 's/\t/    [TAB]    /g' | sed -n '1,10p')"
+    dump_block "icon_map_json (preview key[TAB]glyph)" "$preview_lines" 10
+  fi
+
+  if read_daemon_menu; then
+    menu_tsv="$DAEMON_MENU_TSV"
+    [[ "$DEBUG" -eq 1 ]] && dump_block "menu_tsv from daemon (ws_num\tlabel\taddr)" "$menu_tsv" 40
+  else
+    menu_tsv="$(build_menu_from_hyprctl)" || exit 0
+  fi
+
   labels="$(extract_labels "$menu_tsv")"
   [[ "$DEBUG" -eq 1 ]] && dump_block "labels (for walker)" "$labels" 40
 
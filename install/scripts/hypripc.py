@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Small Hyprland IPC client shared by the Python scripts (replaces hyprctl + jq).
+
+- Hyprland: talks to the request socket ($XDG_RUNTIME_DIR/hypr/<sig>/.socket.sock)
+  directly. Hyprland answers one request per connection, so several queries
+  are sent as one [[BATCH]] request and their replies split apart here.
+- Replies to j/ queries are cached for a short TTL, so helpers such as
+  active_monitor() and monitors() called back to back cost one round trip.
+  keyword/dispatch/reload drop the cache.
+- Monitor, Workspace and Client wrap the JSON records with the fields the
+  scripts use (the raw dict stays available as .raw).
+- signal_waybar() pokes running Waybar instances (config reload, or a
+  module's "signal" refresh) without spawning pkill.
+"""
+
+import os
+import json
+import time
+import socket
+
+DEFAULT_TTL = 0.5   # seconds
+# Hyprland (hyprctl.cpp, dispatchBatch) appends this after every reply of a
+# [[BATCH]] request, the last one included; releases before it was added
+# concatenated the replies with nothing in between
+BATCH_DELIMITER = '\n\n\n'
+_DECODER = json.JSONDecoder()
+
+
+class HyprIPCError(Exception):
+    pass
+
+
+def socket_path(name='.socket.sock'):
+    """Path of a Hyprland socket (.socket.sock for requests, .socket2.sock for events)"""
+    sig = os.environ.get('HYPRLAND_INSTANCE_SIGNATURE')
+    if not sig:
+        raise HyprIPCError("Hyprland is not running (HYPRLAND_INSTANCE_SIGNATURE is not set)")
+    path = os.path.join(os.environ.get('XDG_RUNTIME_DIR', f'/run/user/{os.getuid()}'), 'hypr', sig, name)
+    if not os.path.exists(path):
+        path = os.path.join('/tmp/hypr', sig, name)   # older Hyprland
+    return path
+
+
+def signal_waybar(signum):
+    """Send signum to every running waybar; returns the number of processes signalled"""
+    count = 0
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f'/proc/{pid}/comm', 'r') as f:
+                if f.read().strip() != 'waybar':
+                    continue
+            os.kill(int(pid), signum)
+            count += 1
+        except OSError:
+            continue
+    return count
+
+
+def split_batch_replies(text, count):
+    """Plain-text replies of a batch (keyword/dispatch/...) -> list of `count` stripped replies"""
+    parts = text.split(BATCH_DELIMITER)
+    if parts and not parts[-1].strip():
+        parts.pop()
+    if len(parts) == count:
+        return [p.strip() for p in parts]
+    if text.strip() == 'ok' * count:
+        return ['ok'] * count   # no delimiter (older Hyprland), every command ok
+    raise HyprIPCError(f"Unexpected reply to a batch of {count}: {text[:200]!r}")
+
+
+def split_json_replies(text, count):
+    """JSON replies of a batch -> list of `count` values (whitespace, delimiters included, is skipped)"""
+    values, pos = [], 0
+    for _ in range(count):
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        try:
+            value, pos = _DECODER.raw_decode(text, pos)
+        except ValueError:
+            raise HyprIPCError(f"Unexpected reply: {text[pos:pos + 200]!r}")
+        values.append(value)
+    return values
+
+
+class Monitor:
+    __slots__ = ('raw', 'id', 'name', 'description', 'width', 'height', 'refresh_rate', 'x', 'y',
+                 'scale', 'transform', 'focused', 'disabled', 'active_workspace', 'available_modes')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.id = raw.get('id')
+        self.name = raw.get('name', '')
+        self.description = raw.get('description') or ''
+        self.width = raw.get('width', 0)
+        self.height = raw.get('height', 0)
+        self.refresh_rate = raw.get('refreshRate', raw.get('refresh_rate', 0.0))
+        self.x = raw.get('x', 0)
+        self.y = raw.get('y', 0)
+        self.scale = raw.get('scale', 1.0)
+        self.transform = raw.get('transform', 0)
+        self.focused = raw.get('focused', False)
+        self.disabled = raw.get('disabled', False)
+        self.active_workspace = (raw.get('activeWorkspace') or {}).get('name', '')
+        self.available_modes = raw.get('availableModes') or []
+
+    def closest_mode(self):
+        """Mode string at the current resolution whose refresh rate is closest to the current one"""
+        prefix = f"{self.width}x{self.height}@"
+        best, best_diff = None, None
+        for mode in self.available_modes:
+            if not mode.startswith(prefix):
+                continue
+            try:
+                diff = abs(self.refresh_rate - float(mode[len(prefix):].removesuffix('Hz')))
+            except ValueError:
+                continue
+            if best_diff is None or diff < best_diff:
+                best, best_diff = mode, diff
+        return best or f"{prefix}60.00Hz"
+
+    def __repr__(self):
+        return f"<Monitor {self.name} {self.width}x{self.height} x{self.scale}>"
+
+
+class Workspace:
+    __slots__ = ('raw', 'id', 'name', 'monitor', 'monitor_id', 'windows')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.id = raw.get('id')
+        self.name = raw.get('name', '')
+        self.monitor = raw.get('monitor', '')
+        self.monitor_id = raw.get('monitorID')
+        self.windows = raw.get('windows', 0)
+
+    def __repr__(self):
+        return f"<Workspace {self.name} on {self.monitor}>"
+
+
+class Client:
+    __slots__ = ('raw', 'address', 'workspace_id', 'workspace_name', 'monitor', 'class_name', 'title',
+                 'mapped', 'floating', 'pid')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.address = raw.get('address', '')
+        workspace = raw.get('workspace') or {}
+        self.workspace_id = workspace.get('id', 0)
+        self.workspace_name = workspace.get('name', '')
+        self.monitor = raw.get('monitor')
+        self.class_name = raw.get('class') or ''
+        self.title = raw.get('title') or ''
+        self.mapped = raw.get('mapped', True)
+        self.floating = raw.get('floating', False)
+        self.pid = raw.get('pid')
+
+    def __repr__(self):
+        return f"<Client {self.address} {self.class_name} ws={self.workspace_id}>"
+
+
+class Hyprland:
+    def __init__(self, ttl=DEFAULT_TTL, timeout=2.0):
+        self.path = socket_path()
+        self.ttl = ttl
+        self.timeout = timeout
+        self.cache = {}   # query -> (monotonic time, parsed reply)
+
+    # ---------- raw requests ----------
+    def request(self, payload):
+        """Send one request and return the whole reply as text"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.path)
+                sock.sendall(payload.encode())
+                chunks = []
+                while True:
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+            except OSError as e:
+                raise HyprIPCError(f"{self.path}: {e}") from e
+        return b''.join(chunks).decode(errors='replace')
+
+    def batch(self, commands):
+        """Run commands in one [[BATCH]] request; returns the non-ok replies (empty = all ok)"""
+        commands = list(commands)
+        if not commands:
+            return []
+        for cmd in commands:
+            if ';' in cmd:
+                raise HyprIPCError(f"';' cannot be sent in a batch: {cmd}")
+        self.cache.clear()
+        if len(commands) == 1:
+            replies = [self.request(commands[0]).strip()]
+        else:
+            replies = split_batch_replies(self.request('[[BATCH]]' + ';'.join(commands)), len(commands))
+        return [r for r in replies if r != 'ok']
+
+    def keyword(self, key, value):
+        return self.batch([f"keyword {key} {value}"])
+
+    def dispatch(self, dispatcher, arg=''):
+        return self.batch([f"dispatch {dispatcher} {arg}".rstrip()])
+
+    def reload(self):
+        self.cache.clear()
+        reply = self.request('reload').strip()
+        return [] if reply == 'ok' else [reply]
+
+    # ---------- JSON queries ----------
+    def query(self, *names):
+        """
+        JSON replies for the given queries ('monitors', 'activeworkspace', ...),
+        served from the cache when fresh; the rest is fetched in one batch
+        """
+        now = time.monotonic()
+        missing = [n for n in dict.fromkeys(names) if n not in self.cache or now - self.cache[n][0] > self.ttl]
+        if len(missing) == 1:
+            values = split_json_replies(self.request(f'j/{missing[0]}'), 1)
+        elif missing:
+            reply = self.request('[[BATCH]]' + ';'.join(f'j/{n}' for n in missing))
+            values = split_json_replies(reply, len(missing))
+        else:
+            values = []
+        for name, value in zip(missing, values):
+            self.cache[name] = (now, value)
+        return [self.cache[n][1] for n in names]
+
+    def monitors(self, all=False):
+        (data,) = self.query('monitors all' if all else 'monitors')
+        return [Monitor(m) for m in data]
+
+    def workspaces(self):
+        (data,) = self.query('workspaces')
+        return [Workspace(w) for w in data]
+
+    def clients(self):
+        (data,) = self.query('clients')
+        return [Client(c) for c in data]
+
+    def active_workspace(self):
+        (data,) = self.query('activeworkspace')
+        return Workspace(data) if data else None
+
+    def active_window(self):
+        (data,) = self.query('activewindow')
+        return Client(data) if data else None
+
+    def monitor(self, name):
+        return next((m for m in self.monitors() if m.name == name), None)
+
+    def active_monitor(self):
+        """Monitor showing the active workspace (one batched round trip)"""
+        workspace, monitors = self.query('activeworkspace', 'monitors')
+        name = (workspace or {}).get('name')
+        return next((Monitor(m) for m in monitors if (m.get('activeWorkspace') or {}).get('name') == name), None)
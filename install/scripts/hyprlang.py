@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Lossless hyprlang (Hyprland config) document model shared by the config tools.
+
+- Document: one file parsed into a tree of sections, keys, comments, blank
+  lines and `source =` includes. Every node keeps its line span, and the
+  original lines are kept verbatim so edits can be made in place.
+- ConfigIndex: follows `source =` includes from a root config. It keeps a
+  per-file key/include index cached on disk, keyed by path, mtime and size,
+  so queries such as "where is general:gaps_in defined" only stat the files
+  of the include graph and re-parse the ones that changed.
+
+CLI:
+  hyprlang.py where general:gaps_in [--config FILE]
+  hyprlang.py files [--config FILE]
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import argparse
+import tempfile
+
+HOME = os.path.expanduser('~')
+DEFAULT_CONFIG = os.path.join(HOME, '.config/hypr/hyprland.conf')
+CACHE_FILE = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(HOME, '.cache')), 'minsoft1115/hyprlang-index.json')
+CACHE_VERSION = 1
+
+SECTION_OPEN = re.compile(r'^(\s*)([^\s#={}][^#={}]*?)\s*\{\s*(#.*)?$')
+SECTION_CLOSE = re.compile(r'^\s*\}\s*(#.*)?$')
+# indent, key, " = ", value, trailing comment ('##' is an escaped '#')
+KEY_LINE = re.compile(r'^(\s*)([^\s#={}][^#={}]*?)(\s*=\s*)(.*?)(\s+#(?!#).*)?$')
+
+
+class ParseError(Exception):
+    pass
+
+
+class Node:
+    """
+    kind: 'section' | 'key' | 'source' | 'comment' | 'blank' | 'text'
+    line/end: 0-based first/last line (end == line except for sections)
+    path: full key/section path, e.g. ('decoration', 'blur', 'size')
+    """
+
+    __slots__ = ('kind', 'line', 'end', 'indent', 'name', 'sep', 'value', 'comment', 'path', 'depth', 'children')
+
+    def __init__(self, kind, line, indent='', name=None, sep=' = ', value=None, comment='', path=(), depth=0):
+        self.kind = kind
+        self.line = line
+        self.end = line
+        self.indent = indent
+        self.name = name
+        self.sep = sep
+        self.value = value
+        self.comment = comment
+        self.path = path
+        self.depth = depth
+        self.children = [] if kind == 'section' else None
+
+    def with_value(self, value):
+        """The node's line with `value` substituted, keeping indent, spacing and comment"""
+        return f"{self.indent}{self.name}{self.sep}{value}{self.comment}\n"
+
+    def __repr__(self):
+        return f"<{self.kind} {':'.join(self.path)} @{self.line + 1}>"
+
+
+class Document:
+    def __init__(self, path, lines):
+        self.path = path
+        self.lines = lines
+        self.root = Node('section', -1, path=())
+        self.root.end = len(lines)
+        self.sections = {(): [self.root]}   # section path -> nodes, in file order
+        self.keys = {}                      # key path -> nodes, in file order (last one wins)
+        self.sources = []                   # `source =` nodes, in file order
+        self._parse()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(path, f.readlines())
+
+    def text(self):
+        return ''.join(self.lines)
+
+    def _parse(self):
+        stack = [self.root]
+        for idx, raw in enumerate(self.lines):
+            text = raw.rstrip('\n')
+            parent = stack[-1]
+
+            m = SECTION_OPEN.match(text)
+            if m:
+                node = Node('section', idx, indent=m.group(1), name=m.group(2).strip(),
+                            comment=m.group(3) or '', depth=len(stack))
+                node.path = parent.path + tuple(node.name.split(':'))
+                parent.children.append(node)
+                self.sections.setdefault(node.path, []).append(node)
+                stack.append(node)
+                continue
+            if SECTION_CLOSE.match(text):
+                if len(stack) == 1:
+                    raise ParseError(f"{self.path}:{idx + 1}: unbalanced '}}'")
+                stack.pop().end = idx
+                continue
+
+            stripped = text.strip()
+            if not stripped:
+                parent.children.append(Node('blank', idx, depth=len(stack) - 1))
+                continue
+            if stripped.startswith('#'):
+                parent.children.append(Node('comment', idx, comment=stripped, depth=len(stack) - 1))
+                continue
+
+            m = KEY_LINE.match(text)
+            if not m:
+                parent.children.append(Node('text', idx, depth=len(stack) - 1))
+                continue
+            name = m.group(2)
+            node = Node('source' if name == 'source' else 'key', idx, indent=m.group(1), name=name, sep=m.group(3),
+                        value=m.group(4), comment=m.group(5) or '', depth=len(stack) - 1)
+            node.path = parent.path + tuple(name.split(':'))
+            parent.children.append(node)
+            if node.kind == 'source':
+                self.sources.append(node)
+            else:
+                self.keys.setdefault(node.path, []).append(node)
+
+        if len(stack) != 1:
+            raise ParseError(f"{self.path}: section '{':'.join(stack[-1].path)}' is not closed")
+
+    def include_paths(self, node):
+        """Files a `source =` node pulls in (~, $VARS and globs expanded, relative to this file)"""
+        target = os.path.expandvars(os.path.expanduser(node.value))
+        if not os.path.isabs(target):
+            target = os.path.join(os.path.dirname(os.path.abspath(self.path)), target)
+        matches = sorted(glob.glob(target))
+        return [os.path.realpath(p) for p in matches] if matches else [os.path.realpath(target)]
+
+
+def key_name(path):
+    return ':'.join(path)
+
+
+def parse_key_name(name):
+    """
+    'general:gaps_in' -> ('general', 'gaps_in'). Only ':' separates sections, as in
+    the parser; dotted leaf keys stay whole ('general:col.active_border').
+    """
+    return tuple(p.strip() for p in name.strip().split(':'))
+
+
+class ConfigIndex:
+    """Key definitions across a config's include graph, cached per file by (mtime, size)."""
+
+    def __init__(self, cache_file=CACHE_FILE):
+        self.cache_file = cache_file
+        self.dirty = False
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.files = data['files'] if data.get('version') == CACHE_VERSION else {}
+        except (OSError, ValueError, KeyError):
+            self.files = {}
+
+    def entry(self, path):
+        """Cached index of one file: {'keys': {name: [[line, value]...]}, 'sources': [[line, [paths]]]}"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        cached = self.files.get(path)
+        if cached and cached['mtime_ns'] == st.st_mtime_ns and cached['size'] == st.st_size:
+            return cached
+
+        doc = Document.load(path)
+        entry = {
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'keys': {key_name(k): [[n.line, n.value] for n in nodes] for k, nodes in doc.keys.items()},
+            'sources': [[n.line, doc.include_paths(n)] for n in doc.sources],
+        }
+        self.files[path] = entry
+        self.dirty = True
+        return entry
+
+    def walk(self, root=DEFAULT_CONFIG):
+        """(path, entry) in evaluation order; included files appear at their `source =` line"""
+        seen = set()
+
+        def visit(path):
+            if path in seen:
+                return
+            seen.add(path)
+            entry = self.entry(path)
+            if entry is None:
+                return
+            yield path, entry
+            for _, paths in entry['sources']:
+                for p in paths:
+                    yield from visit(p)
+
+        yield from visit(os.path.realpath(os.path.expanduser(root)))
+
+    def files_in_order(self, root=DEFAULT_CONFIG):
+        return [path for path, _ in self.walk(root)]
+
+    def where(self, name, root=DEFAULT_CONFIG):
+        """
+        Every definition of a key as [(path, line (1-based), value)] in the order
+        Hyprland evaluates them; the last one is the effective value.
+        """
+        wanted = key_name(parse_key_name(name))
+        seen = set()
+        found = []
+
+        def visit(path):
+            if path in seen:
+                return
+            seen.add(path)
+            entry = self.entry(path)
+            if entry is None:
+                return
+            events = [(line, 0, value) for line, value in entry['keys'].get(wanted, [])]
+            events += [(line, 1, paths) for line, paths in entry['sources']]
+            for line, is_source, payload in sorted(events, key=lambda e: e[0]):
+                if is_source:
+                    for p in payload:
+                        visit(p)
+                else:
+                    found.append((path, line + 1, payload))
+
+        visit(os.path.realpath(os.path.expanduser(root)))
+        return found
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.cache_file), prefix='.hyprlang-index.')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'files': self.files}, f)
+            os.replace(tmp, self.cache_file)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.dirty = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query Hyprland config keys across source= includes")
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help=f"Root config (default: {DEFAULT_CONFIG})")
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    p = sub.add_parser('where', help="Show where a key is defined (last line is the effective one)")
+    p.add_argument('key', help="e.g. general:gaps_in")
+    sub.add_parser('files', help="List the include graph in evaluation order")
+    args = parser.parse_args()
+
+    index = ConfigIndex()
+    try:
+        if args.cmd == 'where':
+            found = index.where(args.key, args.config)
+            for path, line, value in found:
+                print(f"{path}:{line}: {value}")
+            if not found:
+                print(f"{args.key}: not defined", file=sys.stderr)
+                sys.exit(1)
+        else:
+            for path in index.files_in_order(args.config):
+                print(path)
+    except ParseError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        index.save()
+
+
+if __name__ == '__main__':
+    main()
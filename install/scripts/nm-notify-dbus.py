@@ -4,35 +4,87 @@ Per-interface network connect/disconnect notifier with:
 - fcntl file lock to prevent multiple instances
 - Initial state snapshot on startup
 - Event-based notify only when state changes
+- Link state taken from RTNL event payloads (sysfs only as a fallback)
 - Two-stage connected check: Link-Ready / Internet-Ready
 - Ignore "fake disconnect" during reconnect process
 - Optional default route requirement (per-interface or system-wide)
+- Default routes tracked incrementally from RTNL route events
+- IPv4 addresses and routes per interface tracked for the VPN module
 - Intermediate states logged but not notified
+- Per-interface settle window folding event bursts into one transition
+- asyncio loop: netlink draining never waits on notify-send (bounded worker)
+- State stream on a Unix socket, with a Waybar client mode (--waybar)
 """
 
+import os
+import re
 import sys
-import subprocess
+import json
+import time
+import argparse
+import errno
 import fcntl
+import socket
+import asyncio
 from datetime import datetime
-from typing import Dict, Any, Optional
+from socket import AF_INET, AF_INET6
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
 
-from pyroute2 import IPRoute
-from pyroute2.netlink.rtnl import ifinfmsg
-from pyroute2.netlink.rtnl.ifinfmsg import IFF_RUNNING
+from pyroute2 import AsyncIPRoute, IPRoute
+from pyroute2.netlink import NLM_F_REPLACE
+from pyroute2.netlink.rtnl import ifinfmsg, RTM_NEWADDR, RTM_DELADDR, RTM_NEWROUTE, RTM_DELROUTE
+from pyroute2.netlink.rtnl.ifinfmsg import IFF_RUNNING, IFF_UP
+
+from statefeed import StateFeed, change_printer, follow
 
 APP = "net-hook"
 ICON_ON = "network-transmit-receive"
 ICON_OFF = "network-offline"
 
 LOCK_FILE_PATH = "/tmp/net-hook.lock"  # for fcntl lock
+SOCKET_PATH = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/net-hook-{os.getuid()}", "net-hook.sock"
+)
 _lock_fh = None
 
+# Pending desktop notifications, drained by notify_worker()
+_notify_queue: Optional[asyncio.Queue] = None
+# Shared notification dispatcher when hosted by desktop-events.py (None = notify-send)
+_dispatcher = None
+
 # Cache last known per-interface state: "connected", "disconnected", "intermediate"
 state_cache: Dict[str, str] = {}
 
+# ifindex -> last known link attributes ("name", "operstate", "carrier", "flags"),
+# kept current by RTM_NEWLINK/RTM_DELLINK
+link_table: Dict[int, Dict[str, Any]] = {}
+
+# Last published record per interface and the stream serving them
+published: Dict[str, Dict[str, Any]] = {}
+feed = StateFeed(SOCKET_PATH, lambda: {"type": "snapshot", "interfaces": published})
+
+# Interfaces waiting for their settle window to close:
+# name -> {"link": last link snapshot, "deadline": monotonic time, "events": raw event count}
+pending: Dict[str, Dict[str, Any]] = {}
+
+# Main-table default routes per (family, oif): set of (priority, tos, gateway).
+# Empty sets are dropped so "any default route" is a plain truth test.
+default_routes: Dict[Tuple[int, int], Set[Tuple]] = {}
+
+# Per ifindex: IPv4 addresses and main-table IPv4 routes (dst, dst_len, priority, tos),
+# i.e. what `ip addr` / `ip route show dev` report to vpn-status.sh
+inet_addresses: Dict[int, Set[str]] = {}
+dev_routes: Dict[int, Set[Tuple]] = {}
+
 # Config flags
+IGNORED_PREFIXES = ("veth", "docker", "br-", "tap")
+RT_TABLE_MAIN = 254                 # only the main table decides Internet-ready (policy/VPN tables don't)
 REQUIRE_DEFAULT_ROUTE = False       # True = require per-interface default route for connected
 SYSTEM_WIDE_DEFAULT_OK = True       # True = any default route counts as Internet-ready
+SETTLE_WINDOW_MS = int(os.environ.get("NET_HOOK_SETTLE_MS", "300"))  # 0 = classify every event
+NOTIFY_QUEUE_SIZE = 32              # oldest notification dropped when full
+NOTIFY_TIMEOUT = 5.0                # seconds before a stuck notify-send is killed
+VPN_PATTERN = re.compile(r"^(ppp|tun|tap|wg|tailscale)[0-9]*$")  # same as vpn-status.sh
 
 
 # ---------- Lock ----------
@@ -55,24 +107,45 @@ def log(*args):
 
 
 def notify(title: str, body: str, icon: str):
-    """Send desktop notification"""
+    """Queue desktop notification (never blocks the event loop)"""
     log("NOTIFY:", title, "|", body)
-    try:
-        subprocess.run(["notify-send", "-a", APP, "-i", icon, title, body], check=False)
-    except Exception as e:
-        log("[ERR] notify-send failed:", e)
+    if _notify_queue is None:
+        return
+    if _notify_queue.full():
+        dropped = _notify_queue.get_nowait()
+        log("[WARN] notify queue full, dropped:", dropped[0])
+    _notify_queue.put_nowait((title, body, icon))
+
+
+async def notify_worker():
+    """Run queued notify-send calls one at a time"""
+    while True:
+        title, body, icon = await _notify_queue.get()
+        try:
+            if _dispatcher is not None:
+                await asyncio.wait_for(
+                    _dispatcher.notify(None, title, body, icon=icon, app_name=APP), NOTIFY_TIMEOUT
+                )
+                continue
+            proc = await asyncio.create_subprocess_exec(
+                "notify-send", "-a", APP, "-i", icon, title, body
+            )
+            try:
+                await asyncio.wait_for(proc.wait(), NOTIFY_TIMEOUT)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                log("[ERR] notify-send timed out:", title)
+        except Exception as e:
+            log("[ERR] notify-send failed:", e)
 
 
-def ifname(ip: IPRoute, idx: int) -> str:
+def ifname(idx: int) -> str:
     """Resolve interface index to name string"""
     try:
-        for link in ip.get_links(idx):
-            for k, v in link.get("attrs", []):
-                if k == "IFLA_IFNAME":
-                    return v
-    except Exception:
-        pass
-    return f"if{idx}"
+        return socket.if_indextoname(idx)
+    except OSError:
+        return f"if{idx}"
 
 
 def read_sys(path: str) -> Optional[str]:
@@ -91,58 +164,183 @@ def read_carrier(name: str) -> bool:
     return read_sys(f"/sys/class/net/{name}/carrier") == "1"
 
 
-def has_default_route(ip: IPRoute, idx: int) -> bool:
+def is_ignored(name: str) -> bool:
+    """No connect/disconnect notifications for this interface"""
+    return name == "lo" or name.startswith(IGNORED_PREFIXES)
+
+
+def is_tracked(name: str) -> bool:
+    """Kept in the state feed: everything notified, plus ignored VPNs (tap*) for the Waybar VPN module"""
+    return not is_ignored(name) or bool(VPN_PATTERN.match(name))
+
+
+# ---------- Link table ----------
+def update_link(msg: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge the attributes carried by a link message into link_table.
+    Attributes absent from the message keep their last known value;
+    the kernel/sysfs are only queried when nothing is known yet.
+    """
+    idx = msg.get("index")
+    entry = dict(link_table.get(idx) or {"index": idx})
+    entry["flags"] = msg.get("flags", 0)
+
+    name = msg.get_attr("IFLA_IFNAME")
+    if name:
+        entry["name"] = name
+    elif "name" not in entry:
+        entry["name"] = ifname(idx)
+
+    oper = msg.get_attr("IFLA_OPERSTATE")
+    if oper is not None:
+        entry["operstate"] = oper.lower()
+    elif "operstate" not in entry:
+        entry["operstate"] = read_operstate(entry["name"])
+
+    carrier = msg.get_attr("IFLA_CARRIER")
+    if carrier is not None:
+        entry["carrier"] = bool(carrier)
+    elif "carrier" not in entry:
+        entry["carrier"] = read_carrier(entry["name"])
+
+    link_table[idx] = entry
+    return entry
+
+
+# ---------- Default route index ----------
+def route_oifs(msg: Dict[str, Any]) -> Set[int]:
+    """Return output interface indexes of a route (single or multipath)"""
+    oif = msg.get_attr("RTA_OIF")
+    if oif is not None:
+        return {oif}
+    oifs = set()
+    for nh in msg.get_attr("RTA_MULTIPATH") or []:
+        if nh.get("oif"):
+            oifs.add(nh["oif"])
+    return oifs
+
+
+def discard_default_routes(family: int, slot: Tuple):
+    """Drop every default route of a family in the given (priority, tos) slot"""
+    for key in [k for k in default_routes if k[0] == family]:
+        routes = default_routes[key]
+        routes.difference_update([r for r in routes if r[:2] == slot])
+        if not routes:
+            del default_routes[key]
+
+
+def index_dev_route(msg: Dict[str, Any], present: bool, replace: bool):
+    """Add or remove a main-table IPv4 route in the per-interface index"""
+    slot = (msg.get_attr("RTA_DST"), msg.get("dst_len", 0), msg.get_attr("RTA_PRIORITY"), msg.get("tos", 0))
+    if replace:
+        for idx in [i for i, routes in dev_routes.items() if slot in routes]:
+            dev_routes[idx].discard(slot)
+            if not dev_routes[idx]:
+                del dev_routes[idx]
+    for oif in route_oifs(msg):
+        if present:
+            dev_routes.setdefault(oif, set()).add(slot)
+            continue
+        routes = dev_routes.get(oif)
+        if routes is not None:
+            routes.discard(slot)
+            if not routes:
+                del dev_routes[oif]
+
+
+def index_route(msg: Dict[str, Any], present: bool):
+    """Add or remove a main-table route message in the indexes"""
+    if (msg.get_attr("RTA_TABLE") or msg.get("table")) != RT_TABLE_MAIN:
+        return
+    family = msg.get("family")
+    replace = present and bool(msg["header"].get("flags", 0) & NLM_F_REPLACE)
+    if family == AF_INET:
+        index_dev_route(msg, present, replace)
+    if msg.get("dst_len", 0) != 0:
+        return
+    slot = (msg.get_attr("RTA_PRIORITY"), msg.get("tos", 0))
+    ident = slot + (msg.get_attr("RTA_GATEWAY"),)
+    if replace:
+        # The replaced route may have had another gateway or oif
+        discard_default_routes(family, slot)
+    for oif in route_oifs(msg):
+        key = (family, oif)
+        if present:
+            default_routes.setdefault(key, set()).add(ident)
+            continue
+        routes = default_routes.get(key)
+        if routes is not None:
+            routes.discard(ident)
+            if not routes:
+                del default_routes[key]
+
+
+def drop_routes_for(idx: int):
+    """Forget routes of a removed or admin-down link (IPv4 flushes them silently)"""
+    for family in (AF_INET, AF_INET6):
+        default_routes.pop((family, idx), None)
+    dev_routes.pop(idx, None)
+
+
+def load_route_index(routes: Iterable[Dict[str, Any]]):
+    """Rebuild the index from a bulk route dump"""
+    default_routes.clear()
+    dev_routes.clear()
+    for r in routes:
+        index_route(r, True)
+
+
+# ---------- Address index ----------
+def index_addr(msg: Dict[str, Any], present: bool):
+    """Add or remove an IPv4 address message in the index"""
+    if msg.get("family") != AF_INET:
+        return
+    idx = msg.get("index")
+    addr = msg.get_attr("IFA_LOCAL") or msg.get_attr("IFA_ADDRESS")
+    if present:
+        inet_addresses.setdefault(idx, set()).add(addr)
+        return
+    addrs = inet_addresses.get(idx)
+    if addrs is not None:
+        addrs.discard(addr)
+        if not addrs:
+            del inet_addresses[idx]
+
+
+def load_addr_index(addrs: Iterable[Dict[str, Any]]):
+    """Rebuild the index from a bulk address dump"""
+    inet_addresses.clear()
+    for a in addrs:
+        index_addr(a, True)
+
+
+def has_default_route(idx: int) -> bool:
     """Check if default route exists via this interface (IPv4 or IPv6)"""
-    try:
-        for r in ip.get_routes(family=2, oif=idx):
-            if r.get("dst_len", 0) == 0:
-                return True
-        for r in ip.get_routes(family=10, oif=idx):
-            if r.get("dst_len", 0) == 0:
-                return True
-    except Exception:
-        pass
-    return False
+    return (AF_INET, idx) in default_routes or (AF_INET6, idx) in default_routes
 
 
-def has_any_default(ip: IPRoute) -> bool:
+def has_any_default() -> bool:
     """Check if any default route exists in system routing tables"""
-    try:
-        for r in ip.get_routes(family=2):
-            if r.get("dst_len", 0) == 0:
-                return True
-        for r in ip.get_routes(family=10):
-            if r.get("dst_len", 0) == 0:
-                return True
-    except Exception:
-        pass
-    return False
+    return bool(default_routes)
 
 
 # ---------- State classification ----------
-def classify_state(ip: IPRoute, name: str, idx: int) -> str:
+def classify_state(link: Dict[str, Any]) -> str:
     """
     Return "connected", "disconnected", or "intermediate"
     """
-    oper = read_operstate(name)
-    carrier_ok = read_carrier(name)
-    flags = 0
-    try:
-        links = ip.get_links(idx)
-        if links:
-            flags = links[0].get("flags", 0)
-    except Exception:
-        pass
-    flag_run = bool(flags & IFF_RUNNING)
+    oper = link.get("operstate")
+    carrier_ok = link.get("carrier", False)
+    flag_run = bool(link.get("flags", 0) & IFF_RUNNING)
 
     # Link-Ready stage
     link_ready = (oper == "up") and carrier_ok and flag_run
 
     # Internet-Ready stage
-    def_ok = has_default_route(ip, idx)
+    def_ok = has_default_route(link["index"])
     internet_ready = link_ready and (
         def_ok or
-        (SYSTEM_WIDE_DEFAULT_OK and has_any_default(ip)) or
+        (SYSTEM_WIDE_DEFAULT_OK and has_any_default()) or
         (not REQUIRE_DEFAULT_ROUTE)
     )
 
@@ -155,37 +353,90 @@ def classify_state(ip: IPRoute, name: str, idx: int) -> str:
     return "intermediate"
 
 
-def is_real_disconnect(ip: IPRoute, name: str, idx: int) -> bool:
+def is_real_disconnect(link: Dict[str, Any]) -> bool:
     """Return True only if definitely disconnected (no link, carrier down)"""
-    oper = read_operstate(name)
-    carrier_ok = read_carrier(name)
+    oper = link.get("operstate")
+    carrier_ok = link.get("carrier", False)
     return (not carrier_ok) and (oper in ("down", "lowerlayerdown", "notpresent"))
 
 
 # ---------- Event handling ----------
-def handle_link(ip: IPRoute, msg: Dict[str, Any]):
+def handle_route(msg: Dict[str, Any]):
+    index_route(msg, msg["header"]["type"] == RTM_NEWROUTE)
+    republish()
+
+
+def handle_addr(msg: Dict[str, Any]):
+    index_addr(msg, msg["header"]["type"] == RTM_NEWADDR)
+    republish()
+
+
+def handle_link(msg: Dict[str, Any]):
     idx = msg.get("index")
-    name = ifname(ip, idx)
-    if name == "lo" or name.startswith(("veth", "docker", "br-", "tap")):
+    link = update_link(msg)
+    if msg["header"]["type"] == ifinfmsg.RTM_DELLINK:
+        # The interface is gone: forget it and report it as not present
+        del link_table[idx]
+        link.update(operstate="notpresent", carrier=False)
+        drop_routes_for(idx)
+        inet_addresses.pop(idx, None)
+    elif not (link["flags"] & IFF_UP):
+        drop_routes_for(idx)
+
+    name = link["name"]
+    if not is_tracked(name):
+        return
+
+    if SETTLE_WINDOW_MS <= 0:
+        settle(name, link, 1)
         return
 
-    current = classify_state(ip, name, idx)
+    # Start or extend the settle window; the last snapshot wins
+    entry = pending.setdefault(name, {"events": 0})
+    entry["link"] = dict(link)
+    entry["events"] += 1
+    entry["deadline"] = time.monotonic() + SETTLE_WINDOW_MS / 1000
+
+
+def flush_pending(now: float):
+    """Classify every interface whose settle window has closed"""
+    for name in [n for n, e in pending.items() if e["deadline"] <= now]:
+        entry = pending.pop(name)
+        settle(name, entry["link"], entry["events"])
+
+
+def next_timeout() -> Optional[float]:
+    """Seconds until the nearest settle window closes (None = nothing pending)"""
+    if not pending:
+        return None
+    deadline = min(e["deadline"] for e in pending.values())
+    return max(0.0, deadline - time.monotonic())
+
+
+def apply_state(name: str, link: Dict[str, Any], events: int):
+    """Classify a settled link and notify on state change"""
+    current = classify_state(link)
     prev = state_cache.get(name)
-    log(f"EVENT {name}: current={current}, prev={prev}")
+    log(f"EVENT {name}: current={current}, prev={prev}, folded={events}")
 
     # state change only
     if current == prev:
         log(f"INFO {name}: state unchanged, skip notify")
         return
 
+    # tracked for the feed only: keep the state, stay silent
+    quiet = is_ignored(name)
+
     if current == "connected":
-        notify(f"{name} Connected", name, ICON_ON)
+        if not quiet:
+            notify(f"{name} Connected", name, ICON_ON)
         state_cache[name] = "connected"
         return
 
     if current == "disconnected":
-        if is_real_disconnect(ip, name, idx):
-            notify(f"{name} Disconnected", name, ICON_OFF)
+        if is_real_disconnect(link):
+            if not quiet:
+                notify(f"{name} Disconnected", name, ICON_OFF)
             state_cache[name] = "disconnected"
         else:
             log(f"INFO {name}: fake disconnect ignored (cache stays {prev})")
@@ -195,37 +446,205 @@ def handle_link(ip: IPRoute, msg: Dict[str, Any]):
     state_cache[name] = "intermediate"
 
 
+def settle(name: str, link: Dict[str, Any], events: int):
+    apply_state(name, link, events)
+    publish(name, link)
+
+
+def dispatch(msg: Dict[str, Any]):
+    mtype = msg["header"]["type"]
+    if mtype in (RTM_NEWROUTE, RTM_DELROUTE):
+        handle_route(msg)
+    elif mtype in (ifinfmsg.RTM_NEWLINK, ifinfmsg.RTM_DELLINK):
+        handle_link(msg)
+    elif mtype in (RTM_NEWADDR, RTM_DELADDR):
+        handle_addr(msg)
+
+
+# ---------- State stream ----------
+def link_record(name: str, link: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "state": state_cache.get(name),
+        "operstate": link.get("operstate"),
+        "carrier": bool(link.get("carrier")),
+        "up": bool(link.get("flags", 0) & IFF_UP),
+        "default_route": has_default_route(link["index"]),
+        "inet": link["index"] in inet_addresses,
+        "routes": link["index"] in dev_routes,
+    }
+
+
+def publish(name: str, link: Dict[str, Any]):
+    """Push an interface record to subscribers when it differs from the last one"""
+    record = link_record(name, link)
+    if published.get(name) == record:
+        return
+    if record["operstate"] == "notpresent":
+        published.pop(name, None)
+    else:
+        published[name] = record
+    feed.publish({"type": "update", "interface": record})
+
+
+def republish():
+    """Push records whose address/route fields changed (links in a settle window publish when it closes)"""
+    for link in link_table.values():
+        name = link["name"]
+        if is_tracked(name) and name not in pending:
+            publish(name, link)
+
+
+# ---------- Waybar client ----------
+def waybar_vpn(interfaces: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+    """Render the VPN module the way vpn-status.sh does, plus a tooltip"""
+    vpns = [
+        r for r in interfaces.values()
+        if VPN_PATTERN.match(r["name"]) and r["up"] and r["operstate"] in ("up", "unknown")
+        and r.get("inet") and r.get("routes")
+    ]
+    tooltip = "\n".join(
+        f"{r['name']}: {r['state']}" for r in sorted(interfaces.values(), key=lambda r: r["name"])
+    )
+    if vpns:
+        return {"text": "🔒 VPN", "tooltip": tooltip, "class": "vpn"}
+    return {"text": "", "tooltip": tooltip, "class": "novpn"}
+
+
+def run_waybar_client():
+    """Print one Waybar JSON line per change; reconnect while the daemon is away"""
+    emit = change_printer()
+    while True:
+        try:
+            interfaces: Dict[str, Dict[str, Any]] = {}
+            for line in follow(SOCKET_PATH):
+                msg = json.loads(line)
+                if msg["type"] == "snapshot":
+                    interfaces = msg["interfaces"]
+                else:
+                    record = msg["interface"]
+                    if record["operstate"] == "notpresent":
+                        interfaces.pop(record["name"], None)
+                    else:
+                        interfaces[record["name"]] = record
+                emit(json.dumps(waybar_vpn(interfaces), ensure_ascii=False))
+        except (OSError, ValueError):
+            pass
+        emit(json.dumps({"text": "", "tooltip": f"{APP} not running", "class": "novpn"}, ensure_ascii=False))
+        time.sleep(2)
+
+
 # ---------- Init and main ----------
-def init_state_cache():
+def dump_tables() -> Tuple[List[Any], List[Any], List[Any]]:
+    """Bulk dump routes (one request per family), links and IPv4 addresses; runs in a thread"""
+    routes: List[Any] = []
+    addrs: List[Any] = []
     with IPRoute() as ip:
-        for link in ip.get_links():
-            idx = link.get("index")
-            name = None
-            for k, v in link.get("attrs", []):
-                if k == "IFLA_IFNAME":
-                    name = v
-                    break
-            if not name or name == "lo" or name.startswith(("veth", "docker", "br-", "tap")):
-                continue
-            state_cache[name] = classify_state(ip, name, idx)
+        for family in (AF_INET, AF_INET6):
+            try:
+                routes.extend(ip.get_routes(family=family))
+            except Exception as e:
+                log(f"[ERR] route dump (family={family}) failed:", e)
+        try:
+            addrs = list(ip.get_addr(family=AF_INET))
+        except Exception as e:
+            log("[ERR] address dump failed:", e)
+        links = list(ip.get_links())
+    return routes, links, addrs
+
+
+def load_tables(routes: List[Any], links: List[Any], addrs: List[Any], initial: bool):
+    """Replace route/address indexes and link table with a fresh dump"""
+    load_route_index(routes)
+    load_addr_index(addrs)
+    link_table.clear()
+    pending.clear()
+    for msg in links:
+        link = update_link(msg)
+        name = link["name"]
+        if not is_tracked(name):
+            continue
+        if initial:
+            state_cache[name] = classify_state(link)
             log(f"INIT {name}: state={state_cache[name]}")
+        else:
+            settle(name, link, 0)
+
+
+async def read_events(ip: AsyncIPRoute, queue: asyncio.Queue):
+    """Drain the netlink socket as fast as it delivers into the event queue"""
+    while True:
+        try:
+            async for msg in ip.get():
+                queue.put_nowait(msg)
+        except OSError as e:
+            if e.errno != errno.ENOBUFS:
+                raise
+            # Kernel dropped events: the cached tables can no longer be trusted
+            log("[ERR] netlink receive buffer overflow (ENOBUFS), resyncing")
+            queue.put_nowait(None)
+
+
+async def process_events(queue: asyncio.Queue):
+    """Apply queued events and close settle windows when they expire"""
+    while True:
+        try:
+            msg = await asyncio.wait_for(queue.get(), next_timeout())
+        except asyncio.TimeoutError:
+            msg = False
+        try:
+            if msg is None:
+                load_tables(*await asyncio.to_thread(dump_tables), initial=False)
+            elif msg is not False:
+                dispatch(msg)
+            flush_pending(time.monotonic())
+        except Exception as e:
+            log("[ERR]", e)
+
+
+async def watch(dispatcher=None):
+    """
+    Run the RTNL watcher; the lock is held by the caller (main or
+    desktop-events.py, which passes its shared notification dispatcher).
+    """
+    global _notify_queue, _dispatcher
+    _dispatcher = dispatcher
+    _notify_queue = asyncio.Queue(maxsize=NOTIFY_QUEUE_SIZE)
+    events: asyncio.Queue = asyncio.Queue()
+    async with AsyncIPRoute() as ip:
+        # Subscribe before the bulk dump so no route change falls in between
+        await ip.bind()
+        load_tables(*await asyncio.to_thread(dump_tables), initial=True)
+        for link in link_table.values():
+            if is_tracked(link["name"]):
+                publish(link["name"], link)
+        await feed.start()
+        log("Listening for RTNL link/address/route events...")
+        log(f"Publishing state on {SOCKET_PATH}")
+        await asyncio.gather(
+            read_events(ip, events),
+            process_events(events),
+            notify_worker(),
+        )
 
 
 def main():
-    acquire_lock_or_exit()
-    init_state_cache()
-    with IPRoute() as ip:
-        ip.bind()
-        log("Listening for RTNL link events...")
-        while True:
-            try:
-                for msg in ip.get():
-                    if msg["header"]["type"] in (ifinfmsg.RTM_NEWLINK, ifinfmsg.RTM_DELLINK):
-                        handle_link(ip, msg)
-            except KeyboardInterrupt:
-                break
-            except Exception as e:
-                log("[ERR]", e)
+    parser = argparse.ArgumentParser(description="Network connect/disconnect notifier")
+    parser.add_argument(
+        "--waybar",
+        action="store_true",
+        help="Client mode: stream Waybar VPN module JSON from the running daemon",
+    )
+    args = parser.parse_args()
+
+    try:
+        if args.waybar:
+            run_waybar_client()
+            return
+        acquire_lock_or_exit()
+        asyncio.run(watch())
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Netlink record-and-replay harness for nm-notify-dbus.py:
+- record: capture raw RTNL link/address/route messages (initial dump + live events)
+- synth:  generate a synthetic link flap storm without touching interfaces
+- replay: feed a capture through the daemon's classification pipeline at
+          full speed (fake sysfs/notify, virtual clock for settle windows)
+          and report events/s, per-event latency percentiles, notifications
+
+Capture file: MAGIC, then records of <kind:u8><t:f64><len:u32><datagram>
+kind 0 = initial dump, 1 = live event; t = seconds since capture start.
+"""
+
+import os
+import sys
+import time
+import random
+import socket
+import struct
+import argparse
+import importlib.util
+from typing import Any, Dict, Iterator, List, Tuple
+
+from pyroute2.netlink.rtnl import RTM_NEWLINK, RTM_DELLINK, RTM_NEWADDR, RTM_DELADDR, RTM_NEWROUTE, RTM_DELROUTE
+from pyroute2.netlink.rtnl.ifinfmsg import ifinfmsg, IFF_UP, IFF_RUNNING
+from pyroute2.netlink.rtnl.rtmsg import rtmsg
+from pyroute2.netlink.rtnl.marshal import MarshalRtnl
+
+from benchstats import percentile
+
+DAEMON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nm-notify-dbus.py")
+
+MAGIC = b"NLREC1\n"
+RECORD = struct.Struct("<BdI")
+KIND_DUMP = 0
+KIND_EVENT = 1
+
+# RTNL multicast groups and request constants
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+RTMGRP_IPV6_ROUTE = 0x400
+RTM_GETLINK = 18
+RTM_GETADDR = 22
+RTM_GETROUTE = 26
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+NLMSG_DONE = 3
+NLMSG_HDR = struct.Struct("=LHHLL")
+
+
+# ---------- Capture file ----------
+def write_record(fh, kind: int, t: float, data: bytes):
+    fh.write(RECORD.pack(kind, t, len(data)))
+    fh.write(data)
+
+
+def read_records(path: str) -> Iterator[Tuple[int, float, bytes]]:
+    with open(path, "rb") as fh:
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise SystemExit(f"[ERROR] {path}: not a capture file")
+        while True:
+            head = fh.read(RECORD.size)
+            if len(head) < RECORD.size:
+                return
+            kind, t, length = RECORD.unpack(head)
+            yield kind, t, fh.read(length)
+
+
+# ---------- Recorder ----------
+def dump_request(sock: socket.socket, mtype: int, body: bytes, seq: int) -> List[bytes]:
+    """Send one dump request and return the raw reply datagrams"""
+    hdr = NLMSG_HDR.pack(NLMSG_HDR.size + len(body), mtype, NLM_F_REQUEST | NLM_F_DUMP, seq, 0)
+    sock.send(hdr + body)
+    replies = []
+    while True:
+        data = sock.recv(1 << 20)
+        replies.append(data)
+        # NLMSG_DONE always arrives last, in its own or the final datagram
+        offset = 0
+        while offset < len(data):
+            length, rtype, _, rseq, _ = NLMSG_HDR.unpack_from(data, offset)
+            if rtype == NLMSG_DONE and rseq == seq:
+                return replies
+            offset += (length + 3) & ~3
+
+
+def record(path: str, duration: float):
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 << 20)
+    sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE | RTMGRP_IPV6_ROUTE))
+
+    # Dump on a separate socket so replies never interleave with events
+    dump_sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+    dump_sock.bind((0, 0))
+    dumps = dump_request(dump_sock, RTM_GETLINK, bytes(16), 1)
+    dumps += dump_request(dump_sock, RTM_GETADDR, struct.pack("=BBBBI", socket.AF_INET, 0, 0, 0, 0), 2)
+    for seq, family in enumerate((socket.AF_INET, socket.AF_INET6), start=3):
+        dumps += dump_request(dump_sock, RTM_GETROUTE, struct.pack("=BBBBBBBBI", family, 0, 0, 0, 0, 0, 0, 0, 0), seq)
+    dump_sock.close()
+
+    start = time.monotonic()
+    events = 0
+    with open(path, "wb") as fh:
+        fh.write(MAGIC)
+        for data in dumps:
+            write_record(fh, KIND_DUMP, 0.0, data)
+        print(f"[INFO] recording to {path} (Ctrl-C to stop)", file=sys.stderr)
+        try:
+            while duration <= 0 or time.monotonic() - start < duration:
+                sock.settimeout(0.5)
+                try:
+                    data = sock.recv(1 << 20)
+                except socket.timeout:
+                    continue
+                write_record(fh, KIND_EVENT, time.monotonic() - start, data)
+                events += 1
+        except KeyboardInterrupt:
+            pass
+    print(f"[INFO] {len(dumps)} dump + {events} event datagrams recorded", file=sys.stderr)
+
+
+# ---------- Synthetic flap storm ----------
+def link_msg(mtype: int, idx: int, name: str, up: bool) -> bytes:
+    msg = ifinfmsg()
+    msg["header"]["type"] = mtype
+    msg["index"] = idx
+    msg["flags"] = IFF_UP | (IFF_RUNNING if up else 0)
+    msg["attrs"] = [
+        ("IFLA_IFNAME", name),
+        ("IFLA_OPERSTATE", "UP" if up else "DOWN"),
+        ("IFLA_CARRIER", 1 if up else 0),
+    ]
+    msg.encode()
+    return bytes(msg.data)
+
+
+def route_msg(mtype: int, idx: int) -> bytes:
+    msg = rtmsg()
+    msg["header"]["type"] = mtype
+    msg["family"] = socket.AF_INET
+    msg["dst_len"] = 0
+    msg["table"] = 254
+    msg["attrs"] = [("RTA_TABLE", 254), ("RTA_OIF", idx), ("RTA_GATEWAY", f"10.{idx}.0.1")]
+    msg.encode()
+    return bytes(msg.data)
+
+
+def synth(path: str, links: int, flaps: int, interval_ms: float, seed: int):
+    rnd = random.Random(seed)
+    names = {idx: f"wlp{idx}s0" for idx in range(2, links + 2)}
+    up = {idx: True for idx in names}
+    t = 0.0
+    with open(path, "wb") as fh:
+        fh.write(MAGIC)
+        for idx, name in names.items():
+            write_record(fh, KIND_DUMP, 0.0, link_msg(RTM_NEWLINK, idx, name, True))
+            write_record(fh, KIND_DUMP, 0.0, route_msg(RTM_NEWROUTE, idx))
+        for _ in range(flaps):
+            idx = rnd.choice(list(names))
+            up[idx] = not up[idx]
+            t += rnd.expovariate(1000 / interval_ms)
+            data = link_msg(RTM_NEWLINK, idx, names[idx], up[idx])
+            data += route_msg(RTM_NEWROUTE if up[idx] else RTM_DELROUTE, idx)
+            write_record(fh, KIND_EVENT, t, data)
+    print(f"[INFO] {flaps} flaps over {links} links ({t:.2f}s) written to {path}", file=sys.stderr)
+
+
+# ---------- Replayer ----------
+class VirtualClock:
+    """Stand-in for the daemon's `time` module driven by capture timestamps"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def load_daemon(verbose: bool):
+    spec = importlib.util.spec_from_file_location("nm_notify_dbus", DAEMON_PATH)
+    nm = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(nm)
+
+    notifications: List[Tuple[str, str]] = []
+    nm.notify = lambda title, body, icon: notifications.append((title, body))
+    nm.read_sys = lambda path: None      # fake sysfs: payload attributes only
+    nm.ifname = lambda idx: f"if{idx}"   # never touch the host's interfaces
+    if not verbose:
+        nm.log = lambda *args: None
+    nm.time = VirtualClock()
+    return nm, notifications
+
+
+def replay(path: str, settle_ms: int, verbose: bool) -> Dict[str, Any]:
+    nm, notifications = load_daemon(verbose)
+    nm.SETTLE_WINDOW_MS = settle_ms
+    marshal = MarshalRtnl()
+
+    dumps: Dict[int, List[Any]] = {RTM_NEWLINK: [], RTM_NEWADDR: [], RTM_NEWROUTE: []}
+    events: List[Tuple[float, Any]] = []
+    for kind, t, data in read_records(path):
+        for msg in marshal.parse(data):
+            mtype = msg["header"]["type"]
+            if mtype not in (RTM_NEWLINK, RTM_DELLINK, RTM_NEWADDR, RTM_DELADDR, RTM_NEWROUTE, RTM_DELROUTE):
+                continue
+            if kind == KIND_DUMP:
+                dumps.setdefault(mtype, []).append(msg)
+            else:
+                events.append((t, msg))
+
+    nm.load_tables(dumps[RTM_NEWROUTE], dumps[RTM_NEWLINK], dumps[RTM_NEWADDR], initial=True)
+
+    latencies: List[float] = []
+    clock = nm.time
+    started = time.perf_counter()
+    for t, msg in events:
+        clock.now = t
+        t0 = time.perf_counter()
+        # Windows that closed before this event fire first, as on the daemon's timer
+        nm.flush_pending(t)
+        nm.dispatch(msg)
+        nm.flush_pending(t)
+        latencies.append(time.perf_counter() - t0)
+    clock.now = float("inf")
+    nm.flush_pending(clock.now)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "events": len(events),
+        "elapsed_s": elapsed,
+        "events_per_s": len(events) / elapsed if elapsed > 0 else 0.0,
+        "p50_us": percentile(latencies, 50) * 1e6,
+        "p90_us": percentile(latencies, 90) * 1e6,
+        "p99_us": percentile(latencies, 99) * 1e6,
+        "max_us": (latencies[-1] if latencies else 0.0) * 1e6,
+        "notifications": len(notifications),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record/replay RTNL traffic for nm-notify-dbus.py")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("record", help="Capture live RTNL link/address/route messages")
+    p.add_argument("file")
+    p.add_argument("--duration", type=float, default=0, help="Seconds to record (default: until Ctrl-C)")
+
+    p = sub.add_parser("synth", help="Generate a synthetic link flap storm")
+    p.add_argument("file")
+    p.add_argument("--links", type=int, default=4)
+    p.add_argument("--flaps", type=int, default=10000)
+    p.add_argument("--interval-ms", type=float, default=2.0, help="Mean gap between flaps")
+    p.add_argument("--seed", type=int, default=1)
+
+    p = sub.add_parser("replay", help="Benchmark the daemon pipeline on a capture")
+    p.add_argument("file")
+    p.add_argument("--settle-ms", type=int, default=300, help="Settle window to replay with (0 = off)")
+    p.add_argument("--verbose", action="store_true", help="Keep the daemon's log output")
+
+    args = parser.parse_args()
+    if args.cmd == "record":
+        record(args.file, args.duration)
+    elif args.cmd == "synth":
+        synth(args.file, args.links, args.flaps, args.interval_ms, args.seed)
+    else:
+        r = replay(args.file, args.settle_ms, args.verbose)
+        print(f"events        : {r['events']}")
+        print(f"elapsed       : {r['elapsed_s']:.3f} s")
+        print(f"throughput    : {r['events_per_s']:.0f} events/s")
+        print(f"latency p50   : {r['p50_us']:.1f} us")
+        print(f"latency p90   : {r['p90_us']:.1f} us")
+        print(f"latency p99   : {r['p99_us']:.1f} us")
+        print(f"latency max   : {r['max_us']:.1f} us")
+        print(f"notifications : {r['notifications']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ show_help() {
   echo "Options:"
   echo "  -h, --help          Display this help message and exit"
   echo "  --show              Show the current battery threshold for all detected batteries"
+  echo "  --all <value>       Set the threshold for all detected batteries at once"
   echo
   echo "Description:"
   echo "This script allows you to set or view the battery charge control end threshold for"
@@ -19,6 +20,7 @@ show_help() {
   echo "Examples:"
   echo "  sudo ./set_battery_threshold.sh          # Set the threshold for a battery"
   echo "  sudo ./set_battery_threshold.sh --show   # Show the current thresholds"
+  echo "  ./set_battery_threshold.sh --all 80      # Set every battery to 80% (via battery-threshold service)"
   exit 0
 }
 show_thresholds() {
@@ -32,6 +34,47 @@ show_thresholds() {
   done
   exit 0
 }
+set_all_thresholds() {
+  local threshold="$1"
+  if ! [[ "$threshold" =~ ^[0-9]+$ ]] || [ "$threshold" -lt 60 ] || [ "$threshold" -gt 100 ]; then
+    echo "Invalid input. The threshold must be an integer between 60 and 100."
+    exit 1
+  fi
+
+  local names=()
+  for battery_path in /sys/class/power_supply/BAT*/charge_control_end_threshold; do
+    [[ -f "$battery_path" ]] && names+=("$(basename "$(dirname "$battery_path")")")
+  done
+  if [ "${#names[@]}" -eq 0 ]; then
+    echo "No batteries with a 'charge_control_end_threshold' file found."
+    exit 1
+  fi
+
+  # One SetThresholds round trip to the service when it is available
+  local args=()
+  for name in "${names[@]}"; do
+    args+=("$name" "$threshold")
+  done
+  if busctl call org.minsoft1115.BatteryThreshold /org/minsoft1115/BatteryThreshold \
+    org.minsoft1115.BatteryThreshold SetThresholds 'a{su}' "${#names[@]}" "${args[@]}" >/dev/null 2>&1; then
+    echo "Battery threshold set to $threshold% successfully for ${names[*]}."
+    exit 0
+  fi
+
+  # Fall back to writing sysfs directly
+  if [ "$(id -u)" -ne 0 ]; then
+    echo "battery-threshold service unavailable; run this script as root or using sudo."
+    exit 1
+  fi
+  for name in "${names[@]}"; do
+    if echo "$threshold" >"/sys/class/power_supply/$name/charge_control_end_threshold"; then
+      echo "Battery threshold set to $threshold% successfully for $name."
+    else
+      echo "Failed to set battery threshold for $name."
+    fi
+  done
+  exit 0
+}
 
 if [[ "$1" == "-h" || "$1" == "--help" ]]; then
   show_help
@@ -39,6 +82,9 @@ fi
 if [[ "$1" == "--show" ]]; then
   show_thresholds
 fi
+if [[ "$1" == "--all" ]]; then
+  set_all_thresholds "$2"
+fi
 
 # Force root
 if [ "$(id -u)" -ne 0 ]; then
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unix-socket state feed shared by the daemons that stream to Waybar
+(nm-notify-dbus.py, bt-notify-dbus.py, waybar-status.py).
+
+- StateFeed: server side. A new subscriber gets the current snapshot, then
+  every published message as one JSON line. Subscribers that stop reading
+  are dropped instead of growing the daemon's write buffers.
+  With topics, a client names the topic it wants on its first line and only
+  receives that topic.
+- follow(): client side, the lines of one connection to a feed.
+- change_printer(): prints a Waybar line only when it differs from the last.
+"""
+
+import os
+import json
+import socket
+import asyncio
+
+SUBSCRIBER_BUFFER_LIMIT = 64 * 1024   # bytes queued for a stalled subscriber before dropping it
+TOPIC_TIMEOUT = 5                     # seconds a client gets to name its topic
+
+
+def encode(payload):
+    """One feed line: str payloads are sent as they are, anything else as JSON"""
+    if not isinstance(payload, str):
+        payload = json.dumps(payload, ensure_ascii=False)
+    return payload.encode() + b'\n'
+
+
+class StateFeed:
+    def __init__(self, path, snapshot, topics=None, on_subscribe=None):
+        self.path = path
+        # () -> payload sent to every new subscriber; with topics: (topic) -> payload or None
+        self.snapshot = snapshot
+        self.topics = None if topics is None else set(topics)
+        self.on_subscribe = on_subscribe   # (topic) -> None, called after a client joined
+        self.subscribers = {topic: set() for topic in (self.topics or [None])}
+
+    def subscribed(self, topic=None):
+        return bool(self.subscribers[topic])
+
+    def send(self, writer, payload, topic=None):
+        """Queue one line; subscribers that stop reading are dropped"""
+        if writer.transport.get_write_buffer_size() > SUBSCRIBER_BUFFER_LIMIT:
+            self.subscribers[topic].discard(writer)
+            writer.close()
+            return
+        writer.write(encode(payload))
+
+    def publish(self, payload, topic=None):
+        for writer in list(self.subscribers[topic]):
+            self.send(writer, payload, topic)
+
+    async def read_topic(self, reader):
+        try:
+            topic = (await asyncio.wait_for(reader.readline(), TOPIC_TIMEOUT)).decode().strip()
+        except (asyncio.TimeoutError, OSError, UnicodeDecodeError):
+            return None
+        return topic if topic in self.topics else None
+
+    async def serve(self, reader, writer):
+        """Send the snapshot, then stream until the client leaves"""
+        topic = None
+        if self.topics is not None:
+            topic = await self.read_topic(reader)
+            if topic is None:
+                writer.close()
+                return
+            payload = self.snapshot(topic)
+        else:
+            payload = self.snapshot()
+        if payload is not None:
+            self.send(writer, payload, topic)
+        self.subscribers[topic].add(writer)
+        if self.on_subscribe is not None:
+            self.on_subscribe(topic)
+        try:
+            await reader.read()   # clients send nothing else; EOF means gone
+        finally:
+            self.subscribers[topic].discard(writer)
+            writer.close()
+
+    async def start(self):
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        # The caller holds its instance lock, so any existing socket file is stale
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        return await asyncio.start_unix_server(self.serve, path=self.path)
+
+
+def follow(path, topic=None):
+    """Lines of one connection to a feed; ends when the daemon closes it (OSError if it is not running)"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        if topic is not None:
+            sock.sendall(f'{topic}\n'.encode())
+        for line in sock.makefile('r', encoding='utf-8'):
+            yield line.rstrip('\n')
+
+
+def change_printer():
+    """emit(line): print a line (flushed) unless it repeats the previous one"""
+    last = None
+
+    def emit(line):
+        nonlocal last
+        if line is not None and line != last:
+            print(line, flush=True)
+            last = line
+
+    return emit
@@ -2,22 +2,31 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import ctypes
 import datetime
+import hashlib
 import json
 import os
+import re
+import select
 import shutil
+import signal
+import struct
 import sys
+import tempfile
+import time
 from pathlib import Path
 
-try:
-    import json5  # pip install json5
-except ImportError:
-    print("Error: json5 module not found. Install with: pip install json5", file=sys.stderr)
-    sys.exit(1)
-
 HOME = Path.home()
 ICONS_FILE_DEFAULT = HOME / ".config/hypr/icons.map"
 WAYBAR_CONFIG = HOME / ".config/waybar/config.jsonc"
+WINDOW_REWRITE_PATH = ["hyprland/workspace", "window-rewrite"]
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", HOME / ".cache")) / "minsoft1115"
+STATE_FILE = CACHE_DIR / "sync-icons-to-waybar.json"
+INDEX_FILE = CACHE_DIR / "icons-index.json"
+INDEX_VERSION = 2
+KEEP_BACKUPS_DEFAULT = 5
+DEBOUNCE_MS_DEFAULT = 50
 
 
 class ScriptError(Exception):
@@ -119,43 +128,504 @@ def build_window_rewrite_map_json(icons_file: Path):
     return flat
 
 
-def read_jsonc_to_json(path: Path):
-    # JSONC를 파싱해 Python 객체로 (json5 사용)
+# ---------- 아이콘 인덱스 (window switcher용) ----------
+_CLASS_PATTERN = re.compile(r"^class<\((.*)\)>$")
+_REGEX_META = re.compile(r"[\[\]()*+?{}^$\\]")
+# 합친 정규식 안에서는 그룹 번호/이름이 바뀌므로 그룹을 참조하는 패턴은 받지 않는다
+_GROUP_REFERENCE = re.compile(r"\\(?:[1-9]|g<)|\(\?P[<=]|\(\?\(")
+
+
+def normalize_icon_rules(icons_file: Path):
+    """
+    load-icons-map.sh와 같은 정규화: class<( … )> 벗기기 → '|' 분해.
+    규칙 순서대로 (key, glyph) 목록 (소문자화는 compile_index에서: 정규식 키는 그대로 둔다)
+    """
+    arr = pairs_to_json_array_obj(to_tab_pairs(filter_lines(icons_file)))
+    rules = []
+    for rec in arr:
+        m = _CLASS_PATTERN.match(rec["key"])
+        key = m.group(1) if m else rec["key"]
+        for part in key.split("|"):
+            rules.append((part, rec["value"]))
+    return rules
+
+
+def has_group_reference(pattern: str) -> bool:
+    """역참조(\\1, \\g<…>, (?P=…)), 이름 그룹, 조건 그룹이 있는지 (이스케이프된 글자는 건너뜀)"""
+    return any(m.group(0) != "\\\\" for m in re.finditer(r"\\\\|" + _GROUP_REFERENCE.pattern, pattern))
+
+
+def compile_index(icons_file: Path) -> dict:
+    """정확 일치 테이블 + 패턴 키 목록. 같은 키는 마지막 규칙이 이긴다 (규칙 번호 보존)"""
+    exact = {}
+    patterns = []
+    for idx, (key, glyph) in enumerate(normalize_icon_rules(icons_file)):
+        if _REGEX_META.search(key):
+            try:
+                re.compile(key, re.IGNORECASE)
+            except re.error:
+                pass  # 잘못된 정규식은 글자 그대로 비교
+            else:
+                if has_group_reference(key):
+                    raise ScriptError(f"Error: icon pattern must not use group references: {key}")
+                patterns.append([idx, key, glyph])
+                continue
+        exact[key.lower()] = [idx, glyph]
+    st = icons_file.stat()
+    return {
+        "version": INDEX_VERSION,
+        "source": str(icons_file.resolve()),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "exact": exact,
+        "patterns": patterns,
+    }
+
+
+class IconIndex:
+    """컴파일된 인덱스로 클래스 → 글리프 조회 (대소문자 무시, 마지막 규칙 우선)"""
+
+    def __init__(self, index: dict):
+        self.exact = index["exact"]
+        self.patterns = index["patterns"]
+        self.regex = None
+        if self.patterns:
+            # 뒤 규칙부터 나열: alternation은 먼저 맞는 쪽을 고르므로 = 마지막 규칙 우선
+            alts = (f"(?P<r{i}>{pat})" for i, (_, pat, _) in reversed(list(enumerate(self.patterns))))
+            self.regex = re.compile("|".join(alts), re.IGNORECASE)
+
+    def lookup(self, cls: str) -> str:
+        cls = cls.lower()
+        best = self.exact.get(cls)
+        if self.regex is not None:
+            m = self.regex.fullmatch(cls)
+            if m is not None:
+                idx, _, glyph = self.patterns[int(m.lastgroup[1:])]
+                if best is None or idx > best[0]:
+                    best = [idx, glyph]
+        return best[1] if best else ""
+
+
+def load_icon_index(icons_file: Path = ICONS_FILE_DEFAULT) -> IconIndex:
+    """캐시된 인덱스를 사용하고, icons.map의 mtime/크기가 바뀌었으면 다시 컴파일"""
+    st = icons_file.stat()
     try:
-        with path.open("r", encoding="utf-8") as f:
-            data = json5.load(f)
-    except Exception as e:
-        raise ScriptError(f"json5 failed to parse {path}: {e}")
-    return data
+        index = json.loads(INDEX_FILE.read_text(encoding="utf-8"))
+        if (
+            index.get("version") == INDEX_VERSION
+            and index.get("source") == str(icons_file.resolve())
+            and index.get("mtime_ns") == st.st_mtime_ns
+            and index.get("size") == st.st_size
+        ):
+            return IconIndex(index)
+    except (OSError, ValueError):
+        pass
+    index = compile_index(icons_file)
+    INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(INDEX_FILE, json.dumps(index, ensure_ascii=False) + "\n")
+    return IconIndex(index)
+
+
+# ---------- JSONC ----------
+_STRING = r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+_COMMENT = r"//[^\n]*|/\*.*?\*/"
+_TRAILING_COMMA = r",(?=(?:\s|" + _COMMENT + r")*[}\]])"
+# 그룹 1: 주석/trailing comma가 아닌 구간 (문자열 포함, 통째로 유지)
+# 나머지: 주석 또는 trailing comma
+_JSONC_NOISE = re.compile(
+    r"((?:[^\"/,]+|" + _STRING + r"|,(?!(?:\s|" + _COMMENT + r")*[}\]]))+)"
+    r"|" + _COMMENT + r"|" + _TRAILING_COMMA,
+    re.S,
+)
+# 마지막 멤버와 닫는 괄호 사이: 주석 또는 trailing comma
+_TRAILING_NOISE = re.compile(_COMMENT + r"|,", re.S)
+_WS = re.compile(r"\s*")
+_DECODER = json.JSONDecoder()
+
+
+def _blank(m: re.Match) -> str:
+    if m.group(1) is not None:
+        return m.group(1)
+    # 같은 길이의 공백으로 치환 (개행 유지) → 원본과 오프셋이 1:1로 대응
+    return re.sub(r"[^\n]", " ", m.group())
+
+
+def strip_jsonc(text: str) -> str:
+    """주석/trailing comma를 공백으로 지운 JSON 텍스트 (길이와 오프셋 보존)"""
+    if "/" not in text and "," not in text:
+        return text
+    return _JSONC_NOISE.sub(_blank, text)
+
+
+def parse_jsonc(text: str):
+    try:
+        return json.loads(strip_jsonc(text))
+    except json.JSONDecodeError as e:
+        raise ScriptError(f"Error: invalid JSONC at line {e.lineno} column {e.colno}: {e.msg}")
+
+
+def _skip_ws(clean: str, i: int) -> int:
+    return _WS.match(clean, i).end()
+
+
+def _object_members(clean: str, start: int):
+    """
+    clean[start] == "{" 인 객체의 멤버 목록 [(key, key_start, value_start, value_end)]과
+    닫는 괄호 위치. 값은 C json 디코더로 통째로 건너뛴다
+    """
+    members = []
+    i = _skip_ws(clean, start + 1)
+    if clean[i] == "}":
+        return members, i
+    while True:
+        key_start = i
+        key, i = json.decoder.scanstring(clean, i + 1)
+        i = _skip_ws(clean, i)
+        if clean[i] != ":":
+            raise ScriptError(f"Error: expected ':' at offset {i}")
+        value_start = _skip_ws(clean, i + 1)
+        _, value_end = _DECODER.raw_decode(clean, value_start)
+        members.append((key, key_start, value_start, value_end))
+        i = _skip_ws(clean, value_end)
+        if clean[i] == "}":
+            return members, i
+        if clean[i] != ",":
+            raise ScriptError(f"Error: expected ',' or '}}' at offset {i}")
+        i = _skip_ws(clean, i + 1)
+
+
+def _find_member(clean: str, start: int, key: str):
+    """마지막으로 등장한 key의 (key_start, value_start, value_end)와 닫는 괄호 위치"""
+    members, close = _object_members(clean, start)
+    found = None
+    for k, key_start, value_start, value_end in members:
+        if k == key:
+            found = (key_start, value_start, value_end)
+    return found, close
+
+
+def _line_indent(text: str, pos: int) -> str:
+    line_start = text.rfind("\n", 0, pos) + 1
+    return _WS.match(text, line_start).group().replace("\n", "")
+
+
+def _render(value, indent: str) -> str:
+    return json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n" + indent)
+
+
+def _insert_member(text: str, clean: str, obj_start: int, close: int, key: str, value) -> str:
+    """객체 끝에 "key": value 멤버를 추가 (주석/서식은 그대로)"""
+    obj_indent = _line_indent(text, obj_start)
+    indent = obj_indent + "  "
+    member = f"{json.dumps(key, ensure_ascii=False)}: {_render(value, indent)}"
+
+    last = clean[obj_start:close].rstrip()
+    last_pos = obj_start + len(last)          # 마지막 유효 문자 바로 뒤
+    comma = "" if last.endswith(("{", ",")) else ","
+    # clean에서는 trailing comma도 지워져 있으므로 원본에서 확인 (주석 안의 ','는 제외)
+    for m in _TRAILING_NOISE.finditer(text, last_pos, close):
+        if m.group() == ",":
+            last_pos, comma = m.end(), ""
+            break
+
+    line_start = text.rfind("\n", 0, close) + 1
+    if text[line_start:close].strip() == "" and line_start > last_pos:
+        # 닫는 괄호가 혼자 있는 줄: 그 줄 앞에 새 줄로 삽입
+        return text[:last_pos] + comma + text[last_pos:line_start] + indent + member + "\n" + text[line_start:]
+    return text[:last_pos] + comma + "\n" + indent + member + "\n" + obj_indent + text[last_pos:].lstrip(" \t")
+
+
+def set_jsonc_value(text: str, path, value) -> str:
+    """
+    path(키 목록)가 가리키는 값만 교체한 JSONC 텍스트를 반환.
+    없는 객체는 만들고, 나머지 바이트(주석 포함)는 그대로 둔다.
+    """
+    clean = strip_jsonc(text)
+    pos = _skip_ws(clean, 0)
+    if pos >= len(clean) or clean[pos] != "{":
+        raise ScriptError("Error: top-level JSON value is not an object")
+
+    for depth, key in enumerate(path):
+        found, close = _find_member(clean, pos, key)
+        rest = path[depth + 1:]
+        if found is None:
+            # 남은 경로를 중첩 객체로 만들어 추가
+            for k in reversed(rest):
+                value = {k: value}
+            return _insert_member(text, clean, pos, close, key, value)
+
+        key_start, value_start, value_end = found
+        if not rest or clean[value_start] != "{":
+            for k in reversed(rest):
+                value = {k: value}
+            indent = _line_indent(text, key_start)
+            return text[:value_start] + _render(value, indent) + text[value_end:]
+        pos = value_start
+    return text
+
+
+# ---------- 변경 감지 / 저장 ----------
+def digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def fingerprint(obj) -> str:
+    # 키 순서는 Waybar 규칙 우선순위라 정렬하지 않음
+    return digest(json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+def load_state() -> dict:
+    try:
+        return json.loads(STATE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
 
+def save_state(key: str, value: str):
+    state = load_state()
+    state[key] = value
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(STATE_FILE, json.dumps(state, indent=2) + "\n")
 
-def ensure_object(v):
-    return v if isinstance(v, dict) else {}
+
+def atomic_write(path: Path, text: str):
+    """같은 디렉토리의 임시 파일에 쓰고 rename → 읽는 쪽은 항상 완전한 파일을 본다"""
+    path = path.resolve()  # 심볼릭 링크(dotfiles)는 링크가 아닌 대상 파일을 교체
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def backup_file(path: Path, data: bytes, keep: int):
+    """
+    <name>.<timestamp>.<hash8>.bak 으로 백업. 같은 내용의 백업이 이미 있으면 만들지 않고,
+    최신 keep개만 남긴다. (생성된 백업 경로, 재사용 여부) 반환
+    예전 형식(<name>.<timestamp>.bak)의 백업은 정리 대상이 아니다 (사용자가 가진 것 그대로 둠)
+    """
+    h = digest(data)[:8]
+    pattern = re.compile(re.escape(path.name) + r"\.\d{14}\.[0-9a-f]{8}\.bak$")
+    backups = sorted(p for p in path.parent.iterdir() if pattern.match(p.name))
+
+    bak = next((p for p in backups if p.name.endswith(f".{h}.bak")), None)
+    reused = bak is not None
+    if not reused:
+        ts = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+        bak = path.with_name(f"{path.name}.{ts}.{h}.bak")
+        shutil.copy2(path, bak)
+        backups.append(bak)
+
+    for old in backups[:-keep] if keep > 0 else []:
+        if old != bak:
+            old.unlink()
+    return bak, reused
+
+
+def sync(icons_path: Path, config_path: Path, dry_run=False, keep_backups=KEEP_BACKUPS_DEFAULT) -> bool:
+    """icons.map → window-rewrite 동기화. 파일을 바꿨으면 True"""
+    # 접근성 확인
+    require_access(config_path, read=True, write=not dry_run)
+    require_access(icons_path, read=True, write=False)
+
+    # 0) 지난 동기화 이후 두 파일이 그대로면 파싱 없이 종료
+    icons_bytes = icons_path.read_bytes()
+    config_bytes = config_path.read_bytes()
+    state_key = f"{icons_path.resolve()}|{config_path.resolve()}"
+    stamp = digest(icons_bytes) + ":" + digest(config_bytes)
+    if not dry_run and load_state().get(state_key) == stamp:
+        print("[OK ] unchanged since last sync (fingerprint match); nothing to do.", file=sys.stderr)
+        return False
+
+    # 1) 아이콘 맵 생성/정규화/검증
+    the_map = build_window_rewrite_map_json(icons_path)
+    map_json_compact = json.dumps(the_map, separators=(",", ":"), ensure_ascii=False)
+    print(f"[OK ] map_json built and validated. length={len(map_json_compact)}", file=sys.stderr)
+
+    # 2) JSONC 읽기/검증 (주석과 서식은 원문 그대로 유지)
+    text = config_bytes.decode("utf-8")
+    doc = parse_jsonc(text)
+    print("[OK ] JSONC parsed.", file=sys.stderr)
+
+    current = doc.get("hyprland/workspace") if isinstance(doc, dict) else None
+    current = current.get("window-rewrite") if isinstance(current, dict) else None
+    if not dry_run and current is not None and fingerprint(current) == fingerprint(the_map):
+        save_state(state_key, stamp)
+        print("[OK ] window-rewrite already up to date; nothing written.", file=sys.stderr)
+        return False
+
+    # 3) window-rewrite 값만 교체
+    formatted = set_jsonc_value(text, WINDOW_REWRITE_PATH, the_map)
+    print("[OK ] window-rewrite replaced in place.", file=sys.stderr)
+
+    # 4) 유효성 검증: 결과를 다시 파싱해 주입된 값 확인
+    doc = parse_jsonc(formatted)
+    if doc.get("hyprland/workspace", {}).get("window-rewrite") != the_map:
+        raise ScriptError("Error: window-rewrite mismatch after inject")
+    print(f"[OK ] result is valid JSONC. size={len(formatted.encode('utf-8'))} bytes", file=sys.stderr)
+
+    if dry_run:
+        # 표준출력으로 출력만
+        sys.stdout.write(formatted)
+        return False
+
+    # 5) 백업 후 원자적 교체
+    bak, reused = backup_file(config_path, config_bytes, keep_backups)
+    print(f"[OK ] backup {'already exists' if reused else 'created'}: {bak}", file=sys.stderr)
+
+    atomic_write(config_path, formatted)
+    save_state(state_key, digest(icons_bytes) + ":" + digest(formatted.encode("utf-8")))
+
+    print("[INFO] window-rewrite updated; the rest of the file is unchanged.", file=sys.stderr)
+    print(f"[INFO] Saved as: {config_path}", file=sys.stderr)
+    print(f"[INFO] Backup: {bak}", file=sys.stderr)
+    return True
+
+
+# ---------- watch 모드 ----------
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+_INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (+ name)
+
+
+class Inotify:
+    """libc inotify 최소 래퍼 (추가 패키지 없이 ctypes 사용)"""
+
+    def __init__(self):
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise ScriptError(f"Error: inotify_init1 failed: {os.strerror(ctypes.get_errno())}")
+
+    def add_watch(self, path: Path, mask: int) -> int:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise ScriptError(f"Error: cannot watch {path}: {os.strerror(ctypes.get_errno())}")
+        return wd
+
+    def read(self):
+        """대기 중인 이벤트 [(wd, mask, name)] (없으면 빈 목록)"""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+
+def watch(icons_path: Path, config_path: Path, keep_backups=KEEP_BACKUPS_DEFAULT, debounce_ms=DEBOUNCE_MS_DEFAULT):
+    """
+    icons.map / config.jsonc 디렉토리를 inotify로 감시.
+    편집기의 여러 단계 저장은 debounce_ms 동안 조용해질 때까지 모아 한 번만 동기화하고,
+    실제로 파일을 바꿨을 때만 waybar에 SIGUSR2를 보낸다.
+    """
+    # watch 모드에서만 필요: sync/compile/lookup은 hypripc.py 없이도 동작
+    from hypripc import signal_waybar
+
+    ino = Inotify()
+    # 편집기는 보통 임시 파일 → rename으로 저장하므로 파일이 아닌 디렉토리를 감시
+    targets = {}  # wd -> 감시할 파일 이름들
+    for path in {icons_path, config_path, icons_path.resolve(), config_path.resolve()}:
+        wd = ino.add_watch(path.parent, IN_CLOSE_WRITE | IN_MOVED_TO)
+        targets.setdefault(wd, set()).add(path.name)
+
+    def run_once():
+        started = time.monotonic()
+        try:
+            changed = sync(icons_path, config_path, keep_backups=keep_backups)
+            if icons_path.exists():
+                load_icon_index(icons_path)  # switcher용 인덱스도 미리 갱신
+        except ScriptError as e:
+            print(f"[WARN] {e}", file=sys.stderr, flush=True)
+            return
+        if changed:
+            n = signal_waybar(signal.SIGUSR2)  # 설정 다시 읽기
+            print(f"[INFO] synced in {(time.monotonic() - started) * 1000:.0f} ms; reloaded waybar ({n})", file=sys.stderr, flush=True)
+
+    def relevant(events):
+        return any(mask & IN_Q_OVERFLOW or name in targets.get(wd, ()) for wd, mask, name in events)
+
+    print(f"[INFO] watching {icons_path} and {config_path}", file=sys.stderr, flush=True)
+    run_once()
+    try:
+        while True:
+            select.select([ino.fd], [], [])
+            if not relevant(ino.read()):
+                continue
+            # 조용해질 때까지 모으기
+            while select.select([ino.fd], [], [], debounce_ms / 1000)[0]:
+                ino.read()
+            run_once()
+    except KeyboardInterrupt:
+        pass
+
+
+def main_compile(argv):
+    parser = argparse.ArgumentParser(
+        prog="sync-icons-to-waybar.py compile",
+        description=f"Compile icons.map into the cached lookup index ({INDEX_FILE})",
+    )
+    parser.add_argument("icons_file", nargs="?", default=str(ICONS_FILE_DEFAULT))
+    args = parser.parse_args(argv)
+
+    icons_path = Path(os.path.expanduser(args.icons_file))
+    require_access(icons_path, read=True, write=False)
+    index = compile_index(icons_path)
+    INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(INDEX_FILE, json.dumps(index, ensure_ascii=False) + "\n")
+    print(
+        f"[OK ] index compiled: {len(index['exact'])} exact, {len(index['patterns'])} pattern keys -> {INDEX_FILE}",
+        file=sys.stderr,
+    )
 
 
-def inject_window_rewrite(doc: dict, the_map: dict):
-    # .["hyprland/workspace"]를 객체로 강제, window-rewrite 교체
-    root = doc if isinstance(doc, dict) else {}
-    hw = ensure_object(root.get("hyprland/workspace", {}))
-    hw["window-rewrite"] = the_map
-    root["hyprland/workspace"] = hw
-    return root
+def main_lookup(argv):
+    parser = argparse.ArgumentParser(
+        prog="sync-icons-to-waybar.py lookup",
+        description="Resolve window classes to glyphs; one output line per class (stdin if no CLASS given)",
+    )
+    parser.add_argument("classes", nargs="*", metavar="CLASS")
+    parser.add_argument("--icons", default=str(ICONS_FILE_DEFAULT), help="Icons map file")
+    parser.add_argument("--default", default="", help="Glyph printed when nothing matches")
+    args = parser.parse_args(argv)
 
+    icons_path = Path(os.path.expanduser(args.icons))
+    require_access(icons_path, read=True, write=False)
+    index = load_icon_index(icons_path)
 
-def pretty_json(obj) -> str:
-    return json.dumps(obj, indent=2, ensure_ascii=False) + "\n"
+    classes = args.classes if args.classes else (line.rstrip("\n") for line in sys.stdin)
+    out = [index.lookup(cls) or args.default for cls in classes]
+    sys.stdout.write("".join(f"{glyph}\n" for glyph in out))
 
 
-def backup_file(path: Path) -> Path:
-    ts = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-    bak = Path(str(path) + f".{ts}.bak")
-    shutil.copy2(path, bak)
-    return bak
+MODES = {"compile": main_compile, "lookup": main_lookup}
 
 
 def main():
+    # compile / lookup 모드 (첫 인자). 그 외에는 기존 동기화
+    if len(sys.argv) > 1 and sys.argv[1] in MODES:
+        return MODES[sys.argv[1]](sys.argv[2:])
+
     parser = argparse.ArgumentParser(
-        description="Sync icons map to Waybar hyprland/workspace.window-rewrite"
+        description="Sync icons map to Waybar hyprland/workspace.window-rewrite",
+        epilog="Other modes: 'compile [ICONS_FILE]' builds the icon lookup index, "
+        "'lookup [CLASS ...]' resolves window classes to glyphs (see '<mode> --help').",
     )
     parser.add_argument(
         "icons_file",
@@ -173,54 +643,33 @@ def main():
         action="store_true",
         help="Do not write file; print result to stdout",
     )
+    parser.add_argument(
+        "--keep-backups",
+        type=int,
+        default=KEEP_BACKUPS_DEFAULT,
+        help=f"Number of config backups to keep (default: {KEEP_BACKUPS_DEFAULT}, 0 = keep all)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running: resync on changes (inotify) and reload waybar with SIGUSR2",
+    )
+    parser.add_argument(
+        "--debounce-ms",
+        type=int,
+        default=DEBOUNCE_MS_DEFAULT,
+        help=f"Quiet period before a sync in --watch mode (default: {DEBOUNCE_MS_DEFAULT})",
+    )
     args = parser.parse_args()
+    if args.watch and args.dry_run:
+        parser.error("--watch cannot be combined with --dry-run")
 
     icons_path = Path(os.path.expanduser(args.icons_file))
     config_path = Path(os.path.expanduser(args.config))
-
-    # 접근성 확인
-    require_access(config_path, read=True, write=not args.dry_run)
-    require_access(icons_path, read=True, write=False)
-
-    # 1) 아이콘 맵 생성/정규화/검증
-    the_map = build_window_rewrite_map_json(icons_path)
-    map_json_compact = json.dumps(the_map, separators=(",", ":"), ensure_ascii=False)
-    print(f"[OK ] map_json built and validated. length={len(map_json_compact)}", file=sys.stderr)
-
-    # 2) JSONC → JSON 객체
-    doc = read_jsonc_to_json(config_path)
-    print("[OK ] json5 conversion done.", file=sys.stderr)
-
-    # 3) 주입
-    injected = inject_window_rewrite(doc, the_map)
-    print("[OK ] jq inject done (python equivalent).", file=sys.stderr)
-
-    # 4) 유효성 검증
-    try:
-        _ = json.dumps(injected)
-    except Exception as e:
-        raise ScriptError(f"Error: invalid JSON (after inject): {e}")
-    print("[OK ] tmp_out is valid JSON", file=sys.stderr)
-
-    # 5) pretty formatting
-    formatted = pretty_json(injected)
-    print(f"[OK ] pretty formatted. size={len(formatted.encode('utf-8'))} bytes", file=sys.stderr)
-
-    if args.dry_run:
-        # 표준출력으로 출력만
-        sys.stdout.write(formatted)
+    if args.watch:
+        watch(icons_path, config_path, args.keep_backups, args.debounce_ms)
         return
-
-    # 6) 백업 후 교체
-    bak = backup_file(config_path)
-    print(f"[OK ] backup created: {bak}", file=sys.stderr)
-
-    with config_path.open("w", encoding="utf-8") as f:
-        f.write(formatted)
-
-    print("[INFO] window-rewrite updated with pretty formatting.", file=sys.stderr)
-    print(f"[INFO] Saved as: {config_path}", file=sys.stderr)
-    print(f"[INFO] Backup: {bak}", file=sys.stderr)
+    sync(icons_path, config_path, args.dry_run, args.keep_backups)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Single producer for the Waybar status gauges that used to be shell scripts
+forked on every interval:
+- memory    (memory-gauge-waybar.sh)  every 5 s
+- cpu-temp  (cpu-temp.sh)             every 10 s
+- disk      (disk-usage.sh)           every 30 s
+
+Everything is computed in-process from /proc and /sys (no awk/jq/findmnt/lsblk)
+with the same text, tooltip and class output as the scripts. The producer
+serves one stream per module on a Unix socket and only writes a line when
+that module's output changed; gauges nobody subscribes to are not computed.
+
+Waybar runs one client per module (continuous exec, no interval):
+  waybar-status.py --module memory
+If the producer is not running, the client computes its module itself on the
+same schedule until the producer comes back.
+"""
+
+import os
+import re
+import sys
+import glob
+import stat
+import json
+import time
+import fcntl
+import asyncio
+import argparse
+from fnmatch import fnmatchcase
+from datetime import datetime
+
+from statefeed import StateFeed, change_printer, follow
+
+SOCKET_PATH = os.path.join(
+    os.environ.get('XDG_RUNTIME_DIR') or f'/tmp/waybar-status-{os.getuid()}', 'waybar-status.sock'
+)
+LOCK_FILE_PATH = '/tmp/waybar-status.lock'
+_lock_fh = None
+
+MEMORY_GLYPH = ''
+CPU_GLYPH = ''
+DISK_GLYPH = '\U000f02ca'
+BAR_LEN = 20
+
+
+def log(*args):
+    """stderr: in --module mode stdout is the module's JSON stream"""
+    ts = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+    print(f"[{ts}] [WAYBAR]", *args, file=sys.stderr, flush=True)
+
+
+def acquire_lock_or_exit():
+    """Acquire exclusive file lock to prevent multiple instances."""
+    global _lock_fh
+    _lock_fh = open(LOCK_FILE_PATH, 'w')
+    try:
+        fcntl.flock(_lock_fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print("[ERROR] waybar-status is already running.")
+        raise SystemExit(1)
+
+
+# ---------- Shared formatting ----------
+def gib(value, unit):
+    return f"{value / unit:.2f}"
+
+
+def make_bar(used, total, unit):
+    """'▓▓░░… 42% (x.xxGiB / y.yyGiB)' as the scripts print it"""
+    percent = used * 100 // total if total > 0 else 0
+    used_blocks = min((percent + 4) // 5, BAR_LEN)
+    free_blocks = BAR_LEN - used_blocks
+    # printf "%0.s▓" $(seq 1 0) still prints one block: keep that output
+    bar = '▓' * max(used_blocks, 1) + '░' * max(free_blocks, 1)
+    return f"{bar} {percent}% ({gib(used, unit)}GiB / {gib(total, unit)}GiB)"
+
+
+def read_text(path):
+    with open(path, 'r') as f:
+        return f.read().rstrip('\n')
+
+
+def read_int(path):
+    try:
+        return int(read_text(path))
+    except (OSError, ValueError):
+        return 0
+
+
+# ---------- memory ----------
+def gauge_memory():
+    total = available = 0
+    with open('/proc/meminfo', 'r') as f:
+        for line in f:
+            if line.startswith('MemTotal:'):
+                total = int(line.split()[1])
+            elif line.startswith('MemAvailable:'):
+                available = int(line.split()[1])
+    used = total - available
+    kib_per_gib = 1024 * 1024
+    text = f"{MEMORY_GLYPH} {float(gib(available, kib_per_gib)):.1f}G Free"
+    return json.dumps({'text': text, 'tooltip': make_bar(used, total, kib_per_gib)},
+                      ensure_ascii=False, separators=(',', ':'))
+
+
+# ---------- cpu-temp ----------
+HWMON_NAMES = ('coretemp', 'k10temp', 'amd_tctl', 'k10temp-pci-*', '*cpu*', '*zen*')
+CORE_LABELS = ('[Cc]ore*', 'CPU Core*', 'core [0-9]*')
+PKG_PATH_RE = re.compile(r'(tdie|tctl|package|cpu)', re.I)
+
+
+def find_cpu_hwmon():
+    for d in sorted(glob.glob('/sys/class/hwmon/hwmon*')):
+        try:
+            name = read_text(os.path.join(d, 'name'))
+        except OSError:
+            continue
+        if any(fnmatchcase(name, pat) for pat in HWMON_NAMES):
+            return d
+    return None
+
+
+def gauge_cpu_temp():
+    hwmon = find_cpu_hwmon()
+    if hwmon is None:
+        return f'{{"text":"{CPU_GLYPH}  N/A","class":"low","tooltip":"CPU hwmon not found"}}'
+
+    labels = sorted(glob.glob(os.path.join(hwmon, 'temp*_label')))
+    core_inputs = []
+    for lf in labels:
+        try:
+            label = read_text(lf)
+        except OSError:
+            continue
+        if any(fnmatchcase(label, pat) for pat in CORE_LABELS):
+            inp = lf[:-len('_label')] + '_input'
+            if os.access(inp, os.R_OK):
+                core_inputs.append(inp)
+    # the script matched the package/Tctl/Tdie pattern against the label file path
+    pkg_input = next((lf[:-len('_label')] + '_input' for lf in labels if PKG_PATH_RE.search(lf)), None)
+
+    cores = [read_int(f) for f in core_inputs]
+    if cores:
+        temp_mc = sum(cores) // len(cores)
+        source_desc = f"Avg of {len(cores)} cores"
+    elif pkg_input:
+        temp_mc = read_int(pkg_input)
+        source_desc = os.path.basename(pkg_input)
+    else:
+        inputs = sorted(glob.glob(os.path.join(hwmon, 'temp*_input')))
+        if not inputs:
+            return f'{{"text":"{CPU_GLYPH}  N/A","class":"low","tooltip":"No temp inputs"}}'
+        temp_mc = read_int(inputs[0])
+        source_desc = os.path.basename(inputs[0])
+
+    temp = int(temp_mc / 1000)
+    if temp >= 90:
+        klass = 'critical'
+    elif temp >= 80:
+        klass = 'high'
+    elif temp >= 60:
+        klass = 'medium'
+    else:
+        klass = 'low'
+
+    core_avg_text = core_max_text = pkg_text = 'N/A'
+    if cores:
+        core_avg_text = f"{int(temp_mc / 1000)}°C"
+        core_max_text = f"{int(max(0, *cores) / 1000)}°C"
+    if pkg_input:
+        pkg_text = f"{int(read_int(pkg_input) / 1000)}°C"
+
+    return (f'{{"text":"{CPU_GLYPH} ","class":"{klass}","tooltip":"CPU: {temp}°C ({source_desc})'
+            f'\\nCores avg: {core_avg_text}, Max: {core_max_text}\\nPkg: {pkg_text}"}}')
+
+
+# ---------- disk ----------
+_MOUNTINFO_ESCAPE = re.compile(r'\\([0-7]{3})')
+
+
+def mounts_in_tree_order():
+    """(source, mountpoint) from /proc/self/mountinfo in findmnt's tree (pre-order) order"""
+    entries, children = {}, {}
+    with open('/proc/self/mountinfo', 'r') as f:
+        for line in f:
+            left, _, right = line.partition(' - ')
+            fields, tail = left.split(), right.split()
+            if len(fields) < 5 or len(tail) < 2:
+                continue
+            mount_id, parent_id = fields[0], fields[1]
+            mountpoint = _MOUNTINFO_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), fields[4])
+            source = _MOUNTINFO_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), tail[1])
+            entries[mount_id] = (source, mountpoint)
+            children.setdefault(parent_id, []).append(mount_id)
+
+    order = []
+    stack = [m for parent, ids in children.items() if parent not in entries for m in ids][::-1]
+    while stack:
+        mount_id = stack.pop()
+        order.append(entries[mount_id])
+        stack.extend(reversed(children.get(mount_id, [])))
+    return order
+
+
+def is_block_device(path):
+    try:
+        return stat.S_ISBLK(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def gauge_disk():
+    bytes_per_gib = 1073741824
+    seen = set()
+    lines = []
+    total_sum = used_sum = free_sum = 0
+    for source, mountpoint in mounts_in_tree_order():
+        if not is_block_device(source):
+            continue
+        devname = os.path.basename(source)
+        if devname in seen:
+            continue
+        try:
+            st = os.statvfs(mountpoint)
+        except OSError:
+            continue
+        seen.add(devname)
+        size = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        avail = st.f_bavail * st.f_frsize
+        total_sum += size
+        used_sum += used
+        free_sum += avail
+        lines.append(f"{source}: {gib(avail, bytes_per_gib)}GiB Free\n    {make_bar(used, size, bytes_per_gib)}")
+    lines.append(f"Total: {gib(free_sum, bytes_per_gib)}GiB Free\n    {make_bar(used_sum, total_sum, bytes_per_gib)}")
+
+    tooltip = '\n'.join(lines).replace('\n', '\\n').replace('"', '\\"')
+    return (f'{{"text": "{DISK_GLYPH} {gib(free_sum, bytes_per_gib)}G Free", "class": "tooltip", '
+            f'"tooltip": "{tooltip}"}}')
+
+
+# module -> (gauge, interval in seconds; the former Waybar intervals)
+MODULES = {
+    'memory': (gauge_memory, 5),
+    'cpu-temp': (gauge_cpu_temp, 10),
+    'disk': (gauge_disk, 30),
+}
+
+
+def compute(name):
+    gauge, _ = MODULES[name]
+    try:
+        return gauge()
+    except (OSError, ValueError) as e:
+        log(f"[ERR] {name}:", e)
+        return None
+
+
+# ---------- Producer ----------
+class Producer:
+    def __init__(self):
+        self.last = {name: None for name in MODULES}
+        self.wakeup = {name: asyncio.Event() for name in MODULES}
+        # one topic per module; a new client gets the module's last line, if any
+        self.feed = StateFeed(SOCKET_PATH, self.last.get, topics=MODULES,
+                              on_subscribe=lambda name: self.wakeup[name].set())
+
+    def publish(self, name):
+        """Recompute one gauge and push it to its subscribers when it changed."""
+        line = compute(name)
+        if line is None or line == self.last[name]:
+            return
+        self.last[name] = line
+        self.feed.publish(line, name)
+
+    async def run_gauge(self, name):
+        _, interval = MODULES[name]
+        while True:
+            if not self.feed.subscribed(name):
+                # nobody is showing this module: sleep until someone subscribes
+                self.last[name] = None
+                await self.wakeup[name].wait()
+                self.wakeup[name].clear()
+            self.publish(name)
+            await asyncio.sleep(interval)
+
+
+async def main():
+    acquire_lock_or_exit()
+    producer = Producer()
+    await producer.feed.start()
+    log(f"serving {', '.join(MODULES)} on {SOCKET_PATH}")
+    await asyncio.gather(*(producer.run_gauge(name) for name in MODULES))
+
+
+# ---------- Waybar client ----------
+def run_waybar_client(name):
+    """Print one Waybar JSON line per change; compute locally while the producer is away."""
+    _, interval = MODULES[name]
+    emit = change_printer()
+    while True:
+        try:
+            for line in follow(SOCKET_PATH, name):
+                emit(line)
+        except OSError:
+            pass
+        # producer not running (or gone): compute this module here, retry next tick
+        emit(compute(name))
+        time.sleep(interval)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Waybar status producer (memory, cpu-temp, disk)')
+    parser.add_argument('--module', choices=sorted(MODULES),
+                        help='Client mode: stream one module\'s Waybar JSON from the producer')
+    parser.add_argument('--once', metavar='MODULE', choices=sorted(MODULES),
+                        help='Print one module\'s current output and exit')
+    args = parser.parse_args()
+
+    try:
+        if args.once:
+            print(compute(args.once) or '')
+        elif args.module:
+            run_waybar_client(args.module)
+        else:
+            asyncio.run(main())
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
@@ -0,0 +1,18 @@
+import os
+import sys
+import importlib.util
+
+INSTALL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'install')
+SCRIPTS_DIR = os.path.join(INSTALL_DIR, 'scripts')
+BATTERY_DIR = os.path.join(INSTALL_DIR, 'battery-threshold')
+# hyprlang.py, hypripc.py ... are imported by name from the scripts
+sys.path.insert(0, SCRIPTS_DIR)
+
+
+def load_script(filename, directory=SCRIPTS_DIR):
+    """Import a script by path (hyphenated script names are not importable)"""
+    name = filename.removesuffix('.py').replace('-', '_')
+    spec = importlib.util.spec_from_file_location(name, os.path.join(directory, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
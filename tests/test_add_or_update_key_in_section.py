@@ -0,0 +1,77 @@
+import sys
+import subprocess
+
+import pytest
+
+from conftest import load_script
+
+editor = load_script('add-or-update-key-in-section.py')
+
+CONFIG = """\
+general {
+    gaps_in = 5
+    col.active_border = rgba(33ccffee)
+    col.inactive_border = rgba(595959aa)
+}
+"""
+
+
+def test_dotted_leaf_key_is_updated_in_place(tmp_path):
+    conf = tmp_path / 'h.conf'
+    conf.write_text(CONFIG)
+
+    edits = [editor.parse_edit('general:col.active_border=rgba(0)'),
+             editor.parse_edit('general.col.inactive_border=rgba(1)')]
+    assert [path for path, _ in edits] == [('general', 'col.active_border'), ('general', 'col.inactive_border')]
+
+    changed, results = editor.edit_file(str(conf), edits)
+    assert changed
+    assert [state for _, state, _ in results] == ['updated', 'updated']
+    assert conf.read_text() == CONFIG.replace('rgba(33ccffee)', 'rgba(0)').replace('rgba(595959aa)', 'rgba(1)')
+
+
+def test_nested_path_uses_colons(tmp_path):
+    conf = tmp_path / 'h.conf'
+    conf.write_text('input {\n    touchpad {\n        natural_scroll = false\n    }\n}\n')
+    changed, _ = editor.edit_file(str(conf), [editor.parse_edit('input:touchpad:natural_scroll=true')])
+    assert changed
+    assert 'natural_scroll = true' in conf.read_text()
+
+
+@pytest.mark.parametrize('spec', ['gaps_in=x', ':gaps_in=x', 'general.=x', 'general:=x'])
+def test_path_without_section_is_rejected(spec):
+    with pytest.raises(editor.ConfigError):
+        editor.parse_edit(spec)
+
+
+def test_json_edits(tmp_path):
+    assert editor.flatten_json({'general': {'col.active_border': 'x'}, 'input.repeat_rate': 80}) == [
+        (('general', 'col.active_border'), 'x'), (('input', 'repeat_rate'), '80')]
+    with pytest.raises(editor.ConfigError):
+        editor.flatten_json({'gaps_in': 5})
+
+
+def test_legacy_call_requires_existing_section(tmp_path):
+    conf = tmp_path / 'h.conf'
+    conf.write_text(CONFIG)
+    with pytest.raises(ValueError, match='Section input not found'):
+        editor.add_or_update_key_in_section(str(conf), 'input', 'repeat_rate', 80)
+    assert conf.read_text() == CONFIG
+
+    editor.add_or_update_key_in_section(str(conf), 'general', 'gaps_out', 10)
+    assert '    gaps_out = 10\n}' in conf.read_text()
+
+
+@pytest.mark.parametrize('text, message', [
+    (CONFIG, 'Section input not found'),
+    ('input {\n    repeat_rate = 40\n', 'is not closed'),
+])
+def test_legacy_cli_reports_errors(tmp_path, text, message):
+    conf = tmp_path / 'h.conf'
+    conf.write_text(text)
+    proc = subprocess.run([sys.executable, editor.__file__, str(conf), 'input', 'repeat_rate', '80'],
+                          capture_output=True, text=True)
+    assert proc.returncode == 1
+    assert proc.stderr.startswith('Error: ') and message in proc.stderr
+    assert 'Traceback' not in proc.stderr
+    assert conf.read_text() == text
@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip('dbus')
+pytest.importorskip('gi')
+
+from conftest import BATTERY_DIR, load_script
+
+service = load_script('battery-threshold-service.py', BATTERY_DIR)
+
+
+@pytest.fixture
+def ring(tmp_path):
+    return service.TelemetryRing(str(tmp_path / 'telemetry.ring'), 4)
+
+
+def fill(ring, times, battery='BAT0'):
+    for t in times:
+        ring.append(t, battery, int(t) % 100, 1, 2, 3, 4)
+
+
+def times(records):
+    return [r[0] for r in records]
+
+
+def test_records_range_boundaries_are_inclusive(ring):
+    fill(ring, [10.0, 20.0, 30.0])
+    assert times(ring.records(10.0, 30.0)) == [10.0, 20.0, 30.0]
+    assert times(ring.records(10.5, 29.5)) == [20.0]
+    assert times(ring.records(31.0, 40.0)) == []
+    assert times(ring.records(0.0, 9.9)) == []
+
+
+def test_wraparound_keeps_newest_records(ring):
+    fill(ring, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])   # capacity 4: 1, 2 overwritten
+    assert ring.count == 4
+    assert times(ring.records(0.0, 100.0)) == [3.0, 4.0, 5.0, 6.0]
+    # 경계가 덮어쓴 슬롯과 버퍼 끝을 가로질러도 같은 결과
+    assert times(ring.records(2.0, 5.0)) == [3.0, 4.0, 5.0]
+    assert times(ring.records(6.0, 6.0)) == [6.0]
+    assert times(ring.records(1.0, 2.0)) == []
+
+
+def test_ring_survives_reopen(ring, tmp_path):
+    fill(ring, [1.0, 2.0, 3.0, 4.0, 5.0])
+    reopened = service.TelemetryRing(str(tmp_path / 'telemetry.ring'), 4)
+    assert times(reopened.records(0.0, 100.0)) == [2.0, 3.0, 4.0, 5.0]
+
+
+def test_clock_stepping_backwards_does_not_hide_records(ring):
+    fill(ring, [100.0, 200.0, 50.0, 60.0])   # NTP step / RTC jump after 200
+    assert times(ring.records(40.0, 70.0)) == [50.0, 60.0]
+    assert times(ring.records(90.0, 250.0)) == [100.0, 200.0]
+
+
+def test_records_carry_the_battery_name(ring):
+    fill(ring, [1.0], 'BAT1')
+    fill(ring, [2.0], 'CMB0')
+    assert [r[1] for r in ring.records(0.0, 10.0)] == ['BAT1', 'CMB0']
@@ -0,0 +1,46 @@
+import asyncio
+
+from conftest import load_script
+
+reactor_mod = load_script('hypr-monitor-reactor.py')
+
+
+def make_reactor(monkeypatch, keywords):
+    monkeypatch.setattr(reactor_mod, 'signal_waybar', lambda signum: 0)
+    monkeypatch.setattr(reactor_mod, 'DEBOUNCE_SEC', 0)
+    monkeypatch.setenv('HYPRLAND_INSTANCE_SIGNATURE', 'test')
+    reactor = reactor_mod.Reactor('/nonexistent/hyprland.conf')
+    reactor.hypr.keyword = lambda key, value: keywords.append((key, value)) or []
+    # 도킹 상태: 내장 디스플레이는 꺼져 있고 외부 모니터 연결
+    reactor.outputs = {'DP-1'}
+    reactor.internal_enabled = False
+    return reactor
+
+
+def test_no_evaluation_before_lid_state_is_known(monkeypatch):
+    keywords = []
+    reactor = make_reactor(monkeypatch, keywords)
+
+    async def scenario():
+        reactor.schedule("connected to Hyprland")
+        await asyncio.sleep(0.01)
+        assert keywords == []            # 덮개 상태를 모르면 eDP-1을 켜지 않는다
+        reactor.set_lid(True)
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert keywords == []
+    assert reactor.internal_enabled is False
+
+
+def test_lid_open_while_docked_enables_internal(monkeypatch):
+    keywords = []
+    reactor = make_reactor(monkeypatch, keywords)
+
+    async def scenario():
+        reactor.set_lid(False)
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert keywords == [('monitor', 'eDP-1, enable')]
+    assert reactor.internal_enabled is True
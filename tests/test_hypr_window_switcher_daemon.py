@@ -0,0 +1,60 @@
+import pytest
+
+from conftest import load_script
+
+daemon = load_script('hypr-window-switcher-daemon.py')
+
+
+@pytest.fixture
+def switcher(monkeypatch):
+    sw = daemon.Switcher()
+    sw.refetches = 0
+
+    def refetch():
+        sw.refetches += 1
+
+    monkeypatch.setattr(sw, 'schedule_refetch', refetch)
+    # 이름이 "3"인 워크스페이스의 id는 7
+    sw.workspace_ids = {'1': 1, '3': 7}
+    sw.clients = {'0xa': {'ws': 1, 'class': 'kitty', 'title': 't'}}
+    return sw
+
+
+def test_openwindow_uses_the_workspace_id_not_its_name(switcher):
+    assert switcher.on_event('openwindow', 'b,3,firefox,Mozilla Firefox')
+    assert switcher.clients['0xb']['ws'] == 7
+    assert switcher.refetches == 0
+
+
+def test_openwindow_on_unknown_workspace_refetches(switcher):
+    assert not switcher.on_event('openwindow', 'b,4,firefox,x')
+    assert '0xb' not in switcher.clients
+    assert switcher.refetches == 1
+
+
+def test_created_workspace_is_known_to_openwindow(switcher):
+    switcher.on_event('createworkspacev2', '12,mail')
+    assert switcher.on_event('openwindow', 'b,mail,thunderbird,Inbox')
+    assert switcher.clients['0xb']['ws'] == 12
+
+
+def test_movewindowv2_carries_the_id(switcher):
+    assert switcher.on_event('movewindowv2', 'a,7,3')
+    assert switcher.clients['0xa']['ws'] == 7
+
+
+def test_movewindow_v1_is_ignored_once_v2_is_seen(switcher):
+    # Hyprland sends movewindow, then movewindowv2 for the same move
+    switcher.on_event('movewindow', 'a,3')
+    switcher.on_event('movewindowv2', 'a,7,3')
+    assert switcher.clients['0xa']['ws'] == 7
+    assert not switcher.on_event('movewindow', 'a,1')
+    assert switcher.clients['0xa']['ws'] == 7
+
+
+def test_rename_and_destroy_update_the_workspace_table(switcher):
+    switcher.on_event('renameworkspace', '7,web')
+    assert switcher.workspace_ids == {'1': 1, 'web': 7}
+    switcher.on_event('destroyworkspacev2', '7,web')
+    assert switcher.workspace_ids == {'1': 1}
+    assert switcher.refetches == 0
@@ -0,0 +1,87 @@
+import socket
+import threading
+
+import pytest
+
+import hypripc
+
+# Replies in the format Hyprland's dispatchBatch produces: every reply followed by "\n\n\n"
+BATCH_ALL_OK = 'ok\n\n\nok\n\n\nok\n\n\n'
+BATCH_ONE_FAILED = 'ok\n\n\nconfig option <general:nope> does not exist.\n\n\nok\n\n\n'
+BATCH_JSON = '{\n    "id": 2,\n    "name": "2"\n}\n\n\n[{\n    "name": "eDP-1",\n    "activeWorkspace": {"id": 2, "name": "2"}\n}]\n\n\n'
+
+
+def test_split_batch_replies():
+    assert hypripc.split_batch_replies(BATCH_ALL_OK, 3) == ['ok', 'ok', 'ok']
+    assert hypripc.split_batch_replies(BATCH_ONE_FAILED, 3) == [
+        'ok', 'config option <general:nope> does not exist.', 'ok']
+    # releases without the delimiter
+    assert hypripc.split_batch_replies('okok', 2) == ['ok', 'ok']
+
+
+def test_split_batch_replies_rejects_wrong_count():
+    with pytest.raises(hypripc.HyprIPCError):
+        hypripc.split_batch_replies(BATCH_ALL_OK, 2)
+    with pytest.raises(hypripc.HyprIPCError):
+        hypripc.split_batch_replies('okunknown request', 2)
+
+
+def test_split_json_replies():
+    workspace, monitors = hypripc.split_json_replies(BATCH_JSON, 2)
+    assert workspace == {'id': 2, 'name': '2'}
+    assert monitors[0]['name'] == 'eDP-1'
+    with pytest.raises(hypripc.HyprIPCError):
+        hypripc.split_json_replies(BATCH_JSON, 3)
+    with pytest.raises(hypripc.HyprIPCError):
+        hypripc.split_json_replies('unknown request', 1)
+
+
+@pytest.fixture
+def hyprland(tmp_path, monkeypatch):
+    """Request socket answering from a {request: reply} table; requests land in .requests"""
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    monkeypatch.setenv('HYPRLAND_INSTANCE_SIGNATURE', 'sig')
+    (tmp_path / 'hypr' / 'sig').mkdir(parents=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(tmp_path / 'hypr' / 'sig' / '.socket.sock'))
+    server.listen()
+    replies, requests = {}, []
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                request = conn.recv(65536).decode()
+                requests.append(request)
+                conn.sendall(replies[request].encode())
+
+    threading.Thread(target=serve, daemon=True).start()
+    hypr = hypripc.Hyprland(ttl=10)
+    hypr.replies, hypr.requests = replies, requests
+    yield hypr
+    server.close()
+
+
+def test_batch_counts_failures_per_command(hyprland):
+    commands = ['keyword general:gaps_in 5', 'keyword general:nope 1', 'keyword general:gaps_out 10']
+    hyprland.replies['[[BATCH]]' + ';'.join(commands)] = BATCH_ONE_FAILED
+    assert hyprland.batch(commands) == ['config option <general:nope> does not exist.']
+
+    hyprland.replies['[[BATCH]]' + ';'.join(commands[:1] + commands[2:])] = 'ok\n\n\nok\n\n\n'
+    assert hyprland.batch(commands[:1] + commands[2:]) == []
+
+
+def test_single_command_is_not_batched(hyprland):
+    hyprland.replies['keyword general:gaps_in 5'] = 'ok'
+    assert hyprland.keyword('general:gaps_in', 5) == []
+    assert hyprland.requests == ['keyword general:gaps_in 5']
+
+
+def test_queries_share_one_batch_and_cache(hyprland):
+    hyprland.replies['[[BATCH]]j/activeworkspace;j/monitors'] = BATCH_JSON
+    assert hyprland.active_monitor().name == 'eDP-1'
+    assert hyprland.monitors()[0].active_workspace == '2'
+    assert hyprland.requests == ['[[BATCH]]j/activeworkspace;j/monitors']
@@ -0,0 +1,20 @@
+import os
+
+import hyprlang
+
+
+def test_parse_key_name_keeps_dotted_leaf():
+    assert hyprlang.parse_key_name('general:gaps_in') == ('general', 'gaps_in')
+    assert hyprlang.parse_key_name('general:col.active_border') == ('general', 'col.active_border')
+    assert hyprlang.parse_key_name(' group : col.border_active ') == ('group', 'col.border_active')
+
+
+def test_where_finds_dotted_key_across_sources(tmp_path):
+    (tmp_path / 'colors.conf').write_text('general {\n    col.active_border = rgba(1)\n}\n')
+    root = tmp_path / 'hyprland.conf'
+    root.write_text('general {\n    col.active_border = rgba(0)\n}\nsource = ./colors.conf\n')
+
+    index = hyprlang.ConfigIndex(cache_file=str(tmp_path / 'index.json'))
+    found = index.where('general:col.active_border', str(root))
+    assert [(os.path.basename(path), line, value) for path, line, value in found] == [
+        ('hyprland.conf', 2, 'rgba(0)'), ('colors.conf', 2, 'rgba(1)')]
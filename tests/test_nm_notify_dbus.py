@@ -0,0 +1,119 @@
+import socket
+
+import pytest
+from pyroute2.netlink import NLM_F_REPLACE
+from pyroute2.netlink.rtnl import RTM_NEWADDR, RTM_NEWROUTE, RTM_DELROUTE
+from pyroute2.netlink.rtnl.ifaddrmsg import ifaddrmsg
+from pyroute2.netlink.rtnl.ifinfmsg import IFF_UP, IFF_RUNNING
+from pyroute2.netlink.rtnl.rtmsg import rtmsg
+
+from conftest import load_script
+
+
+@pytest.fixture
+def nm():
+    return load_script('nm-notify-dbus.py')
+
+
+def route(mtype, oif, gateway, table=254, priority=600, flags=0):
+    msg = rtmsg()
+    msg['header']['type'] = mtype
+    msg['header']['flags'] = flags
+    msg['family'] = socket.AF_INET
+    msg['dst_len'] = 0
+    msg['table'] = table
+    msg['attrs'] = [('RTA_TABLE', table), ('RTA_OIF', oif), ('RTA_GATEWAY', gateway), ('RTA_PRIORITY', priority)]
+    return msg
+
+
+def test_replace_moves_default_route(nm):
+    nm.handle_route(route(RTM_NEWROUTE, 2, '10.0.0.1'))
+    assert nm.has_default_route(2)
+
+    # ip route replace default via 10.1.0.1 dev if3 metric 600
+    nm.handle_route(route(RTM_NEWROUTE, 3, '10.1.0.1', flags=NLM_F_REPLACE))
+    assert not nm.has_default_route(2)
+    assert nm.has_default_route(3)
+
+    nm.handle_route(route(RTM_DELROUTE, 3, '10.1.0.1'))
+    assert not nm.has_any_default()
+
+
+def test_replace_keeps_other_metrics(nm):
+    nm.handle_route(route(RTM_NEWROUTE, 2, '10.0.0.1', priority=100))
+    nm.handle_route(route(RTM_NEWROUTE, 3, '10.1.0.1', priority=600, flags=NLM_F_REPLACE))
+    assert nm.has_default_route(2) and nm.has_default_route(3)
+
+
+def test_only_main_table_counts(nm):
+    nm.handle_route(route(RTM_NEWROUTE, 5, '10.8.0.1', table=51820))
+    assert not nm.has_default_route(5)
+    assert not nm.has_any_default()
+
+
+def link(idx, name):
+    return {'index': idx, 'name': name, 'operstate': 'unknown', 'carrier': True, 'flags': IFF_UP | IFF_RUNNING}
+
+
+def addr(mtype, idx, address):
+    msg = ifaddrmsg()
+    msg['header']['type'] = mtype
+    msg['family'] = socket.AF_INET
+    msg['index'] = idx
+    msg['attrs'] = [('IFA_LOCAL', address), ('IFA_ADDRESS', address)]
+    return msg
+
+
+def net_route(mtype, oif, dst, dst_len):
+    msg = rtmsg()
+    msg['header']['type'] = mtype
+    msg['family'] = socket.AF_INET
+    msg['dst_len'] = dst_len
+    msg['table'] = 254
+    msg['attrs'] = [('RTA_TABLE', 254), ('RTA_OIF', oif), ('RTA_DST', dst)]
+    return msg
+
+
+def test_tap_vpn_is_tracked_but_not_notified(nm, monkeypatch):
+    assert nm.is_ignored('tap0') and nm.is_tracked('tap0')
+    assert not nm.is_tracked('tapx') and not nm.is_tracked('veth1') and not nm.is_tracked('lo')
+
+    sent = []
+    monkeypatch.setattr(nm, 'notify', lambda title, body, icon: sent.append(title))
+    nm.dispatch(route(RTM_NEWROUTE, 8, '10.9.0.1', priority=50))
+    nm.dispatch(route(RTM_NEWROUTE, 9, '10.0.0.1'))
+    nm.link_table[8] = dict(link(8, 'tap0'), operstate='up')
+    nm.link_table[9] = dict(link(9, 'wlan0'), operstate='up')
+    nm.settle('tap0', nm.link_table[8], 1)
+    nm.settle('wlan0', nm.link_table[9], 1)
+    assert sent == ['wlan0 Connected']
+    assert nm.published['tap0']['state'] == 'connected'
+
+    nm.dispatch(addr(RTM_NEWADDR, 8, '10.9.0.2'))
+    nm.dispatch(net_route(RTM_NEWROUTE, 8, '10.9.0.0', 24))
+    assert nm.waybar_vpn(nm.published)['text'] == '🔒 VPN'
+
+
+def test_vpn_needs_address_and_routes(nm):
+    nm.link_table[7] = link(7, 'wg0')
+    nm.settle('wg0', nm.link_table[7], 1)
+    assert nm.waybar_vpn(nm.published)['text'] == ''   # up but unconfigured
+
+    nm.dispatch(addr(RTM_NEWADDR, 7, '10.8.0.2'))
+    assert nm.waybar_vpn(nm.published)['text'] == ''
+    nm.dispatch(net_route(RTM_NEWROUTE, 7, '10.8.0.0', 24))
+    assert nm.published['wg0']['inet'] and nm.published['wg0']['routes']
+    assert nm.waybar_vpn(nm.published)['text'] == '🔒 VPN'
+
+    nm.dispatch(net_route(RTM_DELROUTE, 7, '10.8.0.0', 24))
+    assert nm.waybar_vpn(nm.published)['text'] == ''
+
+
+def test_route_events_republish(nm):
+    nm.link_table[2] = link(2, 'wlan0')
+    nm.settle('wlan0', nm.link_table[2], 1)
+    assert not nm.published['wlan0']['default_route']
+    nm.dispatch(route(RTM_NEWROUTE, 2, '10.0.0.1'))
+    assert nm.published['wlan0']['default_route']
+    nm.dispatch(route(RTM_DELROUTE, 2, '10.0.0.1'))
+    assert not nm.published['wlan0']['default_route']
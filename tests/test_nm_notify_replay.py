@@ -0,0 +1,34 @@
+from pyroute2.netlink.rtnl import RTM_NEWLINK, RTM_NEWROUTE
+
+from conftest import load_script
+
+replay = load_script('nm-notify-replay.py')
+
+FLAPS = 21   # odd: the storm ends with the link down
+
+
+def write_flap_storm(path, gap):
+    """wlp2s0 up with a default route, then FLAPS down/up toggles `gap` seconds apart"""
+    with open(path, 'wb') as fh:
+        fh.write(replay.MAGIC)
+        replay.write_record(fh, replay.KIND_DUMP, 0.0, replay.link_msg(RTM_NEWLINK, 2, 'wlp2s0', True))
+        replay.write_record(fh, replay.KIND_DUMP, 0.0, replay.route_msg(RTM_NEWROUTE, 2))
+        for i in range(FLAPS):
+            up = i % 2 == 1
+            replay.write_record(fh, replay.KIND_EVENT, 1.0 + i * gap, replay.link_msg(RTM_NEWLINK, 2, 'wlp2s0', up))
+
+
+def test_flap_storm_folds_into_one_notification(tmp_path):
+    capture = tmp_path / 'storm.rec'
+    write_flap_storm(str(capture), gap=0.005)
+
+    assert replay.replay(str(capture), settle_ms=0, verbose=False)['notifications'] == FLAPS
+    result = replay.replay(str(capture), settle_ms=300, verbose=False)
+    assert result['events'] == FLAPS
+    assert result['notifications'] == 1
+
+
+def test_slow_flaps_are_not_folded(tmp_path):
+    capture = tmp_path / 'slow.rec'
+    write_flap_storm(str(capture), gap=1.0)
+    assert replay.replay(str(capture), settle_ms=300, verbose=False)['notifications'] == FLAPS
@@ -0,0 +1,63 @@
+import json
+import asyncio
+
+import statefeed
+
+
+async def exchange(path):
+    state = {'n': 0}
+    feed = statefeed.StateFeed(str(path), lambda: state)
+    server = await feed.start()
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(path))
+        first = json.loads(await reader.readline())
+        while not feed.subscribed():
+            await asyncio.sleep(0.01)
+        feed.publish({'n': 1})
+        feed.publish('{"raw": true}')
+        second = json.loads(await reader.readline())
+        third = json.loads(await reader.readline())
+        writer.close()
+        return first, second, third
+    finally:
+        server.close()
+
+
+def test_snapshot_then_updates(tmp_path):
+    assert asyncio.run(exchange(tmp_path / 'run' / 'feed.sock')) == ({'n': 0}, {'n': 1}, {'raw': True})
+
+
+def test_change_printer(capsys):
+    emit = statefeed.change_printer()
+    for line in ('a', 'a', None, 'b', 'a'):
+        emit(line)
+    assert capsys.readouterr().out == 'a\nb\na\n'
+
+
+async def topic_exchange(path):
+    joined = []
+    last = {'memory': '{"text": "m"}', 'disk': None}
+    feed = statefeed.StateFeed(str(path), last.get, topics=last, on_subscribe=joined.append)
+    server = await feed.start()
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(path))
+        writer.write(b'memory\n')
+        first = await reader.readline()
+        feed.publish('{"text": "d"}', 'disk')
+        feed.publish('{"text": "m2"}', 'memory')
+        second = await reader.readline()
+
+        bogus_reader, bogus_writer = await asyncio.open_unix_connection(str(path))
+        bogus_writer.write(b'nope\n')
+        closed = await bogus_reader.read()
+        writer.close()
+        return first, second, closed, joined
+    finally:
+        server.close()
+
+
+def test_topics(tmp_path):
+    first, second, closed, joined = asyncio.run(topic_exchange(tmp_path / 'feed.sock'))
+    assert (first, second) == (b'{"text": "m"}\n', b'{"text": "m2"}\n')
+    assert closed == b''
+    assert joined == ['memory']
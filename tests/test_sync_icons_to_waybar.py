@@ -0,0 +1,157 @@
+import pytest
+
+from conftest import load_script
+
+sync_icons = load_script('sync-icons-to-waybar.py')
+
+PATH = ['hyprland/workspace', 'window-rewrite']
+
+
+@pytest.mark.parametrize('text', [
+    '{\n  "a": 1, // c\n}\n',
+    '{\n  "a": 1 /* x, y */, // c\n}\n',
+    '{"a": 1,}',
+    '{\n  "a": 1 // c, d\n}\n',
+])
+def test_insert_after_trailing_comma_and_comment(text):
+    out = sync_icons.set_jsonc_value(text, PATH, {'class<kitty>': 'K'})
+    assert ',,' not in out
+    assert sync_icons.parse_jsonc(out) == {'a': 1, 'hyprland/workspace': {'window-rewrite': {'class<kitty>': 'K'}}}
+    # 주석은 그대로
+    for comment in ('// c', '/* x, y */', '// c, d'):
+        if comment in text:
+            assert comment in out
+
+
+def icon_index(tmp_path, lines):
+    icons = tmp_path / 'icons.map'
+    icons.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return sync_icons.IconIndex(sync_icons.compile_index(icons))
+
+
+def test_pattern_keys_keep_case_sensitive_escapes(tmp_path):
+    index = icon_index(tmp_path, [r'Foo\S+: A', r'\D+-\d: B', 'Kitty: K'])
+    assert index.lookup('foobar') == 'A'
+    assert index.lookup('FOO bar') == ''          # \S가 \s로 바뀌지 않아야
+    assert index.lookup('Term-2') == 'B'
+    assert index.lookup('12-2') == ''
+    assert index.lookup('KITTY') == 'K'
+
+
+def test_pattern_keys_with_own_groups(tmp_path):
+    index = icon_index(tmp_path, [r'(org\.)?gimp.*: G', 'code: C'])
+    assert index.lookup('org.gimp.GIMP') == 'G'
+    assert index.lookup('Code') == 'C'
+
+
+@pytest.mark.parametrize('key', [r'(a)\1', r'(?P<x>a)b', r'(?P<x>a)(?P=x)', r'(a)?(?(1)b)c'])
+def test_pattern_keys_with_group_references_are_rejected(tmp_path, key):
+    with pytest.raises(sync_icons.ScriptError):
+        icon_index(tmp_path, [f'{key}: X'])
+
+
+def test_escaped_backslash_is_not_a_group_reference():
+    assert not sync_icons.has_group_reference(r'a\\1')
+    assert sync_icons.has_group_reference(r'a\\\1')
+
+
+def test_backup_rotation_leaves_legacy_backups(tmp_path):
+    config = tmp_path / 'config.jsonc'
+    config.write_text('{}\n')
+    legacy = tmp_path / 'config.jsonc.20240101000000.bak'
+    legacy.write_text('old\n')
+    for i in range(3):
+        (tmp_path / f'config.jsonc.2025010100000{i}.{i:08x}.bak').write_text(f'{i}\n')
+
+    sync_icons.backup_file(config, config.read_bytes(), keep=1)
+    assert legacy.exists()
+
+
+@pytest.fixture
+def synced(tmp_path, monkeypatch):
+    """icons.map + config.jsonc 한 쌍, 상태 파일은 tmp_path 안"""
+    monkeypatch.setattr(sync_icons, 'STATE_FILE', tmp_path / 'state.json')
+    icons = tmp_path / 'icons.map'
+    icons.write_text('kitty: K\n', encoding='utf-8')
+    config = tmp_path / 'config.jsonc'
+    config.write_text('{\n  // bar\n  "hyprland/workspace": {"window-rewrite": {}}\n}\n', encoding='utf-8')
+    return icons, config
+
+
+def backups(config):
+    return sorted(p.name for p in config.parent.glob(config.name + '.*.bak'))
+
+
+def test_unchanged_input_does_not_touch_config(synced):
+    icons, config = synced
+    assert sync_icons.sync(icons, config) is True
+    st = config.stat()
+    # 지문 일치(파싱 없이 종료)와, 상태 파일이 없을 때의 값 비교 모두 쓰지 않는다
+    assert sync_icons.sync(icons, config) is False
+    sync_icons.STATE_FILE.unlink()
+    assert sync_icons.sync(icons, config) is False
+    assert config.stat().st_mtime_ns == st.st_mtime_ns
+    assert config.stat().st_ino == st.st_ino
+    assert len(backups(config)) == 1
+
+
+def test_atomic_write_replaces_target_of_symlink(tmp_path):
+    target = tmp_path / 'real.jsonc'
+    target.write_text('old\n')
+    target.chmod(0o640)
+    link = tmp_path / 'config.jsonc'
+    link.symlink_to(target)
+
+    sync_icons.atomic_write(link, 'new\n')
+    assert link.is_symlink()
+    assert target.read_text() == 'new\n'
+    assert target.stat().st_mode & 0o777 == 0o640
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith('.tmp')] == []
+
+
+def test_atomic_write_failure_keeps_original(tmp_path, monkeypatch):
+    path = tmp_path / 'config.jsonc'
+    path.write_text('old\n')
+
+    def fail(src, dst):
+        raise OSError('rename failed')
+
+    monkeypatch.setattr(sync_icons.os, 'replace', fail)
+    with pytest.raises(OSError):
+        sync_icons.atomic_write(path, 'new\n')
+    assert path.read_text() == 'old\n'
+    assert [p.name for p in tmp_path.iterdir()] == ['config.jsonc']
+
+
+def test_backup_is_deduplicated_by_content(tmp_path):
+    config = tmp_path / 'config.jsonc'
+    config.write_text('{}\n')
+    first, reused = sync_icons.backup_file(config, config.read_bytes(), keep=5)
+    assert not reused
+    again, reused = sync_icons.backup_file(config, config.read_bytes(), keep=5)
+    assert reused and again == first
+    assert backups(config) == [first.name]
+
+
+def test_backup_rotation_keeps_newest(tmp_path):
+    config = tmp_path / 'config.jsonc'
+    config.write_text('{}\n')
+    for i in range(6):
+        (tmp_path / f'config.jsonc.2025010100000{i}.{i:08x}.bak').write_text(f'{i}\n')
+
+    bak, _ = sync_icons.backup_file(config, config.read_bytes(), keep=3)
+    assert backups(config) == [
+        'config.jsonc.20250101000004.00000004.bak',
+        'config.jsonc.20250101000005.00000005.bak',
+        bak.name,
+    ]
+
+
+def test_backup_keep_zero_keeps_all(tmp_path):
+    config = tmp_path / 'config.jsonc'
+    config.write_text('{}\n')
+    for i in range(3):
+        (tmp_path / f'config.jsonc.2025010100000{i}.{i:08x}.bak').write_text(f'{i}\n')
+
+    sync_icons.backup_file(config, config.read_bytes(), keep=0)
+    assert len(backups(config)) == 4
@@ -0,0 +1,14 @@
+from conftest import load_script
+
+waybar_status = load_script('waybar-status.py')
+
+
+def test_compute_errors_stay_off_the_module_stream(monkeypatch, capsys):
+    def broken():
+        raise OSError('no /proc/meminfo')
+
+    monkeypatch.setitem(waybar_status.MODULES, 'memory', (broken, 5))
+    assert waybar_status.compute('memory') is None
+    out, err = capsys.readouterr()
+    assert out == ''
+    assert 'no /proc/meminfo' in err